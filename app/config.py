@@ -13,13 +13,74 @@ class Settings(BaseSettings):
     database_url: str
     redis_host: str = "redis"
     redis_port: int = 6379
+    redis_async_max_connections: int = int(os.getenv("REDIS_ASYNC_MAX_CONNECTIONS", 200))
+    # pub/sub 구독 전용 커넥션 수 (SSE 스트림/single-flight 대기가 명령용 풀을 점유하지 않도록 분리)
+    redis_pubsub_max_connections: int = int(os.getenv("REDIS_PUBSUB_MAX_CONNECTIONS", 500))
     secret_key: str = os.getenv("SECRET_KEY")
     algorithm: str = os.getenv("ALGORITHM", "HS256")
     openai_api_key: str
+    openai_timeout: float = float(os.getenv("OPENAI_TIMEOUT", 60))
+    openai_image_timeout: float = float(os.getenv("OPENAI_IMAGE_TIMEOUT", 120))
+    openai_max_retries: int = int(os.getenv("OPENAI_MAX_RETRIES", 2))
+    openai_max_connections: int = int(os.getenv("OPENAI_MAX_CONNECTIONS", 20))
+
+    # 외부 API 클러스터 공용 요청 한도 (분당 요청 수, 제공자/모델별 Redis 토큰 버킷)
+    openai_rpm: int = int(os.getenv("OPENAI_RPM", 500))
+    openai_image_rpm: int = int(os.getenv("OPENAI_IMAGE_RPM", 5))
+    youtube_rpm: int = int(os.getenv("YOUTUBE_RPM", 600))
+    # 한도 대기 최대 시간 (초), 429 응답 시 최대 재시도 횟수
+    rate_limit_max_wait: int = int(os.getenv("RATE_LIMIT_MAX_WAIT", 60))
+    rate_limit_max_retries: int = int(os.getenv("RATE_LIMIT_MAX_RETRIES", 3))
 
     # GCP 설정
+    # 프로필 사진 버킷
     gcp_bucket_name: str = os.getenv("GCP_BUCKET_NAME")
+    # 보드 이미지 버킷
+    gcs_board_bucket: str = os.getenv("GCS_BOARD_BUCKET", "team-g-bucket")
     gcp_credentials: str = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
+    # 이미지를 메모리에 모두 올리지 않고 chunk 단위로 업로드 (chunk 크기는 256KB의 배수)
+    gcs_streaming_upload: bool = os.getenv("GCS_STREAMING_UPLOAD", "True") == "True"
+    gcs_upload_chunk_size: int = int(os.getenv("GCS_UPLOAD_CHUNK_SIZE", 1024 * 1024))
+
+    # 외부 HTTP 클라이언트 설정
+    http_timeout: float = float(os.getenv("HTTP_TIMEOUT", 10))
+    http_connect_timeout: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 5))
+    http_max_connections: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+    http_keepalive_expiry: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+
+    # YouTube 설정
+    youtube_fetch_concurrency: int = int(os.getenv("YOUTUBE_FETCH_CONCURRENCY", 8))
+    # 채널 동영상 목록 조회 방식: "search" (100 쿼터) 또는 "playlist" (업로드 재생목록, 1 쿼터)
+    youtube_listing_mode: str = os.getenv("YOUTUBE_LISTING_MODE", "search")
+
+    # GPT 응답 캐시 설정
+    gpt_cache_ttl: int = int(os.getenv("GPT_CACHE_TTL", 60 * 60 * 24))
+    gpt_cache_max_entries: int = int(os.getenv("GPT_CACHE_MAX_ENTRIES", 5000))
+
+    # GPT 프롬프트 데이터셋 토큰 예산 (프롬프트 종류별)
+    gpt_analysis_token_budget: int = int(os.getenv("GPT_ANALYSIS_TOKEN_BUDGET", 6000))
+    gpt_regenerate_token_budget: int = int(os.getenv("GPT_REGENERATE_TOKEN_BUDGET", 3000))
+
+    # 동일 GPT 요청 single-flight 락 유지 시간 (초, 리더가 실행 중이면 계속 연장 — 리더 장애 감지 시간)
+    single_flight_lock_ttl: int = int(os.getenv("SINGLE_FLIGHT_LOCK_TTL", 30))
+
+    # 보드 일치율 계산 엔진 (local: TF-IDF 유사도, gpt: GPT 분석)
+    match_ratio_engine: str = os.getenv("MATCH_RATIO_ENGINE", "local")
+    match_cache_ttl: int = int(os.getenv("MATCH_CACHE_TTL", 60 * 60 * 24))
+
+    # 유사 보드 인덱스 최소 재구성 간격 (초)
+    board_index_refresh_interval: int = int(os.getenv("BOARD_INDEX_REFRESH_INTERVAL", 30))
+
+    # 요청/작업당 DB 쿼리 수 경고 임계값 (N+1 감지)
+    db_query_warn_threshold: int = int(os.getenv("DB_QUERY_WARN_THRESHOLD", 20))
+
+    # 보드 목록 페이지 크기
+    board_page_size: int = int(os.getenv("BOARD_PAGE_SIZE", 30))
+    board_max_page_size: int = int(os.getenv("BOARD_MAX_PAGE_SIZE", 100))
+
+    # 프로필 사진 설정
+    profile_cache_ttl: int = int(os.getenv("PROFILE_CACHE_TTL", 60 * 60 * 24))
+    profile_prune_grace: int = int(os.getenv("PROFILE_PRUNE_GRACE", 60 * 10))
 
     # Celery 설정
     CELERY_BROKER_URL: str = os.getenv("CELERY_BROKER_URL")
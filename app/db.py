@@ -1,17 +1,84 @@
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
+from app.utils.db_metrics import install_query_instrumentation
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///:memory:")
 
-engine = create_engine(DATABASE_URL, echo=True)
+# SQL 로그 출력은 비용이 크므로 SQL_ECHO=True일 때만 사용 (쿼리 수/시간은 db_metrics로 집계)
+SQL_ECHO = os.getenv("SQL_ECHO", "False").lower() == "true"
+
+# SQLite 인메모리 DB는 커넥션마다 별도 DB가 생기므로, 동기/비동기 엔진이 같은 DB를 보도록
+# 이름 있는 공유 캐시 인메모리 DB로 바꾸고 StaticPool로 커넥션을 유지합니다.
+SQLITE_SHARED_MEMORY_URL = "sqlite:///file:algorify?mode=memory&cache=shared&uri=true"
+
+
+def is_sqlite_memory_url(url: str) -> bool:
+    scheme, _, rest = url.partition("://")
+    return scheme.split("+")[0] == "sqlite" and rest in ("", "/", "/:memory:")
+
+
+SQLITE_MEMORY = is_sqlite_memory_url(DATABASE_URL)
+if SQLITE_MEMORY:
+    DATABASE_URL = SQLITE_SHARED_MEMORY_URL
+    engine = create_engine(
+        DATABASE_URL,
+        echo=SQL_ECHO,
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+else:
+    engine = create_engine(DATABASE_URL, echo=SQL_ECHO)
+install_query_instrumentation(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def to_async_database_url(url: str) -> str:
+    """
+    동기 드라이버 URL을 비동기 드라이버 URL로 변환합니다.
+    (postgresql[+psycopg2]:// → postgresql+asyncpg://, sqlite:// → sqlite+aiosqlite://)
+    """
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ("postgresql", "postgres"):
+        return f"postgresql+asyncpg://{rest}"
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite://{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = to_async_database_url(DATABASE_URL)
+
+# 읽기 위주 async 라우트용 비동기 엔진 (이벤트 루프를 막지 않고 동시 요청을 처리)
+if ASYNC_DATABASE_URL.startswith("postgresql"):
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        echo=SQL_ECHO,
+        pool_size=int(os.getenv("DB_ASYNC_POOL_SIZE", 20)),
+        max_overflow=int(os.getenv("DB_ASYNC_MAX_OVERFLOW", 10)),
+        pool_pre_ping=True,
+    )
+elif SQLITE_MEMORY:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=SQL_ECHO, poolclass=StaticPool)
+else:
+    async_engine = create_async_engine(ASYNC_DATABASE_URL, echo=SQL_ECHO)
+install_query_instrumentation(async_engine.sync_engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False
+)
+
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,11 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
-from app.db import Base, engine
+from app.db import Base, engine, async_engine
 from app.routes import board, user, auth, subscriptions, share, profile
 from app.init_db import init_db
-from prometheus_fastapi_instrumentator import Instrumentator
+from prometheus_fastapi_instrumentator import Instrumentator, metrics
 from app.routes.celery_test import router as celery_router
+from app.utils.http_client import close_http_clients
+from app.utils.db_metrics import QueryStatsMiddleware, db_query_metrics
 
 Base.metadata.create_all(bind=engine)
 init_db()
@@ -20,7 +22,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-DB-Query-Count", "X-DB-Query-Time"],
 )
+# 요청별 DB 쿼리 수/시간 집계
+app.add_middleware(QueryStatsMiddleware)
 
 app.include_router(user.router)
 app.include_router(board.router)
@@ -31,8 +36,15 @@ app.include_router(share.router)
 app.include_router(celery_router, prefix="/celery", tags=["celery"])
 
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_http_clients()
+    await async_engine.dispose()
+
+
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the FastAPI Backend"}
 
-Instrumentator().instrument(app).expose(app)
\ No newline at end of file
+# add()로 메트릭을 추가하면 기본 메트릭이 빠지므로 metrics.default()도 함께 등록
+Instrumentator().add(metrics.default()).add(db_query_metrics()).instrument(app).expose(app)
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, JSON, DateTime, Index, LargeBinary
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.db import Base
@@ -9,14 +9,23 @@ KST = pytz.timezone("Asia/Seoul")
 
 class Board(Base):
     __tablename__ = "boards"
+    # 사용자별 보드 목록 커서 페이지네이션 (created_at, id 역순) 용 복합 인덱스
+    __table_args__ = (
+        Index("ix_boards_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     uuid = Column(String, default=lambda: str(uuid.uuid4()), unique=True, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     board_name = Column(String, nullable=True)
     image_url = Column(String, nullable=True)
+    # 목록 화면용 썸네일 URL 및 파생 이미지 URL ({"webp": ..., "thumbnail_webp": ..., "avif": ...})
+    thumbnail_url = Column(String, nullable=True)
+    image_variants = Column(JSON, nullable=True)
     category_ratio = Column(JSON, nullable=True)
     keywords = Column(JSON, nullable=True)
+    # 유사 보드 검색용 벡터 (float32 little-endian, app.utils.similarity.board_vector)
+    vector = Column(LargeBinary, nullable=True)
     created_at = Column(DateTime, default=lambda: datetime.now(KST), nullable=True)
 
     # Relationship
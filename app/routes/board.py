@@ -1,22 +1,39 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db import get_db
-from app.utils.gpt_handler import match_board_ratio
+from app.db import get_db, get_async_db
+from app.utils.gpt_handler import match_board_ratio, generate_match_flavor_text
+from app.utils.similarity import compare_keywords, board_vector, vector_from_bytes
+from app.utils.board_index import board_index
+from app.utils.match_cache import match_cache_key, get_match_result, set_match_result
 from app.services.user_service import get_current_user
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.background import BackgroundTask
+from redis.exceptions import ConnectionError as RedisConnectionError
+from app.config import settings
 from app.services.board_service import (
-    get_boards,
-    get_board_by_id,
+    get_board_page_async,
+    get_board_by_id_async,
     create_board,
     regenerate_keywords,
-    regenerate_image,
+    get_regeneration_payload,
 )
-from app.services.celery_tasks import create_board_task
+from app.services.celery_tasks import (
+    create_board_pipeline,
+    create_image_regeneration_pipeline,
+)
+from app.utils.celery_app import celery_app
 from app.models.board import Board
+from app.utils.progress_handler import ProgressHandler
+from app.utils import RedisHandler
 import uuid
 
 router = APIRouter(prefix="/boards", tags=["Boards"])
 
+# 이미지 재생성 작업 ID → 보드 ID 매핑 보관 기간 (Celery 작업 결과 보관 기간과 동일)
+IMAGE_JOB_TTL = 60 * 60 * 24
+
 
 @router.post("", response_model=dict)
 def create_new_board(
@@ -41,15 +58,13 @@ def create_new_board(
         db.commit()
         db.refresh(new_board)
 
-        # Celery Task 호출
-        task = create_board_task.apply_async(
-            kwargs={
-                "user_id": current_user["id"],
-                "board_id": new_board.id,
-                "channel_ids": channel_ids,
-            },
-            queue="celery"
-        )
+        # Celery 파이프라인 (fetch → analyze → render → store) 호출
+        ProgressHandler.publish_board_progress(new_board.id, "queued")
+        create_board_pipeline(
+            user_id=current_user["id"],
+            board_id=new_board.id,
+            channel_ids=channel_ids,
+        ).apply_async()
 
         return {
             "message": "보드 생성을 시작합니다.",
@@ -69,10 +84,19 @@ def create_new_board(
 
 # 보드 목록 조회
 @router.get("", response_model=dict)
-def read_boards(
-    db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+async def read_boards(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+    limit: int = Query(settings.board_page_size, ge=1, le=settings.board_max_page_size),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
 ):
-    boards = get_boards(db, current_user["id"])
+    try:
+        boards, next_cursor = await get_board_page_async(
+            db, current_user["id"], limit, cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
     return {
         "message": "보드 목록 조회에 성공했습니다.",
         "result": {
@@ -80,18 +104,20 @@ def read_boards(
                 {
                     "id": board.id,
                     "board_name": board.board_name,
+                    "thumbnail_url": board.thumbnail_url or board.image_url,
                     "created_at": board.created_at,
                 }
                 for board in boards
-            ]
+            ],
+            "next_cursor": next_cursor,
         },
     }
 
 
 # 보드 상세 조회
 @router.get("/{board_id}", response_model=dict)
-def read_board(board_id: int, db: Session = Depends(get_db)):
-    board = get_board_by_id(db, board_id)
+async def read_board(board_id: int, db: AsyncSession = Depends(get_async_db)):
+    board = await get_board_by_id_async(db, board_id)
     if not board:
         raise HTTPException(status_code=404, detail="Board not found")
 
@@ -104,6 +130,8 @@ def read_board(board_id: int, db: Session = Depends(get_db)):
             "board": {
                 "board_name": board.board_name,
                 "image_url": board.image_url,
+                "thumbnail_url": board.thumbnail_url,
+                "image_variants": board.image_variants,
                 "category_ratio": board.category_ratio,
                 "keywords": board.keywords,
                 "created_at": board.created_at,
@@ -112,24 +140,155 @@ def read_board(board_id: int, db: Session = Depends(get_db)):
     }
 
 
+# 유사 보드 조회
+@router.get("/{board_id}/similar", response_model=dict)
+async def read_similar_boards(
+    board_id: int,
+    k: int = Query(10, ge=1, le=50, description="반환할 보드 수"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: dict = Depends(get_current_user),
+):
+    """
+    보드 벡터의 코사인 유사도로 다른 사용자의 비슷한 보드 k개를 반환합니다.
+    """
+    board = (
+        await db.execute(
+            select(Board.user_id, Board.keywords, Board.category_ratio, Board.vector).where(
+                Board.id == board_id
+            )
+        )
+    ).first()
+    if not board:
+        raise HTTPException(status_code=404, detail="Board not found")
+
+    vector = (
+        vector_from_bytes(board.vector)
+        if board.vector
+        else board_vector(board.keywords, board.category_ratio)
+    )
+    if not vector.any():
+        # 키워드가 없는 보드는 비교할 수 없음
+        neighbors = []
+    else:
+        await board_index.refresh()
+        neighbors = board_index.top_k(vector, k, exclude_user_id=board.user_id)
+
+    # 목록 표시용 컬럼만 조회 후 유사도 순서대로 정렬
+    rows = await db.execute(
+        select(Board.id, Board.board_name, Board.thumbnail_url, Board.image_url).where(
+            Board.id.in_([neighbor_id for neighbor_id, _ in neighbors])
+        )
+    )
+    boards_by_id = {row.id: row for row in rows}
+
+    return {
+        "message": "유사한 보드 목록 조회에 성공했습니다.",
+        "result": {
+            "board": [
+                {
+                    "id": neighbor_id,
+                    "board_name": boards_by_id[neighbor_id].board_name,
+                    "thumbnail_url": boards_by_id[neighbor_id].thumbnail_url
+                    or boards_by_id[neighbor_id].image_url,
+                    "similarity_score": round(max(score, 0.0) * 100, 2),
+                }
+                for neighbor_id, score in neighbors
+                if neighbor_id in boards_by_id
+            ]
+        },
+    }
+
+
+# 보드 생성 진행 상황 스트림 (Server-Sent Events)
+@router.get("/{board_id}/progress")
+async def stream_board_progress(board_id: int):
+    """
+    보드 생성 단계 이벤트를 SSE로 전달합니다.
+    폴링 대신 하나의 연결로 queued → fetch → analyze → render → store → completed/failed 이벤트를 받습니다.
+    구독 커넥션 한도(REDIS_PUBSUB_MAX_CONNECTIONS)를 넘으면 503을 반환합니다.
+    """
+    # 응답을 시작하기 전에 구독해야 한도 초과를 503으로 알릴 수 있음
+    try:
+        pubsub = await ProgressHandler.open_progress_subscription(board_id)
+    except RedisConnectionError as e:
+        print(f"[WARNING] 보드 {board_id} 진행 스트림 구독 실패: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="진행 상황 스트림을 열 수 없습니다. 잠시 후 다시 시도해주세요.",
+        )
+
+    async def event_stream():
+        async for event in ProgressHandler.subscribe_board_progress(board_id, pubsub):
+            if event is None:
+                # 프록시가 유휴 연결을 끊지 않도록 주석 라인 전송
+                yield ": keep-alive\n\n"
+                continue
+            yield f"event: progress\ndata: {event}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # 스트림이 시작되기 전에 연결이 끊겨도 구독 커넥션을 반환
+        background=BackgroundTask(pubsub.aclose),
+    )
+
+
 @router.post("/match-ratio")
-async def board_match(board_id1: int, board_id2: int, db: Session = Depends(get_db)):
+async def board_match(
+    board_id1: int,
+    board_id2: int,
+    flavor: bool = Query(False, description="GPT 코멘트(flavor_text) 추가 여부"),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    두 보드의 알고리즘 일치율 계산.
+    기본적으로 로컬 TF-IDF 유사도 엔진으로 계산하며 (MATCH_RATIO_ENGINE=gpt이면 기존 GPT 분석 사용),
+    flavor=true이면 GPT 코멘트를 flavor_text로 덧붙입니다.
+    """
+
+    # 두 보드의 키워드만 한 번에 조회
+    rows = await db.execute(
+        select(Board.id, Board.keywords).where(Board.id.in_([board_id1, board_id2]))
+    )
+    keywords_by_id = {row.id: row.keywords for row in rows}
+    if board_id1 not in keywords_by_id or board_id2 not in keywords_by_id:
+        raise HTTPException(status_code=404, detail="Board not found")
+    board1_keywords = keywords_by_id[board_id1]
+    board2_keywords = keywords_by_id[board_id2]
+
+    print(f"[DEBUG] board1's keywords: {board1_keywords}")
+    print(f"[DEBUG] board2's keywords: {board2_keywords}")
 
-    board1 = get_board_by_id(db, board_id1)
-    board2 = get_board_by_id(db, board_id2)
+    # 같은 보드 쌍(순서 무관)과 같은 키워드의 결과는 캐시에서 반환
+    cache_key, swapped = match_cache_key(board_id1, board_id2, board1_keywords, board2_keywords)
+    match_result = await get_match_result(cache_key, swapped)
+    cache_updated = False
+    if match_result is None:
+        if settings.match_ratio_engine == "gpt":
+            match_result = await match_board_ratio(board1_keywords, board2_keywords)
+        else:
+            match_result = compare_keywords(board1_keywords, board2_keywords)
+        cache_updated = True
 
-    print(f"[DEBUG] board1's keywords: {board1.keywords}")
-    print(f"[DEBUG] board2's keywords: {board2.keywords}")
+    if flavor and settings.match_ratio_engine != "gpt" and not match_result.get("flavor_text"):
+        flavor_text = await generate_match_flavor_text(match_result)
+        if flavor_text:
+            match_result["flavor_text"] = flavor_text
+            cache_updated = True
 
-    gpt_result = await match_board_ratio(board1.keywords, board2.keywords)
+    if cache_updated:
+        await set_match_result(cache_key, swapped, board_id1, board_id2, match_result)
+    if not flavor:
+        match_result.pop("flavor_text", None)
 
-    print(f"[DEBUG] gpt_result: {gpt_result}")
+    print(f"[DEBUG] match_result: {match_result}")
 
     return JSONResponse(
         status_code=200,
         content={
             "message": "알고리즘 일치율 계산에 성공했습니다.",
-            "result": gpt_result,
+            "result": match_result,
         },
     )
 
@@ -163,26 +322,73 @@ async def update_keywords(
 
 
 # 이미지 재생성
-@router.put("/{board_id}/image")
-async def regenerate_board_image(
+@router.put("/{board_id}/image", status_code=status.HTTP_202_ACCEPTED)
+def regenerate_board_image(
     board_id: int, db: Session = Depends(get_db), user: dict = Depends(get_current_user)
 ):
     """
-    이미지 재생성 API
+    이미지 재생성 API: Celery 작업으로 비동기 처리
     :param board_id: 보드 ID
     :param db: 데이터베이스 세션
     :param user: 현재 사용자 정보 (의존성 주입)
-    :return: 새로 생성된 이미지 URL
+    :return: 작업 ID (GET /boards/{board_id}/image/jobs/{job_id} 또는 진행 상황 SSE로 확인)
     """
     try:
-        # 재생성 로직 호출
-        new_image_url = regenerate_image(board_id, user["id"], db)
-        return {
-            "message": "이미지가 성공적으로 재생성되었습니다.",
-            "new_image_url": new_image_url,
-        }
-    except Exception as e:
+        payload = get_regeneration_payload(db, board_id, user["id"])
+    except ValueError as e:
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
+            status_code=status.HTTP_404_NOT_FOUND,
             detail=f"재생성 실패: {str(e)}",
         )
+
+    try:
+        job_id = str(uuid.uuid4())
+        # 상태 조회 시 다른 보드의 작업 ID로 조회하지 못하도록 작업이 속한 보드를 기록
+        RedisHandler.set_key_value(f"image_job:{job_id}", str(board_id), expire=IMAGE_JOB_TTL)
+        ProgressHandler.publish_board_progress(board_id, "queued")
+        create_image_regeneration_pipeline(payload, job_id).apply_async()
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"재생성 작업 등록 실패: {str(e)}",
+        )
+
+    return {
+        "message": "이미지 재생성 작업이 시작되었습니다.",
+        "job_id": job_id,
+        "status_url": f"/boards/{board_id}/image/jobs/{job_id}",
+        "progress_url": f"/boards/{board_id}/progress",
+    }
+
+
+# 이미지 재생성 작업 상태 조회
+@router.get("/{board_id}/image/jobs/{job_id}")
+def get_regenerate_image_job(
+    board_id: int,
+    job_id: str,
+    db: Session = Depends(get_db),
+    user: dict = Depends(get_current_user),
+):
+    """
+    이미지 재생성 작업 상태 조회 API
+    :return: 상태 (PENDING, RETRY, SUCCESS, FAILURE)와 완료 시 새 이미지 URL
+    """
+    board = db.query(Board.id).filter(Board.id == board_id, Board.user_id == user["id"]).first()
+    if not board:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 보드를 찾을 수 없습니다.",
+        )
+    if RedisHandler.get_value(f"image_job:{job_id}") != str(board_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="해당 작업을 찾을 수 없습니다.",
+        )
+
+    result = celery_app.AsyncResult(job_id)
+    response = {"job_id": job_id, "status": result.state}
+    if result.successful():
+        response["new_image_url"] = result.result["gcs_image_url"]
+    elif result.failed():
+        response["error"] = str(result.result)
+    return response
@@ -1,5 +1,6 @@
 from fastapi import APIRouter
 from celery.result import AsyncResult
+from app.utils.gpt_cache import analysis_cache
 
 router = APIRouter()
 
@@ -14,4 +15,15 @@ def get_task_status(task_id: str):
         "task_id": task_id,
         "status": task_result.status,
         "result": task_result.result if task_result.ready() else "작업 진행 중",
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/cache/gpt-analysis/")
+def get_gpt_analysis_cache_stats():
+    """
+    GPT 카테고리/키워드 분석 캐시 hit/miss 통계 조회 API
+    """
+    return {
+        "message": "GPT 분석 캐시 통계 조회에 성공했습니다.",
+        "result": analysis_cache.stats(),
+    }
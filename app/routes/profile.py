@@ -1,16 +1,21 @@
 from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
-from google.cloud import storage
 from sqlalchemy.orm import Session
 from app.db import get_db
 from app.models.user import User
 from app. schemas.user import UpdateUserSchema, UpdatePasswordSchema
 import os
 import uuid
-from app.config import settings
 from fastapi.responses import JSONResponse
 from app.services.user_service import get_current_user
 from sqlalchemy import select
 from app.utils import verify_password, hash_password
+from app.utils.gcs_client import PROFILE_BUCKET_NAME, get_bucket
+from app.services.profile_service import (
+    PROFILE_IMAGE_FOLDER,
+    cache_profile_image_url,
+    get_profile_image_url,
+)
+from app.services.celery_tasks import compact_profile_images_task
 
 router = APIRouter(prefix="/profiles", tags=["Profiles"])
 
@@ -32,9 +37,8 @@ def upload_profile_picture(
             detail="사용자 정보를 찾을 수 없습니다.",
         )
 
-    # GCS 클라이언트 초기화
-    client = storage.Client.from_service_account_json(settings.gcp_credentials)
-    bucket = client.get_bucket(settings.gcp_bucket_name)
+    # 프로세스 공용 GCS 버킷 핸들
+    bucket = get_bucket(PROFILE_BUCKET_NAME)
 
     # 파일 검증 및 경로 설정
     file_extension = os.path.splitext(file.filename)[1]
@@ -47,7 +51,7 @@ def upload_profile_picture(
             },
         )
 
-    blob_name = f"user/{user_id}/{uuid.uuid4()}{file_extension}"
+    blob_name = f"{PROFILE_IMAGE_FOLDER}/{user_id}/{uuid.uuid4()}{file_extension}"
     blob = bucket.blob(blob_name)
 
     # 파일 업로드
@@ -58,6 +62,13 @@ def upload_profile_picture(
     # DB에 URL 저장
     user.profile_img_url = public_url
     db.commit()
+    cache_profile_image_url(user_id, public_url)
+
+    # 이전 프로필 사진은 백그라운드에서 정리 (실패해도 업로드 결과에는 영향 없음)
+    try:
+        compact_profile_images_task.delay(user_id)
+    except Exception as e:
+        print(f"[ERROR] 프로필 사진 정리 작업 등록 실패: {str(e)}")
 
     return {
         "message": "프로필 사진이 업로드 되고 URL이 저장되었습니다.",
@@ -133,22 +144,18 @@ def get_user_name(db: Session = Depends(get_db), current_user: dict = Depends(ge
 
 
 @router.get("/{user_id}")
-async def get_profile_picture(current_user: dict = Depends(get_current_user)):
+def get_profile_picture(
+    db: Session = Depends(get_db), current_user: dict = Depends(get_current_user)
+):
 
     # 현재 사용자 정보 가져오기
     user_id = current_user["id"]
-    folder = "user"
 
     try:
-        # 1. GCS 클라이언트 초기화\
-        client = storage.Client.from_service_account_json(settings.gcp_credentials)
-        bucket = client.get_bucket(settings.gcp_bucket_name)\
-
-        # 2. 파일 경로 검색
-        prefix = f"{folder}/{user_id}/"
-        blobs = list(bucket.list_blobs(prefix=prefix))
+        # 캐시 → User.profile_img_url 순서로 조회 (GCS 목록 조회 없음)
+        public_url = get_profile_image_url(user_id, db)
 
-        if not blobs:
+        if not public_url:
             return JSONResponse(
                 status_code=404,
                 content={
@@ -157,11 +164,6 @@ async def get_profile_picture(current_user: dict = Depends(get_current_user)):
                 },
             )
 
-        # 3. 최신 파일 선택
-        blob = max(blobs, key=lambda b: b.updated)
-        public_url = blob.public_url
-
-        # 5. 결과 반환
         return {
             "message": "프로필 url을 성공적으로 반환했습니다.",
             "url": public_url
@@ -1,9 +1,11 @@
-from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi import APIRouter, HTTPException, Depends, status, Query
 from app.models import Board
-from app.utils.redis_handler import redis_client
-from sqlalchemy.orm import Session
-from app.db import get_db
-from app.services.board_service import get_board_by_id, get_boards
+from app.utils.redis_handler import AsyncRedisHandler
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db import get_async_db
+from app.config import settings
+from app.services.board_service import get_board_by_id_async, get_board_page_async
 from app.services.user_service import get_current_user
 
 router = APIRouter(prefix="/boards", tags=["Boards"])
@@ -12,7 +14,7 @@ router = APIRouter(prefix="/boards", tags=["Boards"])
 @router.post("/share")
 async def share_board(
     board_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -20,7 +22,7 @@ async def share_board(
     """
     try:
         # 해당 보드가 현재 사용자 소유인지 확인
-        board = get_board_by_id(db, board_id)
+        board = await get_board_by_id_async(db, board_id)
         if not board:
             raise HTTPException(status_code=404, detail="해당 보드를 찾을 수 없습니다.")
         if board.user_id != current_user["id"]:
@@ -30,7 +32,7 @@ async def share_board(
 
         # Redis에 공유 링크 설정 (TTL: 1시간)
         redis_key = f"shared_uuid:{board.uuid}"
-        redis_client.set(redis_key, board_id, ex=3600)
+        await AsyncRedisHandler.set_key_value(redis_key, board_id, expire=3600)
 
         # UUID 반환
         shared_uuid = f"{board.uuid}"
@@ -47,23 +49,38 @@ async def share_board(
 
 
 @router.get("/shared/{board_uuid}", response_model=dict)
-def get_shared_board_and_user_boards(
+async def get_shared_board_and_user_boards(
     board_uuid: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: dict = Depends(get_current_user),
+    limit: int = Query(settings.board_page_size, ge=1, le=settings.board_max_page_size),
+    cursor: str | None = Query(None, description="이전 응답의 next_cursor"),
 ):
     """
     공유된 보드와 현재 사용자의 보드 목록 반환
     Args:
         board_uuid (str): 공유된 보드의 UUID
-        db (Session): 데이터베이스 세션
+        db (AsyncSession): 데이터베이스 세션
         current_user (dict): 현재 사용자 정보
+        limit (int): 사용자 보드 목록 페이지 크기
+        cursor (str | None): 사용자 보드 목록의 다음 페이지 커서
     Returns:
         dict: 공유된 보드와 현재 사용자의 보드 목록
     """
     try:
         # 공유된 보드 가져오기
-        shared_board = db.query(Board).filter(Board.uuid == board_uuid).first()
+        shared_board = (
+            await db.execute(
+                select(
+                    Board.id,
+                    Board.board_name,
+                    Board.thumbnail_url,
+                    Board.image_url,
+                    Board.category_ratio,
+                    Board.keywords,
+                ).where(Board.uuid == board_uuid)
+            )
+        ).first()
 
         if not shared_board:
             raise HTTPException(
@@ -71,8 +88,13 @@ def get_shared_board_and_user_boards(
                 detail="공유된 보드를 찾을 수 없습니다.",
             )
 
-        # 현재 사용자의 보드 목록 가져오기
-        user_boards = db.query(Board).filter(Board.user_id == current_user["id"]).all()
+        # 현재 사용자의 보드 목록 가져오기 (커서 페이지네이션)
+        try:
+            user_boards, next_cursor = await get_board_page_async(
+                db, current_user["id"], limit, cursor
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
         # 반환 데이터 구성
         return {
@@ -81,6 +103,7 @@ def get_shared_board_and_user_boards(
                 "shared_board": {
                     "id": shared_board.id,
                     "board_name": shared_board.board_name,
+                    "thumbnail_url": shared_board.thumbnail_url or shared_board.image_url,
                     "category_ratio": shared_board.category_ratio,
                     "keywords": shared_board.keywords,
                 },
@@ -88,12 +111,16 @@ def get_shared_board_and_user_boards(
                     {
                         "id": board.id,
                         "board_name": board.board_name,
+                        "thumbnail_url": board.thumbnail_url or board.image_url,
                         "created_at": board.created_at,
                     }
                     for board in user_boards
                 ],
+                "next_cursor": next_cursor,
             },
         }
+    except HTTPException as e:
+        raise e
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,10 +1,17 @@
-import uuid, time, json
+import uuid, time, json, base64
+from datetime import datetime
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.board import Board
 from app.utils import RedisHandler
+from app.utils.redis_handler import AsyncRedisHandler
 from app.utils.dalle_handler import generate_image_with_dalle, delete_image_from_gcs
 from app.utils.gcs_handler import upload_image_to_gcs
 from app.utils.gpt_handler import generate_keywords_and_category, regenerate_keywords_for_specific_category
+from app.utils.similarity import board_vector, vector_to_bytes
+from app.utils.board_index import mark_board_index_stale_async
+from app.utils.match_cache import invalidate_board_matches
 from urllib.parse import urlparse
 from app.services.channel_service import (
     fetch_cached_videos,
@@ -115,11 +122,106 @@ def get_boards(db: Session, user_id: int):
     return db.query(Board).filter(Board.user_id == user_id).all()
 
 
+# 보드 목록 화면에 필요한 컬럼 (keywords, category_ratio 등 JSON 컬럼은 제외)
+BOARD_LIST_COLUMNS = (
+    Board.id,
+    Board.board_name,
+    Board.thumbnail_url,
+    Board.image_url,
+    Board.created_at,
+)
+
+
+def encode_board_cursor(created_at: datetime | None, board_id: int) -> str:
+    """
+    마지막 보드의 (created_at, id)를 불투명한 커서 문자열로 변환합니다.
+    created_at이 없는 (NULL) 보드는 null로 기록합니다.
+    """
+    raw = json.dumps([created_at.isoformat() if created_at else None, board_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_board_cursor(cursor: str) -> tuple[datetime | None, int]:
+    """
+    커서 문자열을 (created_at, id)로 변환합니다. 형식이 잘못되면 ValueError를 발생시킵니다.
+    """
+    try:
+        created_at, board_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return (datetime.fromisoformat(created_at) if created_at is not None else None), int(board_id)
+    except Exception:
+        raise ValueError("유효하지 않은 커서입니다.")
+
+
+def _board_page_statement(user_id: int, limit: int, cursor: str | None):
+    """
+    보드 목록 한 페이지 조회 쿼리 (동기/비동기 세션 공용)
+    다음 페이지 존재 여부 확인을 위해 limit + 1개를 조회합니다.
+    created_at이 NULL인 보드는 가장 오래된 보드로 취급해 맨 뒤에 id 역순으로 정렬합니다.
+    """
+    statement = select(*BOARD_LIST_COLUMNS).where(Board.user_id == user_id)
+    if cursor:
+        created_at, board_id = decode_board_cursor(cursor)
+        if created_at is None:
+            statement = statement.where(Board.created_at.is_(None), Board.id < board_id)
+        else:
+            statement = statement.where(
+                or_(
+                    Board.created_at < created_at,
+                    and_(Board.created_at == created_at, Board.id < board_id),
+                    Board.created_at.is_(None),
+                )
+            )
+    return statement.order_by(Board.created_at.desc().nulls_last(), Board.id.desc()).limit(limit + 1)
+
+
+def _split_board_page(rows: list, limit: int) -> tuple[list, str | None]:
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_board_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def get_board_page(
+    db: Session, user_id: int, limit: int, cursor: str | None = None
+) -> tuple[list, str | None]:
+    """
+    사용자의 보드 목록을 최신순으로 한 페이지 조회하는 함수.
+    OFFSET 대신 (created_at, id) 키셋 조건을 사용하고 목록용 컬럼만 조회하므로
+    보드 수와 관계없이 (user_id, created_at, id) 인덱스 범위만 읽습니다.
+
+    Args:
+        db (Session): 데이터베이스 세션
+        user_id (int): 사용자 ID
+        limit (int): 페이지 크기
+        cursor (str | None): 이전 페이지의 next_cursor
+
+    Returns:
+        tuple[list, str | None]: 보드 목록 (BOARD_LIST_COLUMNS 행), 다음 페이지 커서 (마지막 페이지면 None)
+    """
+    rows = db.execute(_board_page_statement(user_id, limit, cursor)).all()
+    return _split_board_page(rows, limit)
+
+
+async def get_board_page_async(
+    db: AsyncSession, user_id: int, limit: int, cursor: str | None = None
+) -> tuple[list, str | None]:
+    """
+    get_board_page의 비동기 세션 버전 (async 라우트용)
+    """
+    rows = (await db.execute(_board_page_statement(user_id, limit, cursor))).all()
+    return _split_board_page(rows, limit)
+
+
 # 보드 상세 조회
 def get_board_by_id(db: Session, board_id: int):
     return db.query(Board).filter(Board.id == board_id).first()
 
 
+async def get_board_by_id_async(db: AsyncSession, board_id: int):
+    return await db.scalar(select(Board).where(Board.id == board_id))
+
+
 def process_channel_data(channel_ids: list[str]):
     """
     Redis에서 데이터 가져오기 및 GPT 키워드 생성
@@ -133,24 +235,25 @@ def process_channel_data(channel_ids: list[str]):
     try:
         video_data_list = []  # GPT로 보낼 동영상 데이터를 저장할 리스트
 
-        for channel_id in channel_ids:
-            # Redis에서 채널 ID 기반 최신 동영상 목록 가져오기
-            redis_channel_key = f"youtube_channel:{channel_id}"
-            video_ids = RedisHandler.get_from_redis_list(redis_channel_key)
-
-            if not video_ids:
+        # Redis에서 채널 ID 기반 최신 동영상 목록 가져오기 (MGET 1회)
+        channel_video_lists = RedisHandler.get_many_from_redis_list(
+            [f"youtube_channel:{channel_id}" for channel_id in channel_ids]
+        )
+        video_ids = []
+        for channel_id, channel_video_ids in zip(channel_ids, channel_video_lists):
+            if not channel_video_ids:
                 print(f"Redis에 채널 ID {channel_id}의 동영상 데이터가 없습니다.")
                 continue
+            video_ids.extend(channel_video_ids)
 
-            # Redis에서 각 동영상 ID의 세부 정보 가져오기
-            for video_id in video_ids:
-                redis_video_key = f"youtube_video:{video_id}"
-                video_data = RedisHandler.get_video_details_from_redis(redis_video_key)
-                print(f"[DEBUG] video_data: {video_data}")
-                if not video_data:
-                    print(f"Redis에 동영상 ID {video_id}의 데이터가 없습니다.")
-                    continue
-                video_data_list.append(video_data)
+        # Redis에서 각 동영상 ID의 세부 정보 가져오기 (파이프라인 1회)
+        video_details = RedisHandler.get_many_video_details(video_ids)
+        for video_id in video_ids:
+            video_data = video_details.get(video_id)
+            if not video_data:
+                print(f"Redis에 동영상 ID {video_id}의 데이터가 없습니다.")
+                continue
+            video_data_list.append(video_data)
 
         if not video_data_list:
             raise ValueError("GPT로 보낼 데이터가 없습니다.")
@@ -201,17 +304,17 @@ async def regenerate_keywords(db: Session, board_id: int, category_name: str, us
 
         # Redis에서 해당 보드의 채널 ID 목록 가져오기
         redis_board_key = f"board_videos:{board_id}"
-        video_ids = RedisHandler.get_from_redis_list(redis_board_key)
+        video_ids = await AsyncRedisHandler.get_from_redis_list(redis_board_key)
         print(f"[DEBUG] video_ids: {video_ids}")
 
         if not video_ids:
             raise ValueError(f"Redis에 보드 ID {board_id}의 동영상 데이터가 없습니다.")
 
-        # Redis에서 각 동영상 ID의 세부 정보 가져오기
+        # Redis에서 각 동영상 ID의 세부 정보 가져오기 (파이프라인 1회)
+        video_details = await AsyncRedisHandler.get_many_video_details(video_ids)
         video_data_list = []
         for video_id in video_ids:
-            redis_video_key = f"youtube_video:{video_id}"
-            video_data = RedisHandler.get_video_details_from_redis(redis_video_key)
+            video_data = video_details.get(video_id)
             if not video_data:
                 print(f"Redis에 동영상 ID {video_id}의 데이터가 없습니다.")
                 continue
@@ -238,11 +341,16 @@ async def regenerate_keywords(db: Session, board_id: int, category_name: str, us
         print(f"[DEBUG] all_keywords: {all_keywords}")
         # 변경사항 저장
         db.query(Board).filter(Board.id == board_id).update(
-            {"keywords": all_keywords}
+            {
+                "keywords": all_keywords,
+                "vector": vector_to_bytes(board_vector(all_keywords, board.category_ratio)),
+            }
         )
         print(f"[DEBUG] inputted keywords: {json.dumps(all_keywords, ensure_ascii=False)}")
         db.commit()
         db.refresh(board)
+        await mark_board_index_stale_async()
+        await invalidate_board_matches(board_id)
 
         return {
             "board_id": board.id,
@@ -253,53 +361,99 @@ async def regenerate_keywords(db: Session, board_id: int, category_name: str, us
         raise ValueError(f"키워드 재생성 오류: {str(e)}")
 
 # 이미지 재생성
-def regenerate_image(board_id: int, user_id: int, db: Session):
+def build_board_image_path(board_id: int, user_id: int) -> str:
     """
-    이미지를 재생성하고 GCS 및 DB를 업데이트하는 함수
-    :param board_id: 재생성할 보드의 ID
-    :param user_id: 요청한 사용자의 ID
-    :param db: 데이터베이스 세션
+    재생성 이미지마다 새 경로를 사용하여 교체 전까지 기존 이미지가 계속 제공되도록 합니다.
+    (같은 경로를 덮어쓰면 CDN/브라우저 캐시에 이전 이미지가 남습니다)
+    """
+    return f"boards/{board_id}/{user_id}_{uuid.uuid4().hex[:8]}.png"
+
+
+def get_regeneration_payload(db: Session, board_id: int, user_id: int) -> dict:
+    """
+    이미지 재생성 작업에 필요한 보드 정보를 조회하는 함수
     """
-    # 1. 기존 보드 정보 가져오기
     board = db.query(Board).filter(Board.id == board_id, Board.user_id == user_id).first()
     if not board:
         raise ValueError("해당 보드를 찾을 수 없습니다.")
 
-    # 2. 기존 이미지 삭제 (선택 사항, 필요 시 GCS에서 삭제)
-    if board.image_url:
-        image_url_value = str(board.image_url)  # 문자열로 명시적 변환
+    # `board.category_ratio`와 `board.keywords` 값을 Python 기본 타입으로 변환
+    category_ratio = json.loads(board.category_ratio) if isinstance(board.category_ratio,
+                                                                    str) else board.category_ratio
+    keywords = json.loads(board.keywords) if isinstance(board.keywords, str) else board.keywords
+
+    return {
+        "user_id": user_id,
+        "board_id": board_id,
+        "board_name": board.board_name,
+        "category_ratio": category_ratio,
+        "keywords": keywords,
+        "previous_image_url": board.image_url,
+        "previous_image_urls": [board.image_url, *(board.image_variants or {}).values()],
+    }
+
+
+def swap_board_image(db: Session, board_id: int, previous_image_url: str | None, new_image_url: str) -> bool:
+    """
+    보드 이미지 URL을 원자적으로 교체하는 함수.
+    재생성을 시작한 시점의 URL이 그대로일 때만 교체하므로 동시에 실행된 재생성 결과가 덮어써지지 않습니다.
+    파생 이미지는 새 이미지 기준으로 다시 생성되므로 함께 초기화합니다.
+
+    Returns:
+        bool: 교체 여부
+    """
+    updated = (
+        db.query(Board)
+        .filter(Board.id == board_id, Board.image_url == previous_image_url)
+        .update(
+            {"image_url": new_image_url, "thumbnail_url": None, "image_variants": None},
+            synchronize_session=False,
+        )
+    )
+    db.commit()
+    return updated == 1
+
+
+def delete_board_images(image_urls: list[str]):
+    """
+    더 이상 사용하지 않는 보드 이미지(원본 및 파생 이미지)를 GCS에서 삭제하는 함수
+    """
+    for image_url in image_urls:
+        if not image_url:
+            continue
         try:
-            delete_image_from_gcs(image_url_value)
+            delete_image_from_gcs(image_url)
         except Exception as e:
             print(f"기존 이미지 삭제 오류: {str(e)}")
-    else:
-        print("보드에 이미지 URL이 없습니다.")
 
-    # 3. DALL·E를 통한 새로운 이미지 생성
-    try:
-        # `board.category_ratio`와 `board.keywords` 값을 Python 기본 타입으로 변환
-        category_ratio = json.loads(board.category_ratio) if isinstance(board.category_ratio,
-                                                                        str) else board.category_ratio
-        keywords = json.loads(board.keywords) if isinstance(board.keywords, str) else board.keywords
 
-        # 이미지 생성
-        new_image_url = generate_image_with_dalle(category_ratio, keywords)
+def regenerate_image(board_id: int, user_id: int, db: Session):
+    """
+    이미지를 재생성하고 GCS 및 DB를 업데이트하는 함수 (동기 실행용)
+    API에서는 Celery 작업(create_image_regeneration_pipeline)을 사용합니다.
+    :param board_id: 재생성할 보드의 ID
+    :param user_id: 요청한 사용자의 ID
+    :param db: 데이터베이스 세션
+    """
+    # 1. 기존 보드 정보 가져오기
+    payload = get_regeneration_payload(db, board_id, user_id)
+
+    # 2. DALL·E를 통한 새로운 이미지 생성
+    try:
+        new_image_url = generate_image_with_dalle(payload["category_ratio"], payload["keywords"])
         parsed_url = urlparse(new_image_url)
         if not parsed_url.scheme or not parsed_url.netloc:
             raise ValueError(f"재생성된 이미지 URL이 유효하지 않습니다: {new_image_url}")
     except Exception as e:
         raise ValueError(f"DALL·E 이미지 재생성 오류: {str(e)}")
 
-
-
-    # 4. 새로운 이미지 GCS 업로드
+    # 3. 새로운 이미지 GCS 업로드 (새 경로)
     max_retries = 3
     gcs_image_url = None
     for attempt in range(max_retries):
         try:
             gcs_image_url = upload_image_to_gcs(
-                new_image_url,
-                f"boards/{board.board_name}/{user_id}.png"
+                new_image_url, build_board_image_path(board_id, user_id)
             )
             break
         except Exception as e:
@@ -309,9 +463,11 @@ def regenerate_image(board_id: int, user_id: int, db: Session):
             else:
                 raise ValueError(f"GCS 업로드 오류: {str(e)}")
 
-    # 5. DB 업데이트
-    board.image_url = gcs_image_url
-    db.commit()
+    # 4. DB 업데이트 후 기존 이미지 삭제 (교체 전에 삭제하면 그 사이 깨진 이미지가 노출됨)
+    if not swap_board_image(db, board_id, payload["previous_image_url"], gcs_image_url):
+        delete_board_images([gcs_image_url])
+        raise ValueError("다른 요청이 먼저 이미지를 교체했습니다.")
+    delete_board_images(payload["previous_image_urls"])
     print(f"이미지가 재생성되고 업데이트되었습니다: {gcs_image_url}")
 
-    return gcs_image_url
\ No newline at end of file
+    return gcs_image_url
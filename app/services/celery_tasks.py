@@ -1,93 +1,350 @@
+from celery import chain
 from app.utils.celery_app import celery_app
 from app.db import SessionLocal
 from app.models.board import Board
+from app.models.user import User
+from app.services.channel_service import fetch_channels_concurrently
+from app.services.profile_service import compact_profile_images
+from app.utils.progress_handler import ProgressHandler
+from app.utils.image_handler import create_image_derivatives
+from app.utils.similarity import board_vector, vector_to_bytes
+from app.utils.board_index import mark_board_index_stale
 from app.services.board_service import (
-    fetch_cached_videos,
-    fetch_videos_from_api,
-    fetch_video_details,
     process_channel_data,
     generate_image_with_dalle,
     upload_image_to_gcs,
+    build_board_image_path,
+    swap_board_image,
+    delete_board_images,
 )
-import time
 from urllib.parse import urlparse
 
-@celery_app.task(name="app.services.celery_tasks.create_board_task")
-def create_board_task(user_id: int, board_id: int, channel_ids: list):
+
+def create_board_pipeline(user_id: int, board_id: int, channel_ids: list):
+    """
+    보드 생성 파이프라인 (fetch → analyze → render → store → derive) 체인을 구성합니다.
+    각 단계는 celery_app.conf.task_routes에 따라 별도의 큐로 라우팅되며,
+    이전 단계의 반환값(payload)을 다음 단계의 인자로 전달받습니다.
+    """
+    return chain(
+        fetch_board_videos_task.s(
+            user_id=user_id, board_id=board_id, channel_ids=channel_ids
+        ),
+        analyze_board_task.s(),
+        render_board_image_task.s(),
+        store_board_task.s(),
+        derive_board_images_task.s(),
+    ).on_error(board_pipeline_failed.s(board_id=board_id))
+
+
+def create_image_regeneration_pipeline(payload: dict, job_id: str):
     """
-    Celery Task: 보드 생성 비동기 작업
+    이미지 재생성 파이프라인 (render → replace → derive) 체인을 구성합니다.
+    payload는 board_service.get_regeneration_payload()의 반환값이며,
+    job_id는 이미지 교체 작업의 task id로 사용되어 작업 상태 조회 핸들이 됩니다.
     """
+    return chain(
+        render_board_image_task.s(payload),
+        replace_board_image_task.s().set(task_id=job_id),
+        derive_board_images_task.s(),
+    ).on_error(board_pipeline_failed.s(board_id=payload["board_id"], job_id=job_id))
+
 
-    db = SessionLocal()  # Celery Task 내부에서 DB 세션 생성
+# acks_late: 워커가 작업 도중 종료되면 메시지를 다시 전달받아 재실행합니다.
+# 같은 결과를 다시 쓰는 작업(fetch, store, derive, 이미지 삭제)에만 사용하고,
+# GPT/DALL·E를 호출하는 analyze/render와 새 경로에 업로드하는 replace는 재실행 시 비용이 중복되므로 제외합니다.
+@celery_app.task(name="app.services.celery_tasks.fetch_board_videos_task", acks_late=True)
+def fetch_board_videos_task(user_id: int, board_id: int, channel_ids: list) -> dict:
+    """
+    Celery Task (1단계): YouTube 데이터 조회
+    """
+    ProgressHandler.publish_board_progress(board_id, "fetch")
 
+    db = SessionLocal()
     try:
-        # Step 1: DB에서 보드 객체 가져오기
-        board = db.query(Board).filter(Board.id == board_id).first()
+        board = db.query(Board.id).filter(Board.id == board_id).first()
         if not board:
             raise ValueError(f"보드 ID {board_id}를 찾을 수 없습니다.")
+    finally:
+        db.close()
 
+    # 채널별 조회를 동시에 수행
+    result = fetch_channels_concurrently(board_id, channel_ids)
+    print(
+        f"[DEBUG] YouTube 데이터 조회 완료: {len(result['channels'])}개 채널, "
+        f"동영상 {len(result['video_ids'])}개 (신규 세부 정보 {result['fetched_video_count']}개), "
+        f"쿼터 {result['quota']['units']}"
+    )
 
-        # Step 2: YouTube 데이터 처리
-        results = []
-        cached_results = fetch_cached_videos(channel_ids)
-
-        for channel_id in channel_ids:
-            if channel_id in cached_results:
-                results.append(cached_results[channel_id])
-            else:
-                video_ids = fetch_videos_from_api(board_id, channel_id)
-                video_details = fetch_video_details(video_ids)
-                results.append({"channel_id": channel_id, "videos": video_details})
-
-
-        # Step 3: OpenAI GPT 키워드 및 카테고리 생성
-        gpt_result = process_channel_data(channel_ids)
-        category_ratio = gpt_result.get("category_ratio", [])
-        keywords = gpt_result.get("keywords", {})
-        board_name = gpt_result.get("board_name", "Generated Board")
-
-        # Step 4: DALL·E 이미지 생성
-        try:
-            image_url = generate_image_with_dalle(category_ratio, keywords)
-            parsed_url = urlparse(image_url)
-            if not parsed_url.scheme or not parsed_url.netloc:
-                raise ValueError(f"생성된 이미지 URL이 유효하지 않습니다: {image_url}")
-        except Exception as e:
-            raise ValueError(f"DALL·E 이미지 생성 오류: {str(e)}")
-
-        # Step 5: GCS 업로드
-        max_retries = 3
-        gcs_image_url = None
-        for attempt in range(max_retries):
-            try:
-                gcs_image_url = upload_image_to_gcs(
-                    image_url, f"boards/{board.id}/{user_id}.png"
-                )
-                break
-            except Exception as e:
-                if attempt < max_retries - 1:
-                    print(f"GCS 업로드 실패, 재시도 중 ({attempt + 1}/{max_retries})...")
-                    time.sleep(2)
-                else:
-                    raise ValueError(f"GCS 업로드 오류: {str(e)}")
+    return {
+        "user_id": user_id,
+        "board_id": board_id,
+        "channel_ids": channel_ids,
+        "youtube_quota": result["quota"],
+    }
+
+
+@celery_app.task(name="app.services.celery_tasks.analyze_board_task")
+def analyze_board_task(payload: dict) -> dict:
+    """
+    Celery Task (2단계): OpenAI GPT 키워드 및 카테고리 생성
+    """
+    ProgressHandler.publish_board_progress(payload["board_id"], "analyze")
+
+    gpt_result = process_channel_data(payload["channel_ids"])
+
+    return {
+        **payload,
+        "category_ratio": gpt_result.get("category_ratio", []),
+        "keywords": gpt_result.get("keywords", {}),
+        "board_name": gpt_result.get("board_name", "Generated Board"),
+    }
+
+
+@celery_app.task(name="app.services.celery_tasks.render_board_image_task")
+def render_board_image_task(payload: dict) -> dict:
+    """
+    Celery Task (3단계): DALL·E 이미지 생성
+    """
+    ProgressHandler.publish_board_progress(
+        payload["board_id"],
+        "render",
+        {"board_name": payload["board_name"], "keywords": payload["keywords"]},
+    )
+
+    try:
+        image_url = generate_image_with_dalle(payload["category_ratio"], payload["keywords"])
+        parsed_url = urlparse(image_url)
+        if not parsed_url.scheme or not parsed_url.netloc:
+            raise ValueError(f"생성된 이미지 URL이 유효하지 않습니다: {image_url}")
+    except Exception as e:
+        raise ValueError(f"DALL·E 이미지 생성 오류: {str(e)}")
+
+    return {**payload, "image_url": image_url}
+
+
+@celery_app.task(
+    bind=True,
+    name="app.services.celery_tasks.store_board_task",
+    acks_late=True,
+    max_retries=2,
+    default_retry_delay=2,
+)
+def store_board_task(self, payload: dict) -> dict:
+    """
+    Celery Task (4단계): GCS 업로드 및 보드 데이터 업데이트
+    업로드 실패 시 워커 슬롯을 점유한 채 대기하지 않고 Celery 재시도로 다시 예약합니다.
+    """
+    board_id = payload["board_id"]
+    user_id = payload["user_id"]
+    image_path = f"boards/{board_id}/{user_id}.png"
+    ProgressHandler.publish_board_progress(board_id, "store")
+
+    try:
+        gcs_image_url = upload_image_to_gcs(payload["image_url"], image_path)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            print(f"GCS 업로드 실패, 재시도 중 ({self.request.retries + 1}/{self.max_retries + 1})...")
+            raise self.retry(exc=e)
+        raise ValueError(f"GCS 업로드 오류: {str(e)}")
+
+    db = SessionLocal()
+    try:
+        board = db.query(Board).filter(Board.id == board_id).first()
+        if not board:
+            raise ValueError(f"보드 ID {board_id}를 찾을 수 없습니다.")
 
-        # Step 6: 보드 데이터 업데이트
         board.image_url = gcs_image_url
-        board.category_ratio = category_ratio
-        board.keywords = keywords
-        board.board_name = board_name
+        board.category_ratio = payload["category_ratio"]
+        board.keywords = payload["keywords"]
+        board.board_name = payload["board_name"]
+        board.vector = vector_to_bytes(
+            board_vector(payload["keywords"], payload["category_ratio"])
+        )
         db.commit()
+    finally:
+        db.close()
+    mark_board_index_stale()
+
+    ProgressHandler.publish_board_progress(
+        board_id, "completed", {"image_url": gcs_image_url}
+    )
+
+    return {
+        "board_id": board_id,
+        "category_ratio": payload["category_ratio"],
+        "keywords": payload["keywords"],
+        "gcs_image_url": gcs_image_url,
+        "image_path": image_path,
+    }
+
+
+@celery_app.task(
+    bind=True,
+    name="app.services.celery_tasks.replace_board_image_task",
+    max_retries=2,
+    default_retry_delay=2,
+)
+def replace_board_image_task(self, payload: dict) -> dict:
+    """
+    Celery Task (이미지 재생성): 새 경로에 업로드 후 보드 이미지 URL 교체
+    교체가 끝난 뒤에 기존 이미지 삭제를 별도 작업으로 넘겨 파생 이미지 생성과 동시에 진행합니다.
+    """
+    board_id = payload["board_id"]
+    image_path = build_board_image_path(board_id, payload["user_id"])
+    ProgressHandler.publish_board_progress(board_id, "store")
+
+    try:
+        gcs_image_url = upload_image_to_gcs(payload["image_url"], image_path)
+    except Exception as e:
+        if self.request.retries < self.max_retries:
+            print(f"GCS 업로드 실패, 재시도 중 ({self.request.retries + 1}/{self.max_retries + 1})...")
+            raise self.retry(exc=e)
+        raise ValueError(f"GCS 업로드 오류: {str(e)}")
+
+    db = SessionLocal()
+    try:
+        swapped = swap_board_image(db, board_id, payload["previous_image_url"], gcs_image_url)
+    finally:
+        db.close()
+
+    if not swapped:
+        delete_board_images([gcs_image_url])
+        raise ValueError("다른 요청이 먼저 이미지를 교체했습니다.")
+
+    delete_board_images_task.delay(payload["previous_image_urls"])
+    ProgressHandler.publish_board_progress(
+        board_id, "completed", {"image_url": gcs_image_url}
+    )
+
+    return {
+        "board_id": board_id,
+        "gcs_image_url": gcs_image_url,
+        "image_path": image_path,
+    }
 
-        return {
-            "board_id": board_id,
-            "category_ratio": category_ratio,
-            "keywords": keywords,
-            "gcs_image_url": gcs_image_url,
-        }
 
+@celery_app.task(name="app.services.celery_tasks.delete_board_images_task", acks_late=True)
+def delete_board_images_task(image_urls: list[str]):
+    """
+    Celery Task: 교체된 이전 보드 이미지 삭제
+    """
+    delete_board_images(image_urls)
+
+
+@celery_app.task(name="app.services.celery_tasks.derive_board_images_task", acks_late=True)
+def derive_board_images_task(result: dict) -> dict:
+    """
+    Celery Task (5단계): 썸네일 및 WebP/AVIF 파생 이미지 생성
+    이미지 인코딩은 CPU 작업이므로 board.derive 큐의 전용 프로세스 풀 워커에서 실행됩니다.
+    보드는 이미 완성된 상태이므로 실패해도 원본 이미지로 동작하도록 오류는 로그만 남깁니다.
+    """
+    board_id = result["board_id"]
+
+    try:
+        image_variants = create_image_derivatives(result["image_path"])
     except Exception as e:
-        print(f"[ERROR] create_board_task 오류 발생: {str(e)}")
-        return {"error": str(e)}
+        print(f"[ERROR] 보드 {board_id} 파생 이미지 생성 실패: {str(e)}")
+        return result
+
+    db = SessionLocal()
+    try:
+        # 그 사이 이미지가 다시 교체되었다면 이전 이미지의 파생 이미지로 덮어쓰지 않음
+        db.query(Board).filter(
+            Board.id == board_id, Board.image_url == result["gcs_image_url"]
+        ).update(
+            {
+                "thumbnail_url": image_variants.get("thumbnail_webp"),
+                "image_variants": image_variants,
+            }
+        )
+        db.commit()
+    finally:
+        db.close()
+
+    return {**result, "image_variants": image_variants}
+
+
+@celery_app.task(name="app.services.celery_tasks.board_pipeline_failed")
+def board_pipeline_failed(request, exc, traceback, board_id: int, job_id: str | None = None):
+    """
+    보드 생성 파이프라인의 어느 단계든 실패하면 호출되는 에러 콜백
+    이미지 재생성 작업은 이전 단계에서 실패하면 교체 작업이 실행되지 않으므로 job_id를 실패로 기록합니다.
+    파생 이미지 단계는 보드 저장(이미지 교체)이 끝난 뒤 실행되므로, 실패해도 보드/작업을 실패로 바꾸지 않습니다.
+    """
+    if request.task == derive_board_images_task.name:
+        print(f"[WARNING] 보드 {board_id} 파생 이미지 단계 실패 (보드는 완료 상태 유지): {str(exc)}")
+        return
+
+    print(f"[ERROR] 보드 {board_id} 생성 파이프라인 오류 발생 ({request.task}): {str(exc)}")
+    ProgressHandler.publish_board_progress(board_id, "failed", {"error": str(exc)})
+    if job_id and request.id != job_id and celery_app.AsyncResult(job_id).state != "SUCCESS":
+        celery_app.backend.mark_as_failure(job_id, exc)
+
+
+@celery_app.task(name="app.services.celery_tasks.backfill_board_vectors_task")
+def backfill_board_vectors_task(batch_size: int = 500) -> int:
+    """
+    벡터가 없는 기존 보드의 유사 보드 검색용 벡터를 계산하여 저장합니다.
+    """
+    updated = 0
+    db = SessionLocal()
+    try:
+        last_id = 0
+        while True:
+            boards = (
+                db.query(Board.id, Board.keywords, Board.category_ratio)
+                .filter(Board.vector.is_(None), Board.id > last_id)
+                .order_by(Board.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not boards:
+                break
+            for board in boards:
+                if board.keywords:
+                    db.query(Board).filter(Board.id == board.id).update(
+                        {"vector": vector_to_bytes(board_vector(board.keywords, board.category_ratio))},
+                        synchronize_session=False,
+                    )
+                    updated += 1
+            db.commit()
+            last_id = boards[-1].id
+    finally:
+        db.close()
+
+    if updated:
+        mark_board_index_stale()
+    print(f"[DEBUG] 보드 벡터 {updated}개 계산 완료")
+    return updated
+
+
+@celery_app.task(name="app.services.celery_tasks.compact_profile_images_task")
+def compact_profile_images_task(user_id: int | None = None) -> dict:
+    """
+    프로필 사진 정리 작업: profile_img_url 채우기 및 이전 프로필 사진 삭제
+    user_id를 지정하지 않으면 모든 사용자를 대상으로 실행합니다 (기존 데이터 이전용).
+    """
+    db = SessionLocal()
+    try:
+        if user_id is not None:
+            user_ids = [user_id]
+        else:
+            user_ids = [row.id for row in db.query(User.id).order_by(User.id)]
 
+        summary = {"users": 0, "backfilled": 0, "deleted": 0}
+        for target_id in user_ids:
+            try:
+                result = compact_profile_images(target_id, db)
+            except Exception as e:
+                db.rollback()
+                print(f"[ERROR] 사용자 {target_id} 프로필 사진 정리 실패: {str(e)}")
+                continue
+            summary["users"] += 1
+            summary["backfilled"] += int(result["backfilled"])
+            summary["deleted"] += result["deleted"]
     finally:
         db.close()
+
+    print(f"[DEBUG] 프로필 사진 정리 완료: {summary}")
+    return summary
@@ -1,27 +1,73 @@
-import requests
-from app.config import GoogleConfig
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from app.config import GoogleConfig, settings
+from app.utils import time_zone
 from app.utils.redis_handler import RedisHandler
+from app.utils.http_client import get_http_client
+from app.utils.utils import youtube_api_get
 import json
 
 youtube_api_key = GoogleConfig.API_KEY
 
+# videos/channels API의 id 파라미터 최대 개수
+VIDEO_BATCH_SIZE = 50
+# 채널 업로드 재생목록 ID 캐시 기간 (재생목록 ID는 사실상 변하지 않음)
+UPLOADS_PLAYLIST_EXPIRE = 60 * 60 * 24 * 30
+
+# YouTube Data API 엔드포인트별 쿼터 비용
+YOUTUBE_QUOTA_COST = {
+    "search": 100,
+    "videos": 1,
+    "channels": 1,
+    "playlistItems": 1,
+}
+
+
+class QuotaTracker:
+    """
+    보드 하나를 만드는 동안 사용한 YouTube API 쿼터를 집계하는 클래스 (스레드 안전).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.units = 0
+        self.calls = {}
+
+    def add(self, endpoint: str):
+        with self._lock:
+            self.units += YOUTUBE_QUOTA_COST[endpoint]
+            self.calls[endpoint] = self.calls.get(endpoint, 0) + 1
+
+    def report(self) -> dict:
+        with self._lock:
+            return {"units": self.units, "calls": dict(self.calls)}
+
+
+def record_daily_quota(units: int):
+    """
+    일별 YouTube 쿼터 사용량을 Redis(youtube_quota:{날짜})에 누적하는 함수.
+    """
+    if not units:
+        return
+    redis_key = f"youtube_quota:{datetime.now(time_zone()).strftime('%Y-%m-%d')}"
+    try:
+        RedisHandler.incr_value(redis_key, units, expire=60 * 60 * 24 * 7)
+    except Exception as e:
+        print(f"[ERROR] YouTube 쿼터 사용량 기록 실패: {e}")
+
 
 def fetch_cached_videos(channel_ids: list[str]) -> list[dict]:
     results = []
-    for channel_id in channel_ids:
-        redis_key_channel = f"youtube_channel:{channel_id}"
-        cached_video_ids = RedisHandler.get_from_redis_list(redis_key_channel)
-
+    cached_lists = RedisHandler.get_many_from_redis_list(
+        [f"youtube_channel:{channel_id}" for channel_id in channel_ids]
+    )
+    for channel_id, cached_video_ids in zip(channel_ids, cached_lists):
         if cached_video_ids:
-            latest_videos = (
-                cached_video_ids
-                if isinstance(cached_video_ids, list)
-                else json.loads(cached_video_ids)
-            )
             results.append(
                 {
                     "채널ID": channel_id,
-                    "최신동영상목록": latest_videos,
+                    "최신동영상목록": cached_video_ids,
                     "is_cached": True,
                 }
             )
@@ -32,7 +78,21 @@ def fetch_cached_videos(channel_ids: list[str]) -> list[dict]:
     return results
 
 
-def fetch_videos_from_api(board_id: int, channel_id: str) -> list[str]:
+def search_channel_video_ids(
+    channel_id: str, quota: QuotaTracker | None = None, save: bool = True
+) -> list[str]:
+    """
+    YouTube search API로 채널의 최신 동영상 ID를 가져와 채널 캐시에 저장하는 함수.
+    search API는 호출당 100 쿼터를 사용합니다.
+
+    Args:
+        channel_id (str): 조회할 채널 ID
+        quota (QuotaTracker | None): 쿼터 집계 객체
+        save (bool): 채널 캐시에 바로 저장할지 여부 (False이면 호출자가 일괄 저장)
+
+    Returns:
+        list[str]: 최신 동영상 ID 목록
+    """
     search_params = {
         "part": "snippet",
         "channelId": channel_id,
@@ -42,9 +102,9 @@ def fetch_videos_from_api(board_id: int, channel_id: str) -> list[str]:
         "key": youtube_api_key,
     }
 
-    search_response = requests.get(
-        "https://www.googleapis.com/youtube/v3/search", params=search_params
-    )
+    search_response = youtube_api_get("search", search_params)
+    if quota:
+        quota.add("search")
 
     if search_response.status_code != 200:
         raise ValueError(f"YouTube API 호출에 실패했습니다. (채널 ID: {channel_id})")
@@ -54,38 +114,286 @@ def fetch_videos_from_api(board_id: int, channel_id: str) -> list[str]:
     print(f"[DEBUG] YouTube API에서 가져온 video_ids: {video_ids}")
 
     # Redis에 채널별 데이터 저장
-    redis_key_channel = f"youtube_channel:{channel_id}"
-    RedisHandler.save_to_redis_list(redis_key_channel, json.dumps(video_ids))
-    print(f"[DEBUG] Redis에 youtube_channel:{channel_id} 저장 완료 (중복 제거 후 {len(video_ids)}개 저장).")
+    if save:
+        redis_key_channel = f"youtube_channel:{channel_id}"
+        RedisHandler.save_to_redis_list(redis_key_channel, json.dumps(video_ids))
+        print(f"[DEBUG] Redis에 youtube_channel:{channel_id} 저장 완료 (중복 제거 후 {len(video_ids)}개 저장).")
 
-    # Redis에 보드별 데이터 저장
+    return video_ids
+
+
+def resolve_uploads_playlists(
+    channel_ids: list[str], quota: QuotaTracker | None = None
+) -> dict:
+    """
+    채널별 업로드 재생목록 ID를 조회하는 함수.
+    Redis(youtube_uploads_playlist:{채널ID})에 캐시된 값을 우선 사용하고,
+    없는 채널만 channels API로 50개씩 묶어 조회합니다 (호출당 1 쿼터).
+
+    Args:
+        channel_ids (list[str]): 채널 ID 목록
+        quota (QuotaTracker | None): 쿼터 집계 객체
+
+    Returns:
+        dict: {채널ID: 업로드 재생목록 ID}
+    """
+    channel_ids = list(dict.fromkeys(channel_ids))
+    cached = RedisHandler.get_values(
+        [f"youtube_uploads_playlist:{channel_id}" for channel_id in channel_ids]
+    )
+    playlists = {
+        channel_id: playlist_id
+        for channel_id, playlist_id in zip(channel_ids, cached)
+        if playlist_id
+    }
+    missing_channel_ids = [
+        channel_id for channel_id in channel_ids if channel_id not in playlists
+    ]
+
+    resolved = {}
+    for i in range(0, len(missing_channel_ids), VIDEO_BATCH_SIZE):
+        chunk_ids = missing_channel_ids[i : i + VIDEO_BATCH_SIZE]
+        channel_params = {
+            "part": "contentDetails",
+            "id": ",".join(chunk_ids),
+            "fields": "items(id,contentDetails/relatedPlaylists/uploads)",
+            "maxResults": VIDEO_BATCH_SIZE,
+            "key": youtube_api_key,
+        }
+        channel_response = youtube_api_get("channels", channel_params)
+        if quota:
+            quota.add("channels")
+        if channel_response.status_code != 200:
+            raise ValueError(f"YouTube API 호출에 실패했습니다. (채널 IDs: {chunk_ids})")
+
+        for item in channel_response.json().get("items", []):
+            uploads = item.get("contentDetails", {}).get("relatedPlaylists", {}).get("uploads")
+            if uploads:
+                resolved[item["id"]] = uploads
+
+    if resolved:
+        RedisHandler.set_values(
+            {
+                f"youtube_uploads_playlist:{channel_id}": playlist_id
+                for channel_id, playlist_id in resolved.items()
+            },
+            expire=UPLOADS_PLAYLIST_EXPIRE,
+        )
+
+    playlists.update(resolved)
+    return playlists
+
+
+def list_playlist_video_ids(
+    channel_id: str, playlist_id: str, quota: QuotaTracker | None = None, save: bool = True
+) -> list[str]:
+    """
+    업로드 재생목록(playlistItems API, 호출당 1 쿼터)으로 채널의 최신 동영상 ID를 가져와
+    채널 캐시에 저장하는 함수. search API와 같은 결과를 1/100 쿼터로 얻습니다.
+
+    Args:
+        channel_id (str): 채널 ID
+        playlist_id (str): 업로드 재생목록 ID
+        quota (QuotaTracker | None): 쿼터 집계 객체
+        save (bool): 채널 캐시에 바로 저장할지 여부 (False이면 호출자가 일괄 저장)
+
+    Returns:
+        list[str]: 최신 동영상 ID 목록
+    """
+    playlist_params = {
+        "part": "contentDetails",
+        "playlistId": playlist_id,
+        "maxResults": 2,  # 테스트를 위한 제한
+        "fields": "items/contentDetails/videoId",
+        "key": youtube_api_key,
+    }
+    playlist_response = youtube_api_get("playlistItems", playlist_params)
+    if quota:
+        quota.add("playlistItems")
+    if playlist_response.status_code != 200:
+        raise ValueError(f"YouTube API 호출에 실패했습니다. (채널 ID: {channel_id})")
+
+    video_ids = [
+        item["contentDetails"]["videoId"]
+        for item in playlist_response.json().get("items", [])
+    ]
+    print(f"[DEBUG] 업로드 재생목록에서 가져온 video_ids: {video_ids}")
+
+    # Redis에 채널별 데이터 저장
+    if save:
+        RedisHandler.save_to_redis_list(f"youtube_channel:{channel_id}", json.dumps(video_ids))
+
+    return video_ids
+
+
+def save_board_videos(board_id: int, video_ids: list[str]):
+    """
+    보드별 동영상 ID 목록(board_videos:{board_id})에 동영상 ID를 병합 저장하는 함수.
+    """
+    # save_to_redis_list가 기존 목록과 병합하며 중복을 제거함
     redis_key_board_videos = f"board_videos:{board_id}"
-    existing_videos = RedisHandler.get_from_redis_list(redis_key_board_videos) or []
-    print(f"[DEBUG] Redis에서 가져온 기존 board_videos:{board_id}: {existing_videos}")
+    unique_video_ids = list(dict.fromkeys(video_ids))
+    RedisHandler.save_to_redis_list(redis_key_board_videos, json.dumps(unique_video_ids))
+    print(f"[DEBUG] Redis에 board_videos:{board_id} 저장 완료 ({len(unique_video_ids)}개 병합).")
 
 
-    combined_videos = list(set(existing_videos + video_ids))
-    RedisHandler.save_to_redis_list(redis_key_board_videos, json.dumps(combined_videos))
-    print(f"[DEBUG] Redis에 board_videos:{board_id} 저장 완료 (중복 제거 후 {len(combined_videos)}개 저장).")
+def fetch_videos_from_api(board_id: int, channel_id: str) -> list[str]:
+    video_ids = search_channel_video_ids(channel_id)
+
+    # Redis에 보드별 데이터 저장
+    save_board_videos(board_id, video_ids)
 
     return video_ids
 
 
-def fetch_video_details(video_ids: list[str]) -> list[dict]:
+def fetch_channels_concurrently(
+    board_id: int,
+    channel_ids: list[str],
+    max_workers: int | None = None,
+    listing_mode: str | None = None,
+) -> dict:
+    """
+    여러 채널의 최신 동영상과 세부 정보를 동시에 가져오는 함수.
+
+    1. 캐시되지 않은 채널의 동영상 목록을 스레드 풀에서 병렬로 조회
+       (listing_mode="playlist"이면 업로드 재생목록, "search"이면 search API 사용)
+    2. 모든 채널의 동영상 ID를 모은 뒤 Redis(youtube_video:{id})에 없는 ID만 추림
+    3. 남은 ID를 50개 단위 배치로 나누어 videos API를 병렬 호출
+    동시 실행 수는 max_workers(기본값: settings.youtube_fetch_concurrency)로 제한됨.
+
+    Args:
+        board_id (int): 보드 ID
+        channel_ids (list[str]): 조회할 채널 ID 목록
+        max_workers (int | None): 최대 동시 요청 수
+        listing_mode (str | None): 동영상 목록 조회 방식 (기본값: settings.youtube_listing_mode)
+
+    Returns:
+        dict: {"channels": 채널별 결과 목록(channel_ids 순서), "video_ids": 보드 동영상 ID 목록,
+               "fetched_video_count": videos API로 새로 가져온 동영상 수,
+               "quota": 사용한 YouTube API 쿼터 ({"units", "calls"})}
+    """
+    max_workers = max_workers or settings.youtube_fetch_concurrency
+    listing_mode = listing_mode or settings.youtube_listing_mode
+    quota = QuotaTracker()
+
+    results = {}
+    uncached_channel_ids = []
+    for result in fetch_cached_videos(channel_ids):
+        channel_id = result["채널ID"]
+        if result["is_cached"]:
+            results[channel_id] = {
+                "channel_id": channel_id,
+                "video_ids": result["최신동영상목록"],
+                "is_cached": True,
+            }
+        elif channel_id not in uncached_channel_ids:
+            uncached_channel_ids.append(channel_id)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        # Step 1: 채널별 동영상 목록 조회
+        if listing_mode == "playlist" and uncached_channel_ids:
+            try:
+                playlists = resolve_uploads_playlists(uncached_channel_ids, quota)
+            except Exception as e:
+                print(f"[ERROR] 업로드 재생목록 조회 실패: {e}")
+                playlists = {}
+            futures = {
+                executor.submit(
+                    list_playlist_video_ids, channel_id, playlists[channel_id], quota, False
+                ): channel_id
+                for channel_id in uncached_channel_ids
+                if channel_id in playlists
+            }
+            for channel_id in uncached_channel_ids:
+                if channel_id not in playlists:
+                    print(f"[ERROR] 채널 {channel_id}의 업로드 재생목록을 찾을 수 없습니다.")
+                    results[channel_id] = {
+                        "channel_id": channel_id,
+                        "video_ids": [],
+                        "is_cached": False,
+                    }
+        else:
+            futures = {
+                executor.submit(search_channel_video_ids, channel_id, quota, False): channel_id
+                for channel_id in uncached_channel_ids
+            }
+        fetched_channel_lists = {}
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                video_ids = future.result()
+                fetched_channel_lists[f"youtube_channel:{channel_id}"] = video_ids
+            except Exception as e:
+                # 한 채널의 실패가 전체 보드 생성을 막지 않도록 빈 결과로 처리
+                print(f"[ERROR] 채널 {channel_id} 조회 실패: {e}")
+                video_ids = []
+            results[channel_id] = {
+                "channel_id": channel_id,
+                "video_ids": video_ids,
+                "is_cached": False,
+            }
+        # 채널별 동영상 목록은 채널 수와 관계없이 MGET 1회 + 파이프라인 1회로 저장
+        RedisHandler.save_many_to_redis_list(fetched_channel_lists)
+
+        ordered_results = [results[channel_id] for channel_id in channel_ids]
+        board_video_ids = list(
+            dict.fromkeys(
+                video_id for result in ordered_results for video_id in result["video_ids"]
+            )
+        )
+
+        # Step 2: 세부 정보가 캐시되지 않은 동영상만 50개 단위로 조회
+        missing_video_ids = RedisHandler.filter_missing_video_ids(board_video_ids)
+        print(
+            f"[DEBUG] 동영상 {len(board_video_ids)}개 중 세부 정보 조회 필요: {len(missing_video_ids)}개"
+        )
+        batches = [
+            missing_video_ids[i : i + VIDEO_BATCH_SIZE]
+            for i in range(0, len(missing_video_ids), VIDEO_BATCH_SIZE)
+        ]
+        fetched_video_count = 0
+        for future in as_completed(
+            [executor.submit(fetch_video_details, batch, quota) for batch in batches]
+        ):
+            try:
+                fetched_video_count += len(future.result())
+            except Exception as e:
+                print(f"[ERROR] 동영상 세부 정보 조회 실패: {e}")
+
+    # 보드별 동영상 목록은 스레드 간 경합을 피하기 위해 한 번에 저장
+    if board_video_ids:
+        save_board_videos(board_id, board_video_ids)
+
+    quota_report = quota.report()
+    record_daily_quota(quota_report["units"])
+    print(f"[DEBUG] 보드 {board_id} YouTube 쿼터 사용량 ({listing_mode}): {quota_report}")
+
+    return {
+        "channels": ordered_results,
+        "video_ids": board_video_ids,
+        "fetched_video_count": fetched_video_count,
+        "quota": quota_report,
+    }
+
+
+def fetch_video_details(video_ids: list[str], quota: QuotaTracker | None = None) -> list[dict]:
     max_tags = 6
     max_desc_length = 300
-    video_endpoint = "https://www.googleapis.com/youtube/v3/videos"
     video_details = []
 
-    for i in range(0, len(video_ids), 50):  # YouTube API 제한으로 50개씩 처리
-        chunk_ids = video_ids[i : i + 50]
+    for i in range(0, len(video_ids), VIDEO_BATCH_SIZE):  # YouTube API 제한으로 50개씩 처리
+        chunk_ids = video_ids[i : i + VIDEO_BATCH_SIZE]
         video_params = {
-            "part": "snippet, contentDetails, statistics",
+            "part": "snippet",
             "id": ",".join(chunk_ids),
+            # 사용하는 필드만 응답받아 페이로드 축소
+            "fields": "items(id,snippet(tags,categoryId,localized))",
             "key": youtube_api_key,
         }
 
-        video_response = requests.get(video_endpoint, params=video_params)
+        video_response = youtube_api_get("videos", video_params)
+        if quota:
+            quota.add("videos")
         if video_response.status_code != 200:
             raise ValueError(
                 f"YouTube API 호출에 실패했습니다. (Video IDs: {chunk_ids})"
@@ -94,6 +402,7 @@ def fetch_video_details(video_ids: list[str]) -> list[dict]:
 
         video_data = video_response.json()
         print(f"[DEBUG] video_response.json(): {video_data}")
+        chunk_details = {}
         for video in video_data.get("items", []):
             snippet = video.get("snippet", {})
             video_info = {
@@ -104,16 +413,13 @@ def fetch_video_details(video_ids: list[str]) -> list[dict]:
                     "description", ""
                 )[:max_desc_length],
             }
-            print(f"[DEBUG] for video in video_data.get(items, []): {video_data}")
-
-            # Redis에 저장
-            redis_key_video = f"youtube_video:{video['id']}"
-            try:
-                RedisHandler.save_video_details_to_redis(redis_key_video, video_info)
-                print(f"[DEBUG] Redis에 저장된 키: {redis_key_video}, 값: {json.dumps(video_info)}")
-            except Exception as e:
-                print(f"[ERROR] Redis 저장 실패 (Key: {redis_key_video}): {e}")
-
+            chunk_details[video["id"]] = video_info
             video_details.append(video_info)
 
+        # Redis에 배치 단위로 저장
+        try:
+            RedisHandler.save_many_video_details(chunk_details)
+        except Exception as e:
+            print(f"[ERROR] Redis 저장 실패 (Video IDs: {list(chunk_details)}): {e}")
+
     return video_details
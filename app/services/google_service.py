@@ -1,10 +1,10 @@
 import json
-import requests
 import uuid
 from fastapi import HTTPException
 from app.config import GoogleConfig
 from app.utils.redis_handler import redis_client
 from app.utils.utils import youtube_api_request
+from app.utils.http_client import get_http_client
 
 
 def exchange_code_for_token(code: str) -> str:
@@ -17,7 +17,7 @@ def exchange_code_for_token(code: str) -> str:
         "grant_type": "authorization_code",
     }
     headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(token_url, data=payload, headers=headers)
+    response = get_http_client().post(token_url, data=payload, headers=headers)
 
     if response.status_code != 200:
         raise HTTPException(status_code=500, detail="토큰을 가져오는 데 실패했습니다.")
@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.models.user import User
+from app.utils.gcs_client import PROFILE_BUCKET_NAME, get_bucket
+from app.utils.redis_handler import RedisHandler
+
+# 프로필 사진 저장 폴더 (user/{user_id}/{uuid}.{ext})
+PROFILE_IMAGE_FOLDER = "user"
+# 프로필 사진이 없는 사용자도 DB를 반복 조회하지 않도록 빈 값을 짧게 캐싱
+EMPTY_PROFILE_EXPIRE = 60 * 5
+
+
+def profile_cache_key(user_id: int) -> str:
+    return f"profile_img_url:{user_id}"
+
+
+def cache_profile_image_url(user_id: int, url: str | None):
+    """
+    프로필 사진 URL을 캐시에 저장하는 함수 (업로드 직후 호출)
+    """
+    RedisHandler.set_key_value(
+        profile_cache_key(user_id),
+        url or "",
+        expire=settings.profile_cache_ttl if url else EMPTY_PROFILE_EXPIRE,
+    )
+
+
+def get_profile_image_url(user_id: int, db: Session) -> str | None:
+    """
+    프로필 사진 URL을 캐시 → User.profile_img_url 순서로 조회하는 함수.
+    GCS 목록 조회 없이 처리되므로 업로드 이력과 관계없이 일정한 시간에 응답합니다.
+
+    Returns:
+        str | None: 프로필 사진 URL (없으면 None)
+    """
+    cached = RedisHandler.get_value(profile_cache_key(user_id))
+    if cached is not None:
+        return cached or None
+
+    url = db.query(User.profile_img_url).filter(User.id == user_id).scalar()
+    cache_profile_image_url(user_id, url)
+    return url
+
+
+def compact_profile_images(user_id: int, db: Session) -> dict:
+    """
+    사용자의 프로필 사진 폴더를 정리하는 함수.
+    - profile_img_url이 비어 있으면 가장 최근 파일로 채웁니다 (기존 데이터 이전).
+    - 현재 프로필 사진이 아닌 이전 파일은 삭제합니다.
+      동시에 진행 중인 업로드를 지우지 않도록 최근 PROFILE_PRUNE_GRACE초 이내 파일은 남깁니다.
+
+    Returns:
+        dict: {"backfilled": bool, "deleted": int, "kept": int}
+    """
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise ValueError(f"사용자 ID {user_id}를 찾을 수 없습니다.")
+
+    blobs = list(get_bucket(PROFILE_BUCKET_NAME).list_blobs(prefix=f"{PROFILE_IMAGE_FOLDER}/{user_id}/"))
+    result = {"backfilled": False, "deleted": 0, "kept": 0}
+    if not blobs:
+        return result
+
+    if not user.profile_img_url:
+        user.profile_img_url = max(blobs, key=lambda b: b.updated).public_url
+        db.commit()
+        result["backfilled"] = True
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.profile_prune_grace)
+    for blob in blobs:
+        if blob.public_url == user.profile_img_url or blob.updated > cutoff:
+            result["kept"] += 1
+            continue
+        blob.delete()
+        result["deleted"] += 1
+
+    cache_profile_image_url(user_id, user.profile_img_url)
+    return result
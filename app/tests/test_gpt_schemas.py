@@ -0,0 +1,62 @@
+from app.utils.gpt_schemas import (
+    normalize_ratios,
+    repair_analysis,
+    repair_new_keywords,
+    repair_match,
+)
+
+
+def test_normalize_ratios_sum_to_100():
+    assert sum(normalize_ratios([33.3, 33.3, 33.3])) == 100
+    assert normalize_ratios([0, 0]) == [50, 50]
+    assert sum(normalize_ratios([1, 1, 1], decimals=2)) == 100
+
+
+def test_repair_analysis_fixes_near_miss_locally():
+    """
+    카테고리가 많거나 비율 합계가 맞지 않는 응답은 후속 요청 없이 수정되는지 확인
+    """
+    categories = [
+        {"name": name, "ratio": ratio, "keywords": ["키워드1", "키워드2", "키워드2", "키워드3", "키워드4"]}
+        for name, ratio in [("여행", 50), ("음식", 30), ("게임", 30), ("음악", 10), ("운동", 5)]
+    ]
+    result, problems = repair_analysis({"categories": categories, "board_name": ["여행하는 미식가"]})
+
+    assert problems == []
+    assert list(result["keywords"]) == ["여행", "음식", "게임", "음악"]
+    assert all(keywords == ["키워드1", "키워드2", "키워드3"] for keywords in result["keywords"].values())
+    assert sum(result["category_ratio"]) == 100
+    assert result["board_name"] == "여행하는 미식가"
+
+
+def test_repair_analysis_reports_missing_categories():
+    _, problems = repair_analysis(
+        {"categories": [{"name": "여행", "ratio": 100, "keywords": ["캠핑"]}], "board_name": ""}
+    )
+    assert len(problems) == 2
+
+
+def test_repair_new_keywords_excludes_current_keywords():
+    new_keywords, problems = repair_new_keywords({"new_keywords": ["캠핑", "등산", "캠핑", "낚시"]}, ["등산"])
+    assert new_keywords == ["캠핑", "낚시"]
+    assert problems
+
+
+def test_repair_match_normalizes_ratios_and_score():
+    result, problems = repair_match(
+        {
+            "user1_keywords": ["여행", "캠핑"],
+            "user2_keywords": ["캠핑", "요리"],
+            "match_keywords": ["캠핑"],
+            "new_categories": [f"카테고리{i}" for i in range(10)],
+            "user1_category_ratio": [10] * 10,
+            "user2_category_ratio": [50, 50],
+            "similarity_score": "78.456%",
+        }
+    )
+
+    assert problems == []
+    assert "캠핑" not in result["user1_keywords"] + result["user2_keywords"]
+    assert len(result["user1_category_ratio"]) == len(result["user2_category_ratio"]) == 8
+    assert sum(result["user2_category_ratio"]) == 100
+    assert result["similarity_score"] == 78.46
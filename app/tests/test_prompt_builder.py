@@ -0,0 +1,29 @@
+import math
+from app.utils import prompt_builder
+from app.utils.prompt_builder import count_tokens, fit_videos_to_budget
+
+
+def test_count_tokens_falls_back_when_encoding_cannot_load(monkeypatch):
+    """
+    인코딩 파일을 내려받지 못해도 (오프라인 워커) 근사치로 토큰 수를 계산하는지 확인
+    """
+
+    def unavailable(*args, **kwargs):
+        raise ConnectionError("openaipublic.blob.core.windows.net unreachable")
+
+    monkeypatch.setattr(prompt_builder, "TIKTOKEN_AVAILABLE", True)
+    monkeypatch.setattr(prompt_builder, "tiktoken", type("tiktoken", (), {
+        "encoding_for_model": staticmethod(unavailable),
+        "get_encoding": staticmethod(unavailable),
+    }), raising=False)
+    monkeypatch.setattr(prompt_builder, "_encodings", {})
+    monkeypatch.setattr(prompt_builder, "_encoding_failed_at", {})
+
+    text = "여행 브이로그 travel vlog"
+    assert count_tokens(text, "gpt-4o-mini") == math.ceil(len(text.encode("utf-8")) / 3)
+
+    dataset, stats = fit_videos_to_budget(
+        [{"localizedTitle": "여행 브이로그", "tags": ["여행"]}], "analysis", "gpt-4o-mini"
+    )
+    assert stats["videos"] == 1
+    assert "여행 브이로그" in dataset
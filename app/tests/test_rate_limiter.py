@@ -0,0 +1,22 @@
+from app.utils.rate_limiter import DEFAULT_COOLDOWN_MS, cooldown_from_headers, parse_reset_duration
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1000
+    assert parse_reset_duration("6m0s") == 360000
+    assert parse_reset_duration("20ms") == 20
+    assert parse_reset_duration("1.5") == 1500
+    assert parse_reset_duration(None) is None
+
+
+def test_cooldown_from_headers():
+    # 429: retry-after 우선, 없으면 reset 헤더, 둘 다 없으면 기본값
+    assert cooldown_from_headers({"retry-after": "2"}, throttled=True) == 2000
+    assert cooldown_from_headers({"x-ratelimit-reset-tokens": "750ms"}, throttled=True) == 750
+    assert cooldown_from_headers({}, throttled=True) == DEFAULT_COOLDOWN_MS
+
+    # 정상 응답: 남은 한도가 0일 때만 reset까지 대기
+    headers = {"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "3s"}
+    assert cooldown_from_headers(headers, throttled=False) == 3000
+    headers["x-ratelimit-remaining-requests"] = "12"
+    assert cooldown_from_headers(headers, throttled=False) == 0
@@ -0,0 +1,69 @@
+import pytest
+from app.utils.similarity import MATCH_CATEGORIES, compare_keywords
+
+BOARD1_KEYWORDS = {
+    "여행과 모험": ["해외여행", "캠핑", "배낭여행"],
+    "음식 문화": ["먹방", "맛집 탐방", "디저트"],
+    "게임 트렌드": ["모바일 게임", "e스포츠", "게임 리뷰"],
+    "음악": ["케이팝", "힙합", "콘서트"],
+}
+BOARD2_KEYWORDS = {
+    "여행": ["여행", "호텔", "캠핑 장비"],
+    "요리": ["레시피", "베이킹", "디저트 카페"],
+    "운동": ["헬스", "축구", "다이어트"],
+    "경제": ["주식 투자", "재테크", "경제 뉴스"],
+}
+
+
+def test_compare_keywords_response_shape():
+    """
+    GPT 분석(match_board_ratio)과 같은 필드를 반환하는지 확인
+    """
+    result = compare_keywords(BOARD1_KEYWORDS, BOARD2_KEYWORDS)
+
+    assert result["new_categories"] == list(MATCH_CATEGORIES)
+    for key in ("user1_category_ratio", "user2_category_ratio"):
+        assert len(result[key]) == len(MATCH_CATEGORIES)
+        assert sum(result[key]) == pytest.approx(100.0)
+    assert 0 <= result["similarity_score"] <= 100
+
+
+def test_compare_keywords_matches_similar_keywords():
+    """
+    비슷한 키워드는 match_keywords로, 나머지는 사용자별 키워드로 분리되는지 확인
+    """
+    result = compare_keywords(BOARD1_KEYWORDS, BOARD2_KEYWORDS)
+
+    assert {"캠핑", "캠핑 장비", "디저트", "디저트 카페"} <= set(result["match_keywords"])
+    assert "축구" in result["user2_keywords"]
+    assert not set(result["match_keywords"]) & set(result["user1_keywords"])
+    assert not set(result["match_keywords"]) & set(result["user2_keywords"])
+
+
+def test_compare_keywords_identical_and_empty_boards():
+    assert compare_keywords(BOARD1_KEYWORDS, BOARD1_KEYWORDS)["similarity_score"] == 100.0
+    assert compare_keywords(BOARD1_KEYWORDS, {})["similarity_score"] == 0.0
+
+
+def test_board_vector_index_top_k():
+    """
+    보드 벡터 내적으로 가장 비슷한 보드를 찾고, 기준 보드 작성자의 보드는 제외하는지 확인
+    """
+    from app.utils.board_index import BoardVectorIndex
+    from app.utils.similarity import board_vector, vector_to_bytes
+
+    game_board = {"게임": ["롤", "게임 공략", "콘솔 게임"], "음악": ["힙합", "랩", "케이팝"]}
+    index = BoardVectorIndex()
+    index.load(
+        [
+            (1, 10, vector_to_bytes(board_vector(BOARD1_KEYWORDS))),
+            (2, 20, vector_to_bytes(board_vector(BOARD2_KEYWORDS))),
+            (3, 30, vector_to_bytes(board_vector(game_board))),
+        ]
+    )
+
+    query = board_vector(BOARD1_KEYWORDS)
+    assert [board_id for board_id, _ in index.top_k(query, 3)][0] == 1
+    neighbors = index.top_k(query, 2, exclude_user_id=10)
+    assert [board_id for board_id, _ in neighbors] and 1 not in dict(neighbors)
+    assert all(0 <= score <= 1.0001 for _, score in neighbors)
@@ -0,0 +1,141 @@
+import asyncio
+import time
+import numpy as np
+from sqlalchemy import select
+from app.config import settings
+from app.db import AsyncSessionLocal
+from app.models.board import Board
+from app.utils.redis_handler import redis_client, async_redis_client
+from app.utils.similarity import BOARD_VECTOR_DIM, vector_from_bytes
+
+# 보드 벡터가 바뀔 때마다 증가하는 버전 (프로세스별 인덱스가 이 값을 보고 다시 만들어짐)
+BOARD_INDEX_VERSION_KEY = "board_vector_index:version"
+
+
+def mark_board_index_stale():
+    """
+    보드 벡터를 저장한 뒤 호출하여 각 프로세스의 인덱스를 갱신 대상으로 표시합니다.
+    """
+    try:
+        redis_client.incr(BOARD_INDEX_VERSION_KEY)
+    except Exception as e:
+        print(f"[ERROR] 보드 인덱스 버전 갱신 실패: {e}")
+
+
+async def mark_board_index_stale_async():
+    try:
+        await async_redis_client.incr(BOARD_INDEX_VERSION_KEY)
+    except Exception as e:
+        print(f"[ERROR] 보드 인덱스 버전 갱신 실패: {e}")
+
+
+class BoardVectorIndex:
+    """
+    보드 벡터를 하나의 연속된 float32 행렬 (보드 수, BOARD_VECTOR_DIM)로 보관하는 메모리 인덱스.
+    유사 보드 검색은 행렬-벡터 곱 한 번과 argpartition으로 처리합니다.
+    """
+
+    def __init__(self):
+        self.ids = np.empty(0, dtype=np.int64)
+        self.user_ids = np.empty(0, dtype=np.int64)
+        self.matrix = np.empty((0, BOARD_VECTOR_DIM), dtype=np.float32)
+        self.version = None
+        self.built_at = 0.0
+        self._rebuild_task = None
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @staticmethod
+    def _build(rows) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = [row for row in rows if row[2] and len(row[2]) == BOARD_VECTOR_DIM * 4]
+        matrix = np.empty((len(rows), BOARD_VECTOR_DIM), dtype=np.float32)
+        for i, (_, _, vector) in enumerate(rows):
+            matrix[i] = vector_from_bytes(vector)
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+        user_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+        return ids, user_ids, matrix
+
+    def load(self, rows):
+        """
+        (id, user_id, vector bytes) 행 목록으로 인덱스를 다시 만듭니다.
+        """
+        self.ids, self.user_ids, self.matrix = self._build(rows)
+
+    async def _rebuild(self, version):
+        """
+        DB에서 보드 벡터를 읽어 인덱스를 다시 만듭니다.
+        행렬 생성은 보드 수에 비례하므로 스레드 풀에서 실행하고, 완성된 배열로 한 번에 교체합니다.
+        """
+        try:
+            async with AsyncSessionLocal() as db:
+                result = await db.execute(
+                    select(Board.id, Board.user_id, Board.vector).where(Board.vector.is_not(None))
+                )
+                rows = result.all()
+            loop = asyncio.get_running_loop()
+            self.ids, self.user_ids, self.matrix = await loop.run_in_executor(None, self._build, rows)
+            self.version = version
+            self.built_at = time.monotonic()
+            print(f"[DEBUG] 보드 벡터 인덱스 재구성: {len(self)}개 (버전 {version})")
+        except Exception as e:
+            print(f"[ERROR] 보드 벡터 인덱스 재구성 실패: {e}")
+
+    async def refresh(self):
+        """
+        Redis 버전이 바뀌었고 마지막 재구성 후 BOARD_INDEX_REFRESH_INTERVAL초가 지났으면 인덱스를 다시 만듭니다.
+        이미 인덱스가 있으면 재구성은 백그라운드에서 진행하고 그동안 기존 인덱스를 사용합니다.
+        Redis 오류는 갱신이 필요 없는 것으로 간주합니다.
+        """
+        try:
+            version = await async_redis_client.get(BOARD_INDEX_VERSION_KEY)
+        except Exception as e:
+            print(f"[WARNING] 보드 인덱스 버전 조회 실패, 기존 인덱스 사용: {e}")
+            if self.built_at:
+                return
+            version = None
+
+        if self.built_at and (
+            version == self.version
+            or time.monotonic() - self.built_at < settings.board_index_refresh_interval
+        ):
+            return
+
+        # 동시에 여러 요청이 와도 재구성은 한 번만 실행
+        if self._rebuild_task is None or self._rebuild_task.done():
+            self._rebuild_task = asyncio.create_task(self._rebuild(version))
+        if not self.built_at:
+            # 처음에는 사용할 인덱스가 없으므로 재구성이 끝날 때까지 대기
+            await asyncio.shield(self._rebuild_task)
+
+    def top_k(
+        self, vector: np.ndarray, k: int, exclude_user_id: int | None = None
+    ) -> list[tuple[int, float]]:
+        """
+        벡터와 내적(코사인 유사도)이 가장 큰 보드 k개를 반환합니다.
+
+        Args:
+            vector (np.ndarray): 기준 보드 벡터 (단위 길이)
+            k (int): 반환할 개수
+            exclude_user_id (int | None): 제외할 사용자 (기준 보드 작성자)
+
+        Returns:
+            list[tuple[int, float]]: (보드 ID, 유사도) 목록 (유사도 내림차순)
+        """
+        if not len(self) or k <= 0:
+            return []
+
+        scores = self.matrix @ np.asarray(vector, dtype=np.float32)
+        if exclude_user_id is not None:
+            scores = np.where(self.user_ids == exclude_user_id, -np.inf, scores)
+
+        k = min(k, len(scores))
+        candidates = np.argpartition(-scores, k - 1)[:k]
+        candidates = candidates[np.argsort(-scores[candidates])]
+        return [
+            (int(self.ids[i]), float(scores[i])) for i in candidates if np.isfinite(scores[i])
+        ]
+
+
+# 프로세스 공용 인덱스
+board_index = BoardVectorIndex()
@@ -1,5 +1,8 @@
 from app.config import settings
 from celery import Celery
+from celery.signals import worker_process_init, task_prerun, task_postrun
+from app.utils.db_metrics import start_query_stats, stop_query_stats, record_query_stats
+from app.utils.openai_client import get_openai_client
 
 celery_app = Celery(
     "backend",
@@ -14,9 +17,46 @@ celery_app.conf.update(
     result_serializer="json",
     timezone="Asia/Seoul",
     enable_utc=True,
+    # 단계별 워커 풀이 긴 작업을 미리 가져가 다른 작업을 막지 않도록 설정
+    # (acks_late는 다시 실행해도 안전한 작업에만 작업별로 지정 — celery_tasks 참고)
+    worker_prefetch_multiplier=1,
 )
 
 celery_app.autodiscover_tasks(["app.services.celery_tasks"])
+# 보드 생성 파이프라인: 단계별 큐로 분리하여 단계마다 워커 풀 크기를 따로 조정
 celery_app.conf.task_routes = {
-    "app.services.celery_tasks.create_board_task": {"queue": "default"},
+    "app.services.celery_tasks.fetch_board_videos_task": {"queue": "board.fetch"},
+    "app.services.celery_tasks.analyze_board_task": {"queue": "board.analyze"},
+    "app.services.celery_tasks.render_board_image_task": {"queue": "board.render"},
+    "app.services.celery_tasks.store_board_task": {"queue": "board.store"},
+    "app.services.celery_tasks.replace_board_image_task": {"queue": "board.store"},
+    "app.services.celery_tasks.delete_board_images_task": {"queue": "board.store"},
+    "app.services.celery_tasks.derive_board_images_task": {"queue": "board.derive"},
 }
+
+
+@worker_process_init.connect
+def init_worker_clients(**kwargs):
+    """
+    워커 자식 프로세스가 시작될 때 프로세스 공용 클라이언트를 미리 생성
+    """
+    get_openai_client()
+
+
+# 작업별 DB 쿼리 통계 (task_id → (QueryStats, ContextVar 토큰))
+_task_query_stats = {}
+
+
+@task_prerun.connect
+def start_task_query_stats(task_id=None, **kwargs):
+    _task_query_stats[task_id] = start_query_stats()
+
+
+@task_postrun.connect
+def finish_task_query_stats(task_id=None, task=None, **kwargs):
+    entry = _task_query_stats.pop(task_id, None)
+    if entry is None:
+        return
+    stats, token = entry
+    stop_query_stats(token)
+    record_query_stats("celery", task.name, stats)
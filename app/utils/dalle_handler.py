@@ -1,10 +1,8 @@
-from google.cloud import storage
-from openai import OpenAI
+from google.api_core.exceptions import NotFound
 from app.config import settings
+from app.utils.gcs_client import BOARD_BUCKET_NAME, get_bucket
+from app.utils.openai_client import get_openai_client, call_openai
 from urllib.parse import urlparse
-from google.auth import default
-
-client = OpenAI(api_key=settings.openai_api_key)
 
 
 def generate_image_with_dalle(category_ratio: list[int], keywords: dict) -> str:
@@ -44,12 +42,14 @@ def generate_image_with_dalle(category_ratio: list[int], keywords: dict) -> str:
     )
 
     try:
-        response = client.images.generate(
+        response = call_openai(
+            get_openai_client().images.with_raw_response.generate,
             model="dall-e-3",
             prompt=prompt,
             size="1024x1792",
             quality="standard",
             n=1,
+            timeout=settings.openai_image_timeout,
         )
         image_url = response.data[0].url
         print(f"Image generated successfully: {image_url}")
@@ -63,7 +63,7 @@ def delete_image_from_gcs(image_url: str):
     GCS에서 이미지를 삭제하는 함수
     :param image_url: 삭제할 이미지의 GCS URL
     """
-    bucket_name = "team-g-bucket"
+    bucket_name = BOARD_BUCKET_NAME
     try:
         # URL 파싱 및 검증
         parsed_url = urlparse(image_url)
@@ -73,17 +73,11 @@ def delete_image_from_gcs(image_url: str):
         # Blob 이름 추출
         blob_name = parsed_url.path.split(f"/{bucket_name}/")[-1]
 
-        # GCS 클라이언트 초기화
-        credentials, project = default()
-        client = storage.Client(credentials=credentials, project=project)
-        bucket = client.bucket(bucket_name)
-        blob = bucket.blob(blob_name)
-
-        # Blob 존재 여부 확인 및 삭제
-        if blob.exists():
-            blob.delete()
+        # 공용 버킷 핸들로 바로 삭제 (존재 확인 요청 생략)
+        try:
+            get_bucket().blob(blob_name).delete()
             print(f"GCS에서 이미지가 삭제되었습니다: {blob_name}")
-        else:
+        except NotFound:
             print(f"GCS에서 해당 이미지를 찾을 수 없습니다: {blob_name}")
     except Exception as e:
         raise RuntimeError(f"GCS 이미지 삭제 중 오류 발생: {str(e)}")
@@ -0,0 +1,145 @@
+import time
+from contextvars import ContextVar
+from sqlalchemy import event
+from prometheus_client import Counter, Histogram
+from app.config import settings
+
+# 요청/작업 단위 쿼리 통계 (ContextVar는 스레드풀로 실행되는 동기 라우트에도 전파됨)
+_current_stats: ContextVar["QueryStats | None"] = ContextVar("db_query_stats", default=None)
+
+DB_QUERIES = Histogram(
+    "db_queries_per_request",
+    "요청/작업당 DB 쿼리 수",
+    ["kind", "handler"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_QUERY_SECONDS = Histogram(
+    "db_query_seconds_per_request",
+    "요청/작업당 DB 쿼리 총 소요 시간 (초)",
+    ["kind", "handler"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+DB_QUERY_HEAVY = Counter(
+    "db_query_heavy_total",
+    "쿼리 수가 임계값(DB_QUERY_WARN_THRESHOLD)을 넘은 요청/작업 수 (N+1 의심)",
+    ["kind", "handler"],
+)
+
+
+class QueryStats:
+    """
+    하나의 요청 또는 Celery 작업에서 실행된 쿼리 수와 총 소요 시간
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def exceeded(self) -> bool:
+        return self.count > settings.db_query_warn_threshold
+
+
+def start_query_stats():
+    """
+    현재 컨텍스트에서 쿼리 통계 수집을 시작합니다.
+
+    Returns:
+        tuple[QueryStats, Token]: 통계 객체, stop_query_stats()에 전달할 토큰
+    """
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def stop_query_stats(token):
+    _current_stats.reset(token)
+
+
+def record_query_stats(kind: str, handler: str, stats: QueryStats):
+    """
+    통계를 Prometheus 메트릭으로 기록하고, 임계값을 넘으면 경고 로그를 남깁니다.
+
+    Args:
+        kind (str): "http" 또는 "celery"
+        handler (str): 라우트 경로 템플릿 또는 작업 이름
+        stats (QueryStats): 수집된 통계
+    """
+    DB_QUERIES.labels(kind, handler).observe(stats.count)
+    DB_QUERY_SECONDS.labels(kind, handler).observe(stats.seconds)
+    if stats.exceeded:
+        DB_QUERY_HEAVY.labels(kind, handler).inc()
+        print(
+            f"[WARNING] {kind} {handler}: DB 쿼리 {stats.count}회 "
+            f"({stats.seconds * 1000:.1f}ms) — 임계값 {settings.db_query_warn_threshold}회 초과"
+        )
+
+
+def install_query_instrumentation(engine):
+    """
+    엔진의 커서 실행 이벤트에 쿼리 수/시간 집계를 연결합니다.
+    (echo=True처럼 SQL을 출력하지 않고 카운터만 갱신하므로 운영 환경에서도 사용 가능)
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started_at", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started_at = conn.info["query_started_at"].pop()
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.count += 1
+            stats.seconds += time.perf_counter() - started_at
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(exception_context):
+        # 실패한 쿼리는 after_cursor_execute가 호출되지 않으므로 시작 시각을 정리
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started_at"):
+            conn.info["query_started_at"].pop()
+
+
+class QueryStatsMiddleware:
+    """
+    요청마다 쿼리 통계를 수집하는 ASGI 미들웨어.
+    통계는 request.state.db_query_stats로 전달되어 Instrumentator 메트릭(db_query_metrics)에서 기록되며,
+    응답 헤더 X-DB-Query-Count / X-DB-Query-Time으로도 확인할 수 있습니다.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats, token = start_query_stats()
+        scope.setdefault("state", {})["db_query_stats"] = stats
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-db-query-count", str(stats.count).encode()))
+                headers.append((b"x-db-query-time", f"{stats.seconds * 1000:.1f}ms".encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_query_stats(token)
+
+
+def db_query_metrics():
+    """
+    Instrumentator에 추가하는 메트릭 함수 (Instrumentator().add(db_query_metrics()))
+    """
+
+    def instrumentation(info) -> None:
+        stats = getattr(info.request.state, "db_query_stats", None)
+        if stats is not None:
+            record_query_stats("http", info.modified_handler, stats)
+
+    return instrumentation
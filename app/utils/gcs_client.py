@@ -0,0 +1,33 @@
+import os
+from google.auth import default
+from google.cloud import storage
+from app.config import settings
+from app.utils.http_client import get_or_create_client
+
+# GCS 버킷 이름 (보드 이미지와 프로필 사진은 서로 다른 버킷을 사용할 수 있음)
+BOARD_BUCKET_NAME = settings.gcs_board_bucket
+PROFILE_BUCKET_NAME = settings.gcp_bucket_name
+
+
+def _build_storage_client() -> storage.Client:
+    # 서비스 계정 키 파일이 있으면 사용하고, 없으면 기본 인증 정보(ADC) 사용
+    if settings.gcp_credentials and os.path.exists(settings.gcp_credentials):
+        return storage.Client.from_service_account_json(settings.gcp_credentials)
+    credentials, project = default()
+    return storage.Client(credentials=credentials, project=project)
+
+
+def get_storage_client() -> storage.Client:
+    """
+    프로세스당 한 번 생성되는 GCS 클라이언트.
+    인증 정보 로드와 클라이언트 생성을 요청마다 반복하지 않습니다.
+    """
+    return get_or_create_client("gcs", _build_storage_client)
+
+
+def get_bucket(name: str = BOARD_BUCKET_NAME) -> storage.Bucket:
+    """
+    프로세스당 한 번 생성되는 버킷 핸들 (버킷 이름별, 기본값은 보드 이미지 버킷).
+    storage.Client.get_bucket()과 달리 메타데이터 조회 API를 호출하지 않습니다.
+    """
+    return get_or_create_client(f"gcs_bucket:{name}", lambda: get_storage_client().bucket(name))
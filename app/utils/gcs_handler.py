@@ -1,5 +1,139 @@
-from google.cloud import storage
-import requests
+import io
+import mimetypes
+import time
+from prometheus_client import Histogram
+from app.config import settings
+from app.utils.gcs_client import BOARD_BUCKET_NAME, get_bucket
+from app.utils.http_client import get_http_client
+
+# 이미지 업로드 전송량/속도 (mode: stream = chunk 단위 resumable 업로드, buffered = 메모리에 올린 뒤 업로드)
+GCS_UPLOAD_BYTES = Histogram(
+    "gcs_upload_bytes",
+    "GCS 이미지 업로드 크기 (바이트)",
+    ["mode"],
+    buckets=(64 * 1024, 256 * 1024, 512 * 1024, 1024 ** 2, 2 * 1024 ** 2, 4 * 1024 ** 2, 8 * 1024 ** 2, 16 * 1024 ** 2),
+)
+GCS_UPLOAD_SECONDS = Histogram(
+    "gcs_upload_seconds",
+    "GCS 이미지 업로드 소요 시간 (초)",
+    ["mode"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+GCS_UPLOAD_BYTES_PER_SECOND = Histogram(
+    "gcs_upload_bytes_per_second",
+    "GCS 이미지 업로드 속도 (바이트/초)",
+    ["mode"],
+    buckets=(64 * 1024, 256 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2),
+)
+
+
+class _ResponseStream(io.RawIOBase):
+    """
+    HTTP 응답의 바이트 이터레이터를 파일 객체처럼 읽을 수 있게 감싸는 클래스.
+    GCS resumable 업로드가 chunk 단위로 read()를 호출하므로 전체 이미지를 메모리에 올리지 않습니다.
+    """
+
+    def __init__(self, chunks):
+        self._chunks = chunks
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, b) -> int:
+        # 업로드 라이브러리는 요청보다 짧게 읽히면 스트림 끝으로 판단하므로 b를 최대한 채움
+        written = 0
+        while written < len(b):
+            if not self._buffer:
+                try:
+                    self._buffer = next(self._chunks)
+                except StopIteration:
+                    break
+            size = min(len(b) - written, len(self._buffer))
+            b[written : written + size] = self._buffer[:size]
+            self._buffer = self._buffer[size:]
+            written += size
+        self._position += written
+        return written
+
+
+def _record_upload(mode: str, transferred: int, started_at: float) -> dict:
+    """
+    업로드 전송량/속도를 메트릭으로 기록하고 통계를 반환합니다.
+    """
+    elapsed = max(time.monotonic() - started_at, 1e-6)
+    GCS_UPLOAD_BYTES.labels(mode=mode).observe(transferred)
+    GCS_UPLOAD_SECONDS.labels(mode=mode).observe(elapsed)
+    GCS_UPLOAD_BYTES_PER_SECOND.labels(mode=mode).observe(transferred / elapsed)
+    return {
+        "bytes": transferred,
+        "seconds": round(elapsed, 3),
+        "bytes_per_second": round(transferred / elapsed, 1),
+    }
+
+
+def _upload_stream(blob, stream, size: int | None, content_type: str) -> dict:
+    """
+    스트림을 resumable 업로드로 전송하고 전송량/속도를 기록·반환합니다.
+    chunk_size를 지정하면 항상 resumable 업로드가 사용되어 최대 chunk_size만큼만 메모리에 유지됩니다.
+    """
+    blob.chunk_size = settings.gcs_upload_chunk_size
+    started_at = time.monotonic()
+    blob.upload_from_file(stream, size=size, content_type=content_type)
+    return _record_upload("stream", stream.tell(), started_at)
+
+
+def stream_image_to_gcs(image_url: str, destination_path: str) -> tuple[str, dict]:
+    """
+    이미지를 다운로드하면서 동시에 GCS에 업로드하는 함수.
+    다운로드 응답을 chunk 단위로 resumable 업로드에 전달하므로, 이미지 크기나 동시 작업 수와 관계없이
+    작업당 메모리 사용량이 chunk 크기로 제한됩니다.
+
+    Args:
+        image_url (str): 업로드할 이미지의 URL 또는 로컬 파일 경로
+        destination_path (str): GCS 내 저장 경로
+
+    Returns:
+        tuple[str, dict]: 업로드된 GCS URL, 전송 통계 ({"bytes", "seconds", "bytes_per_second"})
+    """
+    blob = get_bucket().blob(destination_path)
+    print(f"GCS 스트리밍 업로드 시도: 버킷={BOARD_BUCKET_NAME}, 경로={destination_path}")
+
+    if image_url.startswith("http"):
+        with get_http_client().stream("GET", image_url, timeout=30) as response:
+            if response.status_code != 200:
+                raise ValueError(f"이미지 다운로드 실패: {response.status_code}")
+            # 압축 전송된 경우 Content-Length가 실제 바이트 수와 달라 크기를 지정하지 않음
+            content_length = (
+                response.headers.get("Content-Length")
+                if "Content-Encoding" not in response.headers
+                else None
+            )
+            stats = _upload_stream(
+                blob,
+                _ResponseStream(response.iter_bytes(settings.gcs_upload_chunk_size)),
+                size=int(content_length) if content_length else None,
+                content_type=response.headers.get("Content-Type", "image/png"),
+            )
+    else:
+        with open(image_url, "rb") as f:
+            stats = _upload_stream(
+                blob,
+                f,
+                size=None,
+                content_type=mimetypes.guess_type(image_url)[0] or "application/octet-stream",
+            )
+
+    blob.make_public()
+    print(
+        f"GCS 스트리밍 업로드 완료: {stats['bytes']} bytes, {stats['seconds']}s, "
+        f"{stats['bytes_per_second'] / 1024:.1f} KiB/s"
+    )
+    return blob.public_url, stats
 
 
 def upload_image_to_gcs(image_url: str, destination_path: str) -> str:
@@ -13,17 +147,16 @@ def upload_image_to_gcs(image_url: str, destination_path: str) -> str:
     Returns:
         str: 업로드된 GCS URL
     """
-    bucket_name = "team-g-bucket"  # GCS 버킷 이름
-
     try:
-        # GCS 클라이언트 초기화
-        client = storage.Client()
-        bucket = client.get_bucket(bucket_name)
+        if settings.gcs_streaming_upload:
+            gcs_url, _ = stream_image_to_gcs(image_url, destination_path)
+            print(f"GCS 업로드 성공: {gcs_url}")
+            return gcs_url
 
         # 이미지 다운로드 또는 로컬 파일 읽기
         if image_url.startswith("http"):
             print(f"이미지 다운로드 시도: {image_url}")
-            response = requests.get(image_url, timeout=10)
+            response = get_http_client().get(image_url, timeout=30)
             if response.status_code != 200:
                 raise ValueError(f"이미지 다운로드 실패: {response.status_code}")
             image_data = response.content
@@ -33,10 +166,16 @@ def upload_image_to_gcs(image_url: str, destination_path: str) -> str:
                 image_data = f.read()
 
         # GCS에 업로드
-        print(f"GCS 업로드 시도: 버킷={bucket_name}, 경로={destination_path}")
-        blob = bucket.blob(destination_path)
+        print(f"GCS 업로드 시도: 버킷={BOARD_BUCKET_NAME}, 경로={destination_path}")
+        blob = get_bucket().blob(destination_path)
+        started_at = time.monotonic()
         blob.upload_from_string(image_data)
+        stats = _record_upload("buffered", len(image_data), started_at)
         blob.make_public()
+        print(
+            f"GCS 업로드 완료: {stats['bytes']} bytes, {stats['seconds']}s, "
+            f"{stats['bytes_per_second'] / 1024:.1f} KiB/s"
+        )
 
         # 업로드된 URL 반환
         gcs_url = blob.public_url
@@ -45,4 +184,36 @@ def upload_image_to_gcs(image_url: str, destination_path: str) -> str:
 
     except Exception as e:
         print(f"GCS 업로드 실패: {str(e)}")
-        raise
\ No newline at end of file
+        raise
+
+
+def download_bytes_from_gcs(source_path: str) -> bytes:
+    """
+    GCS 객체를 바이트로 다운로드하는 함수
+
+    Args:
+        source_path (str): GCS 내 경로
+
+    Returns:
+        bytes: 객체 데이터
+    """
+    return get_bucket().blob(source_path).download_as_bytes()
+
+
+def upload_bytes_to_gcs(data: bytes, destination_path: str, content_type: str) -> str:
+    """
+    메모리의 데이터를 GCS에 공개 객체로 업로드하는 함수 (파생 이미지 등 작은 파일용)
+
+    Args:
+        data (bytes): 업로드할 데이터
+        destination_path (str): GCS 내 저장 경로
+        content_type (str): Content-Type
+
+    Returns:
+        str: 업로드된 GCS URL
+    """
+    blob = get_bucket().blob(destination_path)
+    blob.cache_control = "public, max-age=86400"
+    blob.upload_from_string(data, content_type=content_type)
+    blob.make_public()
+    return blob.public_url
@@ -0,0 +1,113 @@
+import hashlib
+import json
+import time
+from app.config import settings
+from app.utils.redis_handler import redis_client
+
+
+class GptResultCache:
+    """
+    GPT 응답을 입력 데이터의 해시로 저장하는 Redis 캐시.
+
+    - 값: {namespace}:{sha256} (TTL 적용)
+    - 인덱스: {namespace}:index (sorted set, score=저장 시각) — 최대 개수 초과 시 오래된 항목부터 삭제
+    - 통계: {namespace}:stats (hash, hits/misses)
+    """
+
+    def __init__(self, namespace: str, ttl: int, max_entries: int):
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    @staticmethod
+    def fingerprint(data) -> str:
+        """
+        데이터를 정규화된 JSON으로 직렬화한 뒤 sha256 해시를 반환합니다.
+        """
+        serialized = json.dumps(
+            data, ensure_ascii=False, sort_keys=True, separators=(",", ":")
+        )
+        return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+    def _key(self, fingerprint: str) -> str:
+        return f"{self.namespace}:{fingerprint}"
+
+    def get(self, fingerprint: str):
+        """
+        캐시된 결과를 반환하고 hit/miss 카운터를 갱신합니다. 캐시 오류 시 None을 반환합니다.
+        """
+        try:
+            cached = redis_client.get(self._key(fingerprint))
+            redis_client.hincrby(
+                f"{self.namespace}:stats", "hits" if cached else "misses", 1
+            )
+            return json.loads(cached) if cached else None
+        except Exception as e:
+            print(f"[ERROR] GPT 캐시 조회 실패 ({self.namespace}): {e}")
+            return None
+
+    def set(self, fingerprint: str, value):
+        """
+        결과를 저장하고 만료되었거나 최대 개수를 초과한 항목을 정리합니다.
+        """
+        index_key = f"{self.namespace}:index"
+        now = time.time()
+        try:
+            pipe = redis_client.pipeline()
+            pipe.set(
+                self._key(fingerprint), json.dumps(value, ensure_ascii=False), ex=self.ttl
+            )
+            pipe.zadd(index_key, {fingerprint: now})
+            pipe.zremrangebyscore(index_key, "-inf", now - self.ttl)
+            pipe.zcard(index_key)
+            size = pipe.execute()[-1]
+
+            overflow = size - self.max_entries
+            if overflow > 0:
+                evicted = [member for member, _ in redis_client.zpopmin(index_key, overflow)]
+                if evicted:
+                    redis_client.delete(*[self._key(member) for member in evicted])
+                    print(f"[DEBUG] GPT 캐시 {len(evicted)}개 항목 제거 ({self.namespace})")
+        except Exception as e:
+            print(f"[ERROR] GPT 캐시 저장 실패 ({self.namespace}): {e}")
+
+    def stats(self) -> dict:
+        """
+        캐시 hit/miss 카운터와 현재 항목 수를 반환합니다.
+        """
+        counters = redis_client.hgetall(f"{self.namespace}:stats")
+        hits = int(counters.get("hits", 0))
+        misses = int(counters.get("misses", 0))
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else 0.0,
+            "entries": redis_client.zcard(f"{self.namespace}:index"),
+        }
+
+
+def normalize_video_data(video_data_list: list[dict]) -> list[dict]:
+    """
+    채널 순서나 태그 순서와 무관하게 같은 동영상 집합이 같은 해시를 갖도록 정규화합니다.
+    """
+    normalized = []
+    for video in video_data_list:
+        normalized.append(
+            {
+                "tags": sorted(tag.strip() for tag in video.get("tags") or []),
+                "categoryId": video.get("categoryId"),
+                "localizedTitle": (video.get("localizedTitle") or "").strip(),
+                "localizedDescription": (video.get("localizedDescription") or "").strip(),
+            }
+        )
+    unique = {GptResultCache.fingerprint(video): video for video in normalized}
+    return [unique[key] for key in sorted(unique)]
+
+
+# 카테고리/키워드 분석 결과 캐시
+analysis_cache = GptResultCache(
+    "gpt_analysis",
+    ttl=settings.gpt_cache_ttl,
+    max_entries=settings.gpt_cache_max_entries,
+)
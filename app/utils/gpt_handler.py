@@ -1,6 +1,76 @@
 import json
-from openai import OpenAI, AsyncOpenAI
-from app.config import settings
+from prometheus_client import Counter
+from app.utils.openai_client import (
+    get_openai_client,
+    get_async_openai_client,
+    call_openai,
+    call_openai_async,
+)
+from app.utils.gpt_cache import analysis_cache, normalize_video_data
+from app.utils.single_flight import analysis_flight, regenerate_keywords_flight, match_ratio_flight
+from app.utils.prompt_builder import compact_json, fit_videos_to_budget, record_prompt_tokens
+from app.utils.gpt_schemas import (
+    ANALYSIS_FORMAT,
+    REGENERATE_KEYWORDS_FORMAT,
+    MATCH_FORMAT,
+    parse_json_content,
+    repair_analysis,
+    analysis_to_schema,
+    repair_new_keywords,
+    repair_match,
+    build_repair_messages,
+)
+
+# 스키마 검증에 실패한 응답을 고치는 후속 요청용 모델 (원본 데이터셋 없이 직전 응답만 전송)
+REPAIR_MODEL = "gpt-4o-mini"
+
+GPT_FOLLOWUPS = Counter(
+    "gpt_response_followups_total",
+    "로컬에서 고칠 수 없어 후속 수정 요청을 보낸 GPT 응답 수",
+    ["prompt_type", "outcome"],
+)
+
+
+def _request_repair(prompt_type: str, response_format: dict, data: dict, problems: list[str]) -> dict:
+    """
+    직전 응답과 문제 목록만 보내 수정된 JSON을 한 번 요청합니다 (동기).
+    """
+    print(f"[WARNING] GPT 응답 수정 요청 ({prompt_type}): {problems}")
+    messages = build_repair_messages(data, problems)
+    response = call_openai(
+        get_openai_client().chat.completions.with_raw_response.create,
+        model=REPAIR_MODEL,
+        messages=messages,
+        response_format=response_format,
+        max_tokens=800,
+    )
+    record_prompt_tokens(f"{prompt_type}_repair", REPAIR_MODEL, messages[0]["content"], response)
+    return parse_json_content(response.choices[0].message.content)
+
+
+async def _request_repair_async(
+    prompt_type: str, response_format: dict, data: dict, problems: list[str]
+) -> dict:
+    """
+    _request_repair의 비동기 버전
+    """
+    print(f"[WARNING] GPT 응답 수정 요청 ({prompt_type}): {problems}")
+    messages = build_repair_messages(data, problems)
+    response = await call_openai_async(
+        get_async_openai_client().chat.completions.with_raw_response.create,
+        model=REPAIR_MODEL,
+        messages=messages,
+        response_format=response_format,
+        max_tokens=800,
+    )
+    record_prompt_tokens(f"{prompt_type}_repair", REPAIR_MODEL, messages[0]["content"], response)
+    return parse_json_content(response.choices[0].message.content)
+
+
+def _finish_repair(prompt_type: str, problems: list[str]):
+    GPT_FOLLOWUPS.labels(prompt_type, "failed" if problems else "repaired").inc()
+    if problems:
+        raise ValueError(f"응답 데이터 형식이 올바르지 않습니다: {problems}")
 
 
 def generate_keywords_and_category(video_data_list: list[dict]) -> dict:
@@ -14,9 +84,29 @@ def generate_keywords_and_category(video_data_list: list[dict]) -> dict:
     Returns:
         dict: 카테고리 비율 및 키워드가 포함된 JSON 데이터.
     """
-    # 최대 50개의 동영상 데이터만 처리
-    if len(video_data_list) > 50:
-        video_data_list = video_data_list[:50]
+    # 정규화(중복 제거, 정렬) 후 최대 50개만 처리 — 채널 순서가 달라도 같은 50개가 선택되고
+    # GPT에도 캐시 키와 같은 부분 집합을 보냄
+    video_data_list = normalize_video_data(video_data_list)[:50]
+
+    # 같은 동영상 데이터셋에 대한 분석 결과가 캐시되어 있으면 바로 반환
+    cache_key = analysis_cache.fingerprint(video_data_list)
+    cached_result = analysis_cache.get(cache_key)
+    if cached_result is not None:
+        print(f"[DEBUG] GPT 분석 캐시 사용: {cache_key}")
+        return cached_result
+
+    # 같은 채널 조합으로 동시에 생성된 보드는 GPT를 한 번만 호출하고 결과를 공유
+    return analysis_flight.run(cache_key, lambda: _analyze_videos(video_data_list, cache_key))
+
+
+def _analyze_videos(video_data_list: list[dict], cache_key: str) -> dict:
+    """
+    generate_keywords_and_category의 GPT 호출부 (single-flight 리더만 실행)
+    """
+    # 데이터셋을 토큰 예산에 맞춰 압축 직렬화
+    model = "gpt-4o-2024-08-06"
+    dataset, dataset_stats = fit_videos_to_budget(video_data_list, "analysis", model)
+    print(f"[DEBUG] 분석 데이터셋: {dataset_stats}")
 
     # 프롬프트 생성
     prompt = f"""
@@ -52,14 +142,13 @@ def generate_keywords_and_category(video_data_list: list[dict]) -> dict:
     Respond strictly in JSON format:
     ```json
     {{
-        "category_ratio": [percentage1, percentage2, percentage3, percentage4],
-        "keywords": {{
-            "Category1": ["Keyword1", "Keyword2", "Keyword3"],
-            "Category2": ["Keyword1", "Keyword2", "Keyword3"],
-            "Category3": ["Keyword1", "Keyword2", "Keyword3"],
-            "Category4": ["Keyword1", "Keyword2", "Keyword3"]
-        }},
-        "board_name": [board_name]
+        "categories": [
+            {{"name": "Category1", "ratio": percentage1, "keywords": ["Keyword1", "Keyword2", "Keyword3"]}},
+            {{"name": "Category2", "ratio": percentage2, "keywords": ["Keyword1", "Keyword2", "Keyword3"]}},
+            {{"name": "Category3", "ratio": percentage3, "keywords": ["Keyword1", "Keyword2", "Keyword3"]}},
+            {{"name": "Category4", "ratio": percentage4, "keywords": ["Keyword1", "Keyword2", "Keyword3"]}}
+        ],
+        "board_name": "board_name"
     }}
     
     ### Important Notes:
@@ -90,7 +179,7 @@ def generate_keywords_and_category(video_data_list: list[dict]) -> dict:
 
 
     ### Dataset: Below is the dataset you need to analyze:
-    {json.dumps(video_data_list, ensure_ascii=False, indent=2)}
+    {dataset}
     
     ### Key Notes for Analysis:
     1.	Categories and keywords should generalize themes, especially for topics like alcohol or beverages. For instance:
@@ -109,45 +198,38 @@ def generate_keywords_and_category(video_data_list: list[dict]) -> dict:
 	- If the dataset is highly repetitive, extract nuanced themes from metadata to create broader categories.
     """
 
-    # OpenAI API 클라이언트 생성 (동기 방식)
-    client = OpenAI(api_key=settings.openai_api_key)
+    # 프로세스 공용 OpenAI API 클라이언트 (동기 방식)
+    client = get_openai_client()
 
     try:
         # OpenAI API 호출 (동기 방식)
-        response = client.chat.completions.create(
-            model="gpt-4o-2024-08-06",
+        response = call_openai(
+            client.chat.completions.with_raw_response.create,
+            model=model,
             messages=[{"role": "user", "content": prompt}],
+            response_format=ANALYSIS_FORMAT,
             max_tokens=500,
         )
+        record_prompt_tokens("analysis", model, prompt, response)
 
         # 응답 데이터 로깅
         response_content = response.choices[0].message.content.strip()
         print(f"GPT 응답 데이터: {response_content}")  # 디버깅용 로그
 
-        # JSON 시작 위치 확인 및 추출
-        json_start = response_content.find("{")
-        json_end = response_content.rfind("}")
-        if json_start == -1 or json_end == -1:
-            raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
-
-        # JSON 부분만 파싱
-        json_string = response_content[json_start:json_end + 1]
-        output_data = json.loads(json_string)
-
-        # 카테고리와 키워드 검증
-        if (
-            "category_ratio" not in output_data
-            or "keywords" not in output_data
-            or len(output_data["category_ratio"]) != 4
-            or len(output_data["keywords"]) != 4
-        ):
-            raise ValueError("응답 데이터 형식이 올바르지 않습니다.")
+        # 스키마 검증 및 로컬 수정 (비율 합계, 카테고리/키워드 개수)
+        output_data, problems = repair_analysis(parse_json_content(response_content))
+        if problems:
+            # 로컬에서 고칠 수 없으면 직전 응답만 보내 한 번 수정 요청
+            repaired = _request_repair("analysis", ANALYSIS_FORMAT, analysis_to_schema(output_data), problems)
+            output_data, problems = repair_analysis(repaired)
+            _finish_repair("analysis", problems)
 
+        analysis_cache.set(cache_key, output_data)
         return output_data
 
     except json.JSONDecodeError as e:
         print(f"JSON 파싱 오류 발생: {str(e)}")  # 디버깅용 로그
-        raise RuntimeError(f"JSON 파싱 실패: {str(e)}. 응답 데이터: {response_content}")
+        raise RuntimeError(f"JSON 파싱 실패: {str(e)}")
     except Exception as e:
         print(f"GPT 요청 실패: {str(e)}")  # 디버깅용 로그
         raise RuntimeError(f"GPT 요청 실패: {str(e)}")
@@ -167,13 +249,34 @@ async def regenerate_keywords_for_specific_category(
     Returns:
         dict: 변경된 키워드를 포함한 전체 카테고리 데이터.
     """
+    # 같은 보드에 대한 중복 요청(PUT /boards/{id}/keywords 연속 호출 등)은 첫 요청의 결과를 공유
+    fingerprint = analysis_cache.fingerprint(
+        [category_name, current_keywords, normalize_video_data(video_data_list)]
+    )
+    return await regenerate_keywords_flight.run_async(
+        fingerprint,
+        lambda: _regenerate_keywords(category_name, current_keywords, video_data_list),
+    )
+
+
+async def _regenerate_keywords(
+    category_name: str, current_keywords: dict, video_data_list: list[dict]
+) -> dict:
+    """
+    regenerate_keywords_for_specific_category의 GPT 호출부 (single-flight 리더만 실행)
+    """
+    # 데이터셋을 토큰 예산에 맞춰 압축 직렬화
+    model = "gpt-4o-mini"
+    dataset, dataset_stats = fit_videos_to_budget(video_data_list, "regenerate_keywords", model)
+    print(f"[DEBUG] 키워드 재생성 데이터셋: {dataset_stats}")
+
     # 프롬프트 생성
     prompt = f"""
     You are an AI specializing in video content analysis. Your task is to update the keywords for a specific category 
     based on the provided video dataset. The current category and its keywords are:
 
     Category: {category_name}
-    Current Keywords: {current_keywords}
+    Current Keywords: {compact_json(current_keywords)}
 
     ### Objectives:
     1. Generate **3 new keywords** for the provided category based on the dataset.
@@ -183,7 +286,7 @@ async def regenerate_keywords_for_specific_category(
 
     ### Dataset:
     Below is the dataset you need to analyze:
-    {json.dumps(video_data_list, ensure_ascii=False, indent=2)}
+    {dataset}
 
     ### Output Format:
     Respond strictly in JSON format:
@@ -201,31 +304,30 @@ async def regenerate_keywords_for_specific_category(
     """
 
     try:
-        # OpenAI API 클라이언트 생성
-        client = AsyncOpenAI(api_key=settings.openai_api_key)
+        # 프로세스 공용 OpenAI API 클라이언트
+        client = get_async_openai_client()
 
         # GPT 호출
-        response = await client.chat.completions.create(
-            model="gpt-4o-mini",
+        response = await call_openai_async(
+            client.chat.completions.with_raw_response.create,
+            model=model,
             messages=[{"role": "user", "content": prompt}],
+            response_format=REGENERATE_KEYWORDS_FORMAT,
             max_tokens=300,
         )
+        record_prompt_tokens("regenerate_keywords", model, prompt, response)
 
-        # 응답 데이터 파싱
+        # 스키마 검증 및 로컬 수정 (중복 제거, 3개로 자르기)
         response_content = response.choices[0].message.content.strip()
-        json_start = response_content.find("{")
-        json_end = response_content.rfind("}")
-        if json_start == -1 or json_end == -1:
-            raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
-
-        # JSON 데이터 파싱
-        json_string = response_content[json_start:json_end + 1]
-        output_data = json.loads(json_string)
-
-        # 새 키워드 추출
-        new_keywords = output_data.get("new_keywords", [])
-        if not new_keywords or len(new_keywords) != 3:
-            raise ValueError("생성된 키워드 데이터가 올바르지 않습니다.")
+        new_keywords, problems = repair_new_keywords(
+            parse_json_content(response_content), current_keywords
+        )
+        if problems:
+            repaired = await _request_repair_async(
+                "regenerate_keywords", REGENERATE_KEYWORDS_FORMAT, {"new_keywords": new_keywords}, problems
+            )
+            new_keywords, problems = repair_new_keywords(repaired, current_keywords)
+            _finish_repair("regenerate_keywords", problems)
 
         print(f"[DEBUG]: new keywords: {new_keywords}")
         return {
@@ -252,6 +354,16 @@ async def match_board_ratio(board1_keywords: dict, board2_keywords: dict) -> dic
     Returns:
         dict: 유저 1/2의 여집합 키워드, 새로 분류된 카테고리, 카테고리 비율, 유사도 결과를 포함한 JSON 데이터.
     """
+    fingerprint = analysis_cache.fingerprint([board1_keywords, board2_keywords])
+    return await match_ratio_flight.run_async(
+        fingerprint, lambda: _match_board_ratio(board1_keywords, board2_keywords)
+    )
+
+
+async def _match_board_ratio(board1_keywords: dict, board2_keywords: dict) -> dict:
+    """
+    match_board_ratio의 GPT 호출부 (single-flight 리더만 실행)
+    """
     # 프롬프트 생성
     prompt = f"""
     You are an AI specializing in semantic analysis and interest comparison between users. 
@@ -279,10 +391,10 @@ async def match_board_ratio(board1_keywords: dict, board2_keywords: dict) -> dic
 
     # Input Data:
     - User 1 Keywords: A list of keywords associated with User 1's interests.
-    {json.dumps(board1_keywords, ensure_ascii=False, indent=2)}
+    {compact_json(board1_keywords)}
 
     - User 2 Keywords: A list of keywords associated with User 2's interests.
-    {json.dumps(board2_keywords, ensure_ascii=False, indent=2)}
+    {compact_json(board2_keywords)}
 
     # Output Format:
     Respond **only** in the following JSON format:
@@ -320,42 +432,28 @@ async def match_board_ratio(board1_keywords: dict, board2_keywords: dict) -> dic
     - Maintain consistency in formatting and ensure all JSON responses align perfectly with the defined structure.
     """
 
-    # OpenAI API 호출
-    client = AsyncOpenAI(api_key=settings.openai_api_key)
+    # OpenAI API 호출 (프로세스 공용 클라이언트)
+    client = get_async_openai_client()
     try:
-        response = await client.chat.completions.create(
+        response = await call_openai_async(
+            client.chat.completions.with_raw_response.create,
             model="gpt-4o-2024-08-06",
             messages=[{"role": "user", "content": prompt}],
+            response_format=MATCH_FORMAT,
             max_tokens=1000,
         )
+        record_prompt_tokens("match_ratio", "gpt-4o-2024-08-06", prompt, response)
 
         # 응답 데이터 로깅
         response_content = response.choices[0].message.content.strip()
         print(f"[DEBUG] GPT 응답 데이터: {response_content}")
 
-        # JSON 시작과 끝 확인
-        json_start = response_content.find("{")
-        json_end = response_content.rfind("}")
-        if json_start == -1 or json_end == -1:
-            raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
-
-        # JSON 데이터 파싱
-        json_string = response_content[json_start:json_end + 1]
-        output_data = json.loads(json_string)
-
-        # 필수 필드 검증
-        required_keys = [
-            "user1_keywords",
-            "user2_keywords",
-            "match_keywords",
-            "new_categories",
-            "user1_category_ratio",
-            "user2_category_ratio",
-            "similarity_score",
-        ]
-        for key in required_keys:
-            if key not in output_data:
-                raise ValueError(f"응답 데이터에 {key} 필드가 없습니다.")
+        # 스키마 검증 및 로컬 수정 (비율 합계, 카테고리 개수, 키워드 중복)
+        output_data, problems = repair_match(parse_json_content(response_content))
+        if problems:
+            repaired = await _request_repair_async("match_ratio", MATCH_FORMAT, output_data, problems)
+            output_data, problems = repair_match(repaired)
+            _finish_repair("match_ratio", problems)
 
         return output_data
 
@@ -365,3 +463,42 @@ async def match_board_ratio(board1_keywords: dict, board2_keywords: dict) -> dic
     except Exception as e:
         print(f"[ERROR] GPT 요청 실패: {str(e)}")
         raise RuntimeError(f"GPT 요청 실패: {str(e)}")
+
+
+async def generate_match_flavor_text(match_result: dict) -> str | None:
+    """
+    로컬 유사도 계산 결과에 덧붙일 한두 문장의 코멘트를 생성하는 함수 (선택 기능).
+    일치율 계산 자체에는 사용하지 않으므로 실패하면 None을 반환합니다.
+
+    Args:
+        match_result (dict): similarity.compare_keywords()의 결과
+
+    Returns:
+        str | None: 코멘트
+    """
+    summary = {
+        "similarity_score": match_result["similarity_score"],
+        "match_keywords": match_result["match_keywords"][:10],
+        "user1_keywords": match_result["user1_keywords"][:5],
+        "user2_keywords": match_result["user2_keywords"][:5],
+    }
+    prompt = (
+        "두 사용자의 유튜브 관심사 비교 결과입니다. "
+        "결과를 바탕으로 재미있고 긍정적인 한국어 코멘트를 두 문장 이내로 작성하세요. "
+        "정치적이거나 부정적인 표현은 사용하지 마세요.\n"
+        f"{compact_json(summary)}"
+    )
+
+    client = get_async_openai_client()
+    try:
+        response = await call_openai_async(
+            client.chat.completions.with_raw_response.create,
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=150,
+        )
+        record_prompt_tokens("match_flavor", "gpt-4o-mini", prompt, response)
+        return response.choices[0].message.content.strip()
+    except Exception as e:
+        print(f"[ERROR] 일치율 코멘트 생성 실패: {str(e)}")
+        return None
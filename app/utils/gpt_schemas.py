@@ -0,0 +1,264 @@
+import json
+
+# 보드 분석 결과 형식
+ANALYSIS_CATEGORY_COUNT = 4
+KEYWORDS_PER_CATEGORY = 3
+MATCH_CATEGORY_COUNT = 8
+
+
+def json_schema_format(name: str, schema: dict) -> dict:
+    """
+    Chat Completions의 response_format (Structured Outputs, strict 모드)
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": name, "strict": True, "schema": schema},
+    }
+
+
+def _string_array() -> dict:
+    return {"type": "array", "items": {"type": "string"}}
+
+
+def _object(properties: dict) -> dict:
+    # strict 모드는 모든 필드가 required이고 추가 필드를 허용하지 않아야 함
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+# 카테고리 이름이 키인 객체는 strict 스키마로 표현할 수 없으므로 배열로 받은 뒤 기존 형식으로 변환
+ANALYSIS_FORMAT = json_schema_format(
+    "board_analysis",
+    _object(
+        {
+            "categories": {
+                "type": "array",
+                "items": _object(
+                    {"name": {"type": "string"}, "ratio": {"type": "number"}, "keywords": _string_array()}
+                ),
+            },
+            "board_name": {"type": "string"},
+        }
+    ),
+)
+
+REGENERATE_KEYWORDS_FORMAT = json_schema_format(
+    "regenerated_keywords", _object({"new_keywords": _string_array()})
+)
+
+MATCH_FORMAT = json_schema_format(
+    "board_match",
+    _object(
+        {
+            "user1_keywords": _string_array(),
+            "user2_keywords": _string_array(),
+            "match_keywords": _string_array(),
+            "new_categories": _string_array(),
+            "user1_category_ratio": {"type": "array", "items": {"type": "number"}},
+            "user2_category_ratio": {"type": "array", "items": {"type": "number"}},
+            "similarity_score": {"type": "number"},
+        }
+    ),
+)
+
+
+def parse_json_content(content: str) -> dict:
+    """
+    응답 본문을 JSON으로 파싱합니다. 코드 블록 등으로 감싸진 경우 첫 '{'부터 마지막 '}'까지 사용합니다.
+    """
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError:
+        json_start = content.find("{")
+        json_end = content.rfind("}")
+        if json_start == -1 or json_end == -1:
+            raise ValueError("JSON 형식의 응답을 찾을 수 없습니다.")
+        return json.loads(content[json_start : json_end + 1])
+
+
+def normalize_ratios(values: list, decimals: int = 0) -> list:
+    """
+    비율을 합계 100으로 맞춥니다. 음수/숫자가 아닌 값은 0으로, 모두 0이면 균등 분배합니다.
+    반올림 오차는 소수부가 큰 항목부터 보정합니다 (최대 잉여 방식).
+    """
+    numbers = []
+    for value in values:
+        try:
+            numbers.append(max(float(value), 0.0))
+        except (TypeError, ValueError):
+            numbers.append(0.0)
+    if not numbers:
+        return []
+
+    total = sum(numbers)
+    shares = [n / total for n in numbers] if total else [1 / len(numbers)] * len(numbers)
+    unit = 10**decimals
+    scaled = [share * 100 * unit for share in shares]
+    floors = [int(value) for value in scaled]
+    remainder = 100 * unit - sum(floors)
+    for i in sorted(range(len(scaled)), key=lambda i: floors[i] - scaled[i])[:remainder]:
+        floors[i] += 1
+    if decimals == 0:
+        return floors
+    return [round(value / unit, decimals) for value in floors]
+
+
+def _clean_keywords(values, exclude=()) -> list[str]:
+    excluded = {str(value).strip() for value in exclude}
+    cleaned = []
+    for value in values or []:
+        keyword = str(value).strip()
+        if keyword and keyword not in cleaned and keyword not in excluded:
+            cleaned.append(keyword)
+    return cleaned
+
+
+def repair_analysis(data: dict) -> tuple[dict, list[str]]:
+    """
+    보드 분석 응답을 검증하고 로컬에서 고칠 수 있는 부분을 수정합니다.
+    - 중복/빈 키워드 제거, 카테고리당 키워드 3개로 자르기
+    - 카테고리가 많으면 비율이 큰 4개만 사용, 비율은 합계 100으로 보정
+    - 보드 이름이 없으면 첫 카테고리 이름 사용
+
+    Returns:
+        tuple[dict, list[str]]: 기존 형식의 결과 ({"category_ratio", "keywords", "board_name"}),
+                                로컬에서 고칠 수 없는 문제 목록 (비어 있으면 유효)
+    """
+    categories = []
+    seen = set()
+    for category in data.get("categories") or []:
+        name = str(category.get("name") or "").strip()
+        if not name or name in seen:
+            continue
+        seen.add(name)
+        categories.append(
+            {
+                "name": name,
+                "ratio": category.get("ratio"),
+                "keywords": _clean_keywords(category.get("keywords"))[:KEYWORDS_PER_CATEGORY],
+            }
+        )
+
+    if len(categories) > ANALYSIS_CATEGORY_COUNT:
+        categories = sorted(
+            categories, key=lambda c: -(c["ratio"] if isinstance(c["ratio"], (int, float)) else 0)
+        )[:ANALYSIS_CATEGORY_COUNT]
+
+    problems = []
+    if len(categories) < ANALYSIS_CATEGORY_COUNT:
+        problems.append(
+            f"categories에 카테고리가 {len(categories)}개 있습니다. 기존 카테고리를 유지하고 "
+            f"정확히 {ANALYSIS_CATEGORY_COUNT}개가 되도록 추가하세요."
+        )
+    for category in categories:
+        if len(category["keywords"]) < KEYWORDS_PER_CATEGORY:
+            problems.append(
+                f"'{category['name']}' 카테고리의 키워드가 {len(category['keywords'])}개입니다. "
+                f"서로 다른 키워드 {KEYWORDS_PER_CATEGORY}개가 되도록 추가하세요."
+            )
+
+    ratios = normalize_ratios([category["ratio"] for category in categories])
+    board_name = data.get("board_name")
+    if isinstance(board_name, list):
+        board_name = board_name[0] if board_name else ""
+    board_name = str(board_name or "").strip() or (categories[0]["name"] if categories else "")
+
+    return {
+        "category_ratio": ratios,
+        "keywords": {category["name"]: category["keywords"] for category in categories},
+        "board_name": board_name,
+    }, problems
+
+
+def analysis_to_schema(result: dict) -> dict:
+    """
+    기존 형식의 분석 결과를 ANALYSIS_FORMAT 형식으로 변환합니다 (재요청 프롬프트용).
+    """
+    return {
+        "categories": [
+            {"name": name, "ratio": ratio, "keywords": keywords}
+            for (name, keywords), ratio in zip(result["keywords"].items(), result["category_ratio"])
+        ],
+        "board_name": result["board_name"],
+    }
+
+
+def repair_new_keywords(data: dict, current_keywords) -> tuple[list[str], list[str]]:
+    """
+    재생성 키워드를 검증합니다. 현재 키워드와 중복되는 키워드는 제외하고 3개로 자릅니다.
+
+    Returns:
+        tuple[list[str], list[str]]: 새 키워드, 문제 목록
+    """
+    new_keywords = _clean_keywords(data.get("new_keywords"), exclude=current_keywords or [])
+    new_keywords = new_keywords[:KEYWORDS_PER_CATEGORY]
+    problems = []
+    if len(new_keywords) < KEYWORDS_PER_CATEGORY:
+        problems.append(
+            f"new_keywords가 {len(new_keywords)}개입니다. 현재 키워드 {list(current_keywords or [])}와 "
+            f"겹치지 않는 서로 다른 키워드 {KEYWORDS_PER_CATEGORY}개가 되도록 추가하세요."
+        )
+    return new_keywords, problems
+
+
+def repair_match(data: dict) -> tuple[dict, list[str]]:
+    """
+    일치율 응답을 검증하고 수정합니다.
+    - match_keywords와 겹치는 키워드를 사용자별 키워드에서 제거
+    - 카테고리가 많으면 앞의 8개만 사용, 사용자별 비율 길이를 카테고리 수에 맞추고 합계 100으로 보정
+    - 유사도는 0~100 범위의 소수점 둘째 자리 숫자로 변환
+
+    Returns:
+        tuple[dict, list[str]]: 수정된 결과, 문제 목록
+    """
+    match_keywords = _clean_keywords(data.get("match_keywords"))
+    categories = _clean_keywords(data.get("new_categories"))[:MATCH_CATEGORY_COUNT]
+
+    problems = []
+    if len(categories) < MATCH_CATEGORY_COUNT:
+        problems.append(
+            f"new_categories에 카테고리가 {len(categories)}개 있습니다. 기존 카테고리를 유지하고 "
+            f"정확히 {MATCH_CATEGORY_COUNT}개가 되도록 추가하고, 비율 배열 길이도 맞추세요."
+        )
+
+    def fit_ratios(values) -> list:
+        values = list(values or [])[: len(categories)]
+        values += [0] * (len(categories) - len(values))
+        return normalize_ratios(values, decimals=2)
+
+    try:
+        similarity_score = float(str(data.get("similarity_score", 0)).rstrip("%"))
+    except ValueError:
+        similarity_score = 0.0
+
+    return {
+        "user1_keywords": _clean_keywords(data.get("user1_keywords"), exclude=match_keywords),
+        "user2_keywords": _clean_keywords(data.get("user2_keywords"), exclude=match_keywords),
+        "match_keywords": match_keywords,
+        "new_categories": categories,
+        "user1_category_ratio": fit_ratios(data.get("user1_category_ratio")),
+        "user2_category_ratio": fit_ratios(data.get("user2_category_ratio")),
+        "similarity_score": round(min(max(similarity_score, 0.0), 100.0), 2),
+    }, problems
+
+
+def build_repair_messages(data: dict, problems: list[str]) -> list[dict]:
+    """
+    원본 데이터셋 없이 직전 응답과 문제 목록만 보내는 저비용 수정 요청 메시지
+    """
+    issues = "\n".join(f"- {problem}" for problem in problems)
+    return [
+        {
+            "role": "user",
+            "content": (
+                "아래 JSON 응답을 수정하세요. 문제가 없는 값은 그대로 유지하고, "
+                "추가하는 항목은 기존 내용과 어울리는 한국어로 작성하세요.\n"
+                f"문제:\n{issues}\n"
+                f"응답:\n{json.dumps(data, ensure_ascii=False, separators=(',', ':'))}"
+            ),
+        }
+    ]
@@ -0,0 +1,93 @@
+import inspect
+import os
+import threading
+import httpx
+from app.config import settings
+
+try:
+    import h2
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+_lock = threading.Lock()
+_clients = {}
+
+
+def build_timeout(read: float | None = None) -> httpx.Timeout:
+    return httpx.Timeout(
+        read or settings.http_timeout, connect=settings.http_connect_timeout
+    )
+
+
+def build_limits(max_connections: int | None = None) -> httpx.Limits:
+    max_connections = max_connections or settings.http_max_connections
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+    )
+
+
+def get_or_create_client(name: str, factory):
+    """
+    프로세스 단위로 클라이언트를 한 번만 생성합니다.
+    Celery prefork 워커처럼 fork된 자식 프로세스에서는 부모의 커넥션을 공유하지 않도록 새로 생성합니다.
+    """
+    key = (name, os.getpid())
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+
+def get_http_client() -> httpx.Client:
+    """
+    외부 API 호출용 동기 HTTP 클라이언트.
+    호스트별 keep-alive 커넥션 풀을 재사용하므로 매 요청마다 TCP/TLS 핸드셰이크가 발생하지 않습니다.
+    """
+    return get_or_create_client(
+        "sync",
+        lambda: httpx.Client(
+            http2=HTTP2_AVAILABLE,
+            timeout=build_timeout(),
+            limits=build_limits(),
+            follow_redirects=True,
+        ),
+    )
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    외부 API 호출용 비동기 HTTP 클라이언트 (async 라우트용).
+    """
+    return get_or_create_client(
+        "async",
+        lambda: httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            timeout=build_timeout(),
+            limits=build_limits(),
+            follow_redirects=True,
+        ),
+    )
+
+
+async def close_http_clients():
+    """
+    현재 프로세스에서 생성한 클라이언트를 모두 닫습니다 (애플리케이션 종료 시 호출).
+    """
+    pid = os.getpid()
+    for (name, client_pid), client in list(_clients.items()):
+        if client_pid != pid:
+            continue
+        close = getattr(client, "aclose", None) or getattr(client, "close", None)
+        if close:
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+        _clients.pop((name, client_pid), None)
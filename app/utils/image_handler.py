@@ -0,0 +1,85 @@
+import os
+from io import BytesIO
+from PIL import Image, features
+from app.utils.gcs_handler import download_bytes_from_gcs, upload_bytes_to_gcs
+
+# 목록/공유 화면 카드용 썸네일 너비 (높이는 비율 유지)
+THUMBNAIL_WIDTH = 360
+# 포맷별 인코딩 옵션
+ENCODE_OPTIONS = {
+    "webp": {"quality": 80, "method": 4},
+    "avif": {"quality": 60},
+}
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+def available_formats() -> list[str]:
+    """
+    현재 Pillow 빌드에서 인코딩 가능한 파생 이미지 포맷 목록 (AVIF는 지원되는 경우에만 생성)
+    """
+    formats = ["webp"]
+    if features.check("avif"):
+        formats.append("avif")
+    return formats
+
+
+def _encode(image: Image.Image, image_format: str) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=image_format.upper(), **ENCODE_OPTIONS[image_format])
+    return buffer.getvalue()
+
+
+def build_image_derivatives(image_bytes: bytes) -> dict[str, tuple[bytes, str, str]]:
+    """
+    원본 이미지에서 썸네일과 WebP/AVIF 변환본을 만드는 함수 (CPU 작업).
+
+    Args:
+        image_bytes (bytes): 원본 이미지 데이터
+
+    Returns:
+        dict: {변환본 이름: (이미지 데이터, 확장자, Content-Type)}
+              이름은 "webp", "thumbnail_webp", "avif", "thumbnail_avif" 형식
+    """
+    image = Image.open(BytesIO(image_bytes))
+    image.load()
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    thumbnail = image.copy()
+    thumbnail_height = max(1, round(image.height * THUMBNAIL_WIDTH / image.width))
+    thumbnail.thumbnail((THUMBNAIL_WIDTH, thumbnail_height), Image.Resampling.LANCZOS)
+
+    derivatives = {}
+    for image_format in available_formats():
+        content_type = CONTENT_TYPES[image_format]
+        derivatives[image_format] = (_encode(image, image_format), image_format, content_type)
+        derivatives[f"thumbnail_{image_format}"] = (
+            _encode(thumbnail, image_format),
+            image_format,
+            content_type,
+        )
+    return derivatives
+
+
+def create_image_derivatives(source_path: str) -> dict[str, str]:
+    """
+    GCS에 저장된 원본 이미지의 파생 이미지를 만들어 같은 경로 옆에 업로드하는 함수.
+    예) boards/1/2.png → boards/1/2.webp, boards/1/2_thumbnail.webp
+
+    Args:
+        source_path (str): GCS 내 원본 이미지 경로
+
+    Returns:
+        dict[str, str]: {변환본 이름: 공개 URL}
+    """
+    base_path = os.path.splitext(source_path)[0]
+    derivatives = build_image_derivatives(download_bytes_from_gcs(source_path))
+
+    urls = {}
+    for name, (data, extension, content_type) in derivatives.items():
+        suffix = "_thumbnail" if name.startswith("thumbnail_") else ""
+        urls[name] = upload_bytes_to_gcs(
+            data, f"{base_path}{suffix}.{extension}", content_type
+        )
+    print(f"파생 이미지 생성 완료 ({source_path}): {list(urls)}")
+    return urls
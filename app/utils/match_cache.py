@@ -0,0 +1,91 @@
+import hashlib
+import json
+from app.config import settings
+from app.utils.redis_handler import async_redis_client
+
+# 보드 A/B 순서에 따라 서로 바뀌는 결과 필드
+_SWAP_FIELDS = (
+    ("user1_keywords", "user2_keywords"),
+    ("user1_category_ratio", "user2_category_ratio"),
+)
+
+
+def _index_key(board_id: int) -> str:
+    # 보드가 포함된 일치율 캐시 키 목록 (키워드 재생성 시 무효화용)
+    return f"match_ratio_index:{board_id}"
+
+
+def match_cache_key(board_id1: int, board_id2: int, keywords1, keywords2) -> tuple[str, bool]:
+    """
+    순서와 무관한 보드 쌍 + 두 보드 키워드 해시 + 계산 엔진으로 캐시 키를 만듭니다.
+
+    Returns:
+        tuple[str, bool]: 캐시 키, 요청 순서가 저장 순서(작은 ID가 user1)와 반대인지 여부
+    """
+    swapped = board_id1 > board_id2
+    if swapped:
+        board_id1, board_id2 = board_id2, board_id1
+        keywords1, keywords2 = keywords2, keywords1
+
+    serialized = json.dumps(
+        [keywords1, keywords2], ensure_ascii=False, sort_keys=True, separators=(",", ":")
+    )
+    digest = hashlib.sha256(serialized.encode("utf-8")).hexdigest()[:16]
+    return f"match_ratio:{settings.match_ratio_engine}:{board_id1}:{board_id2}:{digest}", swapped
+
+
+def swap_match_result(result: dict) -> dict:
+    """
+    user1/user2 필드를 서로 바꾼 결과를 반환합니다.
+    """
+    swapped = dict(result)
+    for field1, field2 in _SWAP_FIELDS:
+        if field1 in result or field2 in result:
+            swapped[field1], swapped[field2] = result.get(field2), result.get(field1)
+    return swapped
+
+
+async def get_match_result(key: str, swapped: bool) -> dict | None:
+    """
+    캐시된 일치율 결과를 요청 순서에 맞춰 반환합니다. 캐시 오류 시 None을 반환합니다.
+    """
+    try:
+        cached = await async_redis_client.get(key)
+    except Exception as e:
+        print(f"[ERROR] 일치율 캐시 조회 실패: {e}")
+        return None
+    if not cached:
+        return None
+    result = json.loads(cached)
+    return swap_match_result(result) if swapped else result
+
+
+async def set_match_result(key: str, swapped: bool, board_id1: int, board_id2: int, result: dict):
+    """
+    일치율 결과를 저장 순서(작은 ID가 user1)로 저장하고 두 보드의 인덱스에 키를 등록합니다.
+    """
+    stored = swap_match_result(result) if swapped else result
+    ttl = settings.match_cache_ttl
+    try:
+        pipe = async_redis_client.pipeline()
+        pipe.set(key, json.dumps(stored, ensure_ascii=False), ex=ttl)
+        for board_id in (board_id1, board_id2):
+            pipe.sadd(_index_key(board_id), key)
+            pipe.expire(_index_key(board_id), ttl)
+        await pipe.execute()
+    except Exception as e:
+        print(f"[ERROR] 일치율 캐시 저장 실패: {e}")
+
+
+async def invalidate_board_matches(board_id: int):
+    """
+    보드가 포함된 모든 일치율 캐시를 삭제합니다 (키워드 재생성 시 호출).
+    """
+    try:
+        index_key = _index_key(board_id)
+        keys = await async_redis_client.smembers(index_key)
+        await async_redis_client.delete(index_key, *keys)
+        if keys:
+            print(f"[DEBUG] 보드 {board_id} 일치율 캐시 {len(keys)}개 삭제")
+    except Exception as e:
+        print(f"[ERROR] 일치율 캐시 무효화 실패: {e}")
@@ -0,0 +1,118 @@
+import asyncio
+import random
+import time
+import httpx
+from openai import OpenAI, AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+from app.config import settings
+from app.utils.http_client import build_limits, build_timeout, get_or_create_client
+from app.utils.rate_limiter import get_rate_limiter
+
+
+def get_openai_client() -> OpenAI:
+    """
+    프로세스당 한 번 생성되는 동기 OpenAI 클라이언트 (Celery 워커 자식 프로세스마다 별도 생성).
+    GPT/DALL·E 핸들러가 공유하여 커넥션을 재사용합니다.
+    재시도는 SDK가 프로세스별로 하지 않고 call_openai가 클러스터 공용 요청 한도와 함께 처리합니다.
+    """
+    return get_or_create_client(
+        "openai",
+        lambda: OpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout,
+            max_retries=0,
+            http_client=httpx.Client(
+                timeout=build_timeout(settings.openai_timeout),
+                limits=build_limits(settings.openai_max_connections),
+            ),
+        ),
+    )
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    프로세스당 한 번 생성되는 비동기 OpenAI 클라이언트 (async 라우트용).
+    """
+    return get_or_create_client(
+        "async_openai",
+        lambda: AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            timeout=settings.openai_timeout,
+            max_retries=0,
+            http_client=httpx.AsyncClient(
+                timeout=build_timeout(settings.openai_timeout),
+                limits=build_limits(settings.openai_max_connections),
+            ),
+        ),
+    )
+
+
+def _is_quota_error(error: RateLimitError) -> bool:
+    # 결제 한도 초과는 기다려도 풀리지 않으므로 재시도하지 않음
+    return getattr(error, "code", None) == "insufficient_quota"
+
+
+def _server_error_backoff(attempt: int) -> float:
+    return min(0.5 * 2**attempt, 8) + random.uniform(0, 0.25)
+
+
+def call_openai(raw_method, model: str, **kwargs):
+    """
+    클러스터 공용 요청 한도(openai:{model})를 획득한 뒤 OpenAI API를 호출합니다 (동기).
+    응답의 x-ratelimit-* 헤더와 429 응답으로 요청 속도를 조절하고,
+    429는 최대 RATE_LIMIT_MAX_RETRIES번, 연결 오류/5xx는 최대 OPENAI_MAX_RETRIES번 재시도합니다.
+
+    Args:
+        raw_method: with_raw_response 메서드 (예: client.chat.completions.with_raw_response.create)
+        model (str): 모델 이름 (요청 한도 버킷 구분에도 사용)
+
+    Returns:
+        파싱된 응답 객체
+    """
+    limiter = get_rate_limiter("openai", model)
+    throttled_attempts = 0
+    server_attempts = 0
+    while True:
+        limiter.acquire()
+        try:
+            raw = raw_method(model=model, **kwargs)
+        except RateLimitError as e:
+            limiter.observe(e.response.headers, throttled=True)
+            if _is_quota_error(e) or throttled_attempts >= settings.rate_limit_max_retries:
+                raise
+            throttled_attempts += 1
+            continue
+        except (APIConnectionError, InternalServerError):
+            if server_attempts >= settings.openai_max_retries:
+                raise
+            time.sleep(_server_error_backoff(server_attempts))
+            server_attempts += 1
+            continue
+        limiter.observe(raw.headers)
+        return raw.parse()
+
+
+async def call_openai_async(raw_method, model: str, **kwargs):
+    """
+    call_openai의 비동기 버전
+    """
+    limiter = get_rate_limiter("openai", model)
+    throttled_attempts = 0
+    server_attempts = 0
+    while True:
+        await limiter.acquire_async()
+        try:
+            raw = await raw_method(model=model, **kwargs)
+        except RateLimitError as e:
+            await limiter.observe_async(e.response.headers, throttled=True)
+            if _is_quota_error(e) or throttled_attempts >= settings.rate_limit_max_retries:
+                raise
+            throttled_attempts += 1
+            continue
+        except (APIConnectionError, InternalServerError):
+            if server_attempts >= settings.openai_max_retries:
+                raise
+            await asyncio.sleep(_server_error_backoff(server_attempts))
+            server_attempts += 1
+            continue
+        await limiter.observe_async(raw.headers)
+        return raw.parse()
@@ -0,0 +1,96 @@
+import json
+import time
+from app.utils.redis_handler import redis_client, async_redis_client, async_pubsub_client
+
+# 마지막 진행 상태 보관 시간 (구독 전에 발생한 이벤트를 늦게 접속한 클라이언트에게 전달)
+PROGRESS_EXPIRE = 3600
+# 스트림 종료 단계
+TERMINAL_STAGES = {"completed", "failed"}
+
+
+class ProgressHandler:
+    @staticmethod
+    def channel_name(board_id: int) -> str:
+        return f"board_progress:{board_id}"
+
+    @staticmethod
+    def last_event_key(board_id: int) -> str:
+        return f"board_progress_last:{board_id}"
+
+    @staticmethod
+    def publish_board_progress(board_id: int, stage: str, data: dict | None = None):
+        """
+        보드 생성 단계 이벤트를 Redis pub/sub으로 발행하는 함수.
+        발행 실패가 보드 생성 자체를 실패시키지 않도록 오류는 로그만 남깁니다.
+
+        Args:
+            board_id (int): 보드 ID
+            stage (str): 단계 이름 (queued, fetch, analyze, render, store, completed, failed)
+            data (dict | None): 단계별 추가 정보
+        """
+        event = json.dumps(
+            {
+                "board_id": board_id,
+                "stage": stage,
+                "data": data or {},
+                "timestamp": time.time(),
+            },
+            ensure_ascii=False,
+        )
+        try:
+            pipe = redis_client.pipeline()
+            pipe.set(ProgressHandler.last_event_key(board_id), event, ex=PROGRESS_EXPIRE)
+            pipe.publish(ProgressHandler.channel_name(board_id), event)
+            pipe.execute()
+        except Exception as e:
+            print(f"[ERROR] 보드 {board_id} 진행 이벤트 발행 실패: {e}")
+
+    @staticmethod
+    async def open_progress_subscription(board_id: int):
+        """
+        보드 진행 채널을 구독합니다 (pub/sub 전용 풀 사용).
+        구독 커넥션 한도를 넘거나 Redis에 연결할 수 없으면 redis ConnectionError가 발생합니다.
+        """
+        pubsub = async_pubsub_client.pubsub()
+        try:
+            await pubsub.subscribe(ProgressHandler.channel_name(board_id))
+        except Exception:
+            await pubsub.aclose()
+            raise
+        return pubsub
+
+    @staticmethod
+    async def subscribe_board_progress(
+        board_id: int, pubsub=None, heartbeat: float = 15.0, max_duration: float = 600.0
+    ):
+        """
+        보드 진행 이벤트를 구독하는 비동기 제너레이터.
+        이벤트 JSON 문자열을 반환하며, 이벤트가 없을 때는 heartbeat 간격마다 None을 반환합니다.
+        완료/실패 이벤트를 받거나 max_duration이 지나면 종료됩니다.
+        pubsub을 넘기지 않으면 open_progress_subscription()으로 직접 구독합니다.
+        """
+        if pubsub is None:
+            pubsub = await ProgressHandler.open_progress_subscription(board_id)
+        try:
+            # 구독 후 마지막 상태를 조회해야 그 사이에 발행된 이벤트를 놓치지 않음
+            last_event = await async_redis_client.get(ProgressHandler.last_event_key(board_id))
+            if last_event:
+                yield last_event
+                if json.loads(last_event).get("stage") in TERMINAL_STAGES:
+                    return
+
+            deadline = time.monotonic() + max_duration
+            while time.monotonic() < deadline:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=heartbeat
+                )
+                if message is None:
+                    yield None
+                    continue
+
+                event = message["data"]
+                yield event
+                if json.loads(event).get("stage") in TERMINAL_STAGES:
+                    return
+        finally:
+            await pubsub.aclose()
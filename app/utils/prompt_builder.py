@@ -0,0 +1,150 @@
+import json
+import math
+import time
+from prometheus_client import Histogram
+from app.config import settings
+
+try:
+    import tiktoken
+
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+# 프롬프트 종류별 데이터셋 토큰 예산
+PROMPT_TOKEN_BUDGETS = {
+    "analysis": settings.gpt_analysis_token_budget,
+    "regenerate_keywords": settings.gpt_regenerate_token_budget,
+}
+# 동영상당 최대 태그 수 / 설명 글자 수 (예산이 부족하면 설명을 더 줄임)
+MAX_TAGS_PER_VIDEO = 10
+DESCRIPTION_CHAR_STEPS = (200, 80, 0)
+
+GPT_INPUT_TOKENS = Histogram(
+    "gpt_prompt_input_tokens",
+    "GPT 호출당 입력 토큰 수",
+    ["prompt_type", "model"],
+    buckets=(250, 500, 1000, 2000, 3000, 4000, 6000, 8000, 12000, 16000),
+)
+
+
+# 인코딩 파일(BPE)을 내려받지 못했을 때 다시 시도하기까지의 간격 (초)
+ENCODING_RETRY_INTERVAL = 300
+_encodings = {}
+_encoding_failed_at = {}
+
+
+def _encoding(model: str):
+    """
+    모델의 tiktoken 인코딩을 반환합니다. 인코딩은 처음 사용할 때 TIKTOKEN_CACHE_DIR 또는 네트워크에서 로드되므로,
+    로드에 실패하면 None을 반환하고 ENCODING_RETRY_INTERVAL 동안은 다시 시도하지 않습니다.
+    """
+    if model in _encodings:
+        return _encodings[model]
+    if time.monotonic() - _encoding_failed_at.get(model, -ENCODING_RETRY_INTERVAL) < ENCODING_RETRY_INTERVAL:
+        return None
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        _encoding_failed_at[model] = time.monotonic()
+        print(f"[WARNING] tiktoken 인코딩 로드 실패 ({model}), 근사치로 토큰 수 계산: {e}")
+        return None
+    _encodings[model] = encoding
+    return encoding
+
+
+def count_tokens(text: str, model: str) -> int:
+    """
+    로컬 토크나이저(tiktoken)로 토큰 수를 계산합니다.
+    tiktoken이 없거나 인코딩을 로드할 수 없으면 UTF-8 바이트 수 기준 근사치(한글 1자 ≈ 1토큰)를 반환합니다.
+    """
+    encoding = _encoding(model) if TIKTOKEN_AVAILABLE else None
+    if encoding is not None:
+        try:
+            # 동영상 설명 등에 포함된 특수 토큰 문자열도 일반 텍스트로 계산
+            return len(encoding.encode(text, disallowed_special=()))
+        except Exception as e:
+            print(f"[WARNING] tiktoken 토큰 계산 실패 ({model}), 근사치 사용: {e}")
+    return math.ceil(len(text.encode("utf-8")) / 3)
+
+
+def compact_json(data) -> str:
+    """
+    공백 없는 JSON 직렬화 (indent=2 대비 입력 토큰 절감)
+    """
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+def compact_video(video: dict, description_chars: int) -> dict:
+    """
+    동영상 데이터에서 빈 필드를 제거하고 태그 수와 설명 길이를 제한합니다.
+    """
+    compacted = {}
+    title = (video.get("localizedTitle") or "").strip()
+    if title:
+        compacted["localizedTitle"] = title
+    tags = list(dict.fromkeys(tag.strip() for tag in video.get("tags") or [] if tag.strip()))
+    if tags:
+        compacted["tags"] = tags[:MAX_TAGS_PER_VIDEO]
+    if video.get("categoryId"):
+        compacted["categoryId"] = video["categoryId"]
+    description = " ".join((video.get("localizedDescription") or "").split())
+    if description and description_chars:
+        compacted["localizedDescription"] = description[:description_chars]
+    return compacted
+
+
+def fit_videos_to_budget(video_data_list: list[dict], prompt_type: str, model: str) -> tuple[str, dict]:
+    """
+    동영상 데이터를 프롬프트 종류별 토큰 예산 안에 들어가도록 압축 직렬화합니다.
+    예산을 넘으면 설명 길이를 단계적으로 줄이고, 그래도 넘으면 뒤쪽 동영상부터 제외합니다.
+
+    Args:
+        video_data_list (list[dict]): 동영상 메타데이터 리스트
+        prompt_type (str): PROMPT_TOKEN_BUDGETS의 키
+        model (str): 토큰 계산 기준 모델
+
+    Returns:
+        tuple[str, dict]: 데이터셋 JSON 문자열, {"videos", "dropped", "tokens", "budget"}
+    """
+    budget = PROMPT_TOKEN_BUDGETS[prompt_type]
+    for description_chars in DESCRIPTION_CHAR_STEPS:
+        videos = [compact_video(video, description_chars) for video in video_data_list]
+        videos = [video for video in videos if video]
+        # 항목별 토큰 수 합 + 구분자(쉼표/괄호)로 전체 크기를 추정
+        sizes = [count_tokens(compact_json(video), model) + 1 for video in videos]
+        if sum(sizes) + 1 <= budget or description_chars == DESCRIPTION_CHAR_STEPS[-1]:
+            break
+
+    used = 1
+    count = 0
+    for size in sizes:
+        if used + size > budget:
+            break
+        used += size
+        count += 1
+
+    dataset = compact_json(videos[:count])
+    return dataset, {
+        "videos": count,
+        "dropped": len(video_data_list) - count,
+        "tokens": count_tokens(dataset, model),
+        "budget": budget,
+    }
+
+
+def record_prompt_tokens(prompt_type: str, model: str, prompt: str, response=None) -> int:
+    """
+    호출별 입력 토큰 수를 기록합니다. 응답의 usage가 있으면 실제 값을, 없으면 로컬 계산 값을 사용합니다.
+
+    Returns:
+        int: 입력 토큰 수
+    """
+    usage = getattr(response, "usage", None)
+    tokens = getattr(usage, "prompt_tokens", None) or count_tokens(prompt, model)
+    GPT_INPUT_TOKENS.labels(prompt_type, model).observe(tokens)
+    print(f"[DEBUG] GPT 입력 토큰 ({prompt_type}, {model}): {tokens}")
+    return tokens
@@ -0,0 +1,289 @@
+import asyncio
+import math
+import random
+import re
+import threading
+import time
+from prometheus_client import Counter, Histogram
+from redis.exceptions import RedisError
+from app.config import settings
+from app.utils.redis_handler import redis_client, async_redis_client
+
+# 토큰 버킷에서 cost만큼 꺼냅니다. 성공하면 0, 부족하면 기다려야 하는 시간(ms)을 반환합니다.
+# 시각은 Redis 서버 시간(TIME)을 사용하므로 프로세스 간 시계 차이의 영향을 받지 않습니다.
+# KEYS: 버킷 hash, 쿨다운 키 / ARGV: 분당 요청 수, 버킷 크기, cost, 버킷 TTL(ms)
+# 반환: {대기 ms, 현재 속도 비율 * 1000}
+_ACQUIRE_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call("HMGET", KEYS[1], "tokens", "ts", "factor")
+local factor = tonumber(state[3]) or 1
+local cooldown = tonumber(redis.call("GET", KEYS[2]) or "0")
+if cooldown > now then
+    return {cooldown - now, math.floor(factor * 1000)}
+end
+
+local rate = tonumber(ARGV[1]) * factor / 60000
+local capacity = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(now - ts, 0) * rate)
+
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = math.ceil((cost - tokens) / rate)
+end
+redis.call("HSET", KEYS[1], "tokens", tokens, "ts", now)
+redis.call("PEXPIRE", KEYS[1], ARGV[4])
+return {wait, math.floor(factor * 1000)}
+"""
+
+# 응답 결과를 버킷에 반영합니다 (AIMD).
+# - 429: 속도 비율을 절반으로 줄이고(최소 MIN_FACTOR) 남은 토큰을 비움
+# - 정상 응답: 줄어든 속도 비율을 조금씩 회복
+# - 쿨다운(ms)이 있으면 그 시각까지 모든 프로세스의 acquire가 대기
+# KEYS: 버킷 hash, 쿨다운 키 / ARGV: throttled(0/1), 쿨다운 ms, 최소 비율, 회복 단위
+_FEEDBACK_SCRIPT = """
+local t = redis.call("TIME")
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local cooldown_ms = tonumber(ARGV[2])
+if cooldown_ms > 0 then
+    local until_ms = now + cooldown_ms
+    if until_ms > tonumber(redis.call("GET", KEYS[2]) or "0") then
+        redis.call("SET", KEYS[2], until_ms, "PX", cooldown_ms)
+    end
+end
+
+local factor = tonumber(redis.call("HGET", KEYS[1], "factor") or "1")
+if ARGV[1] == "1" then
+    factor = math.max(tonumber(ARGV[3]), factor * 0.5)
+    redis.call("HSET", KEYS[1], "factor", factor, "tokens", 0, "ts", now)
+elseif factor < 1 then
+    factor = math.min(1, factor + tonumber(ARGV[4]))
+    redis.call("HSET", KEYS[1], "factor", factor)
+end
+return math.floor(factor * 1000)
+"""
+
+# 429 이후 줄일 수 있는 최소 속도 비율, 정상 응답마다 회복하는 비율
+MIN_FACTOR = 0.1
+RECOVERY_STEP = 0.05
+# 429 응답에 대기 시간 헤더가 없을 때의 기본 쿨다운 (ms)
+DEFAULT_COOLDOWN_MS = 1000
+
+RATE_LIMIT_WAIT = Histogram(
+    "outbound_rate_limit_wait_seconds",
+    "외부 API 호출 전 클러스터 공용 요청 한도로 대기한 시간",
+    ["provider", "model"],
+    buckets=(0, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+RATE_LIMIT_THROTTLED = Counter(
+    "outbound_rate_limited_total",
+    "제공자가 요청 한도 초과(429 등)로 거절한 외부 API 호출 수",
+    ["provider", "model"],
+)
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS_MS = {"ms": 1, "s": 1000, "m": 60 * 1000, "h": 60 * 60 * 1000}
+
+
+class RateLimitTimeout(RuntimeError):
+    """
+    요청 한도 대기 시간이 RATE_LIMIT_MAX_WAIT를 넘었을 때 발생하는 오류
+    """
+
+
+def parse_reset_duration(value: str | None) -> int | None:
+    """
+    OpenAI x-ratelimit-reset-* 헤더 값(예: "1s", "6m0s", "20ms", "1.5s")을 ms로 변환합니다.
+    단위가 없으면 초로 간주합니다.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return math.ceil(float(value) * 1000)
+    except ValueError:
+        pass
+    matches = _DURATION_PATTERN.findall(value)
+    if not matches:
+        return None
+    return math.ceil(sum(float(amount) * _DURATION_UNITS_MS[unit] for amount, unit in matches))
+
+
+def cooldown_from_headers(headers, throttled: bool) -> int:
+    """
+    응답 헤더로 다음 요청까지 기다려야 하는 시간(ms)을 계산합니다.
+    - 429: retry-after-ms / retry-after / x-ratelimit-reset-* 순서로 사용, 없으면 DEFAULT_COOLDOWN_MS
+    - 정상 응답: 남은 요청/토큰이 0이면 해당 reset 시간까지 대기, 아니면 0
+    """
+    headers = headers or {}
+    resets = {
+        kind: parse_reset_duration(headers.get(f"x-ratelimit-reset-{kind}"))
+        for kind in ("requests", "tokens")
+    }
+    if throttled:
+        retry_after_ms = headers.get("retry-after-ms")
+        if retry_after_ms:
+            try:
+                return math.ceil(float(retry_after_ms))
+            except ValueError:
+                pass
+        retry_after = parse_reset_duration(headers.get("retry-after"))
+        if retry_after is not None:
+            return retry_after
+        return max([reset for reset in resets.values() if reset] or [DEFAULT_COOLDOWN_MS])
+
+    cooldown = 0
+    for kind, reset in resets.items():
+        remaining = headers.get(f"x-ratelimit-remaining-{kind}")
+        if remaining is not None and remaining.strip() == "0" and reset:
+            cooldown = max(cooldown, reset)
+    return cooldown
+
+
+class RateLimiter:
+    """
+    Redis 토큰 버킷 기반 클러스터 공용 요청 한도 (제공자/모델별).
+    API 프로세스와 Celery 워커가 같은 버킷을 공유하므로 전체 호출량이 제공자 한도를 넘지 않습니다.
+
+    - 버킷: rate_limit:{provider}:{model} (hash: tokens, ts, factor)
+    - 쿨다운: rate_limit:{provider}:{model}:cooldown → 이 시각(ms)까지 모든 호출 대기
+
+    429 응답을 받으면 속도를 절반으로 줄이고 헤더의 대기 시간만큼 쿨다운한 뒤,
+    정상 응답마다 조금씩 원래 속도로 회복합니다 (한도 근처에서 429가 반복되지 않도록).
+    """
+
+    def __init__(self, provider: str, model: str, requests_per_minute: int):
+        self.provider = provider
+        self.model = model
+        self.requests_per_minute = max(requests_per_minute, 1)
+        # 버킷 크기: 1초 분량 (최소 1) — 분당 한도를 짧은 구간에 몰아 쓰지 않도록
+        self.capacity = max(math.ceil(self.requests_per_minute / 60), 1)
+        self.bucket_key = f"rate_limit:{provider}:{model}"
+        self.cooldown_key = f"{self.bucket_key}:cooldown"
+        self._factor = 1.0
+
+    def _acquire_args(self, cost: int) -> tuple:
+        # 버킷이 가득 차는 시간보다 길게 유지 (그 이후에는 가득 찬 버킷과 같음)
+        ttl_ms = max(math.ceil(self.capacity / self.requests_per_minute * 60000) * 2, 60000)
+        return (
+            _ACQUIRE_SCRIPT, 2, self.bucket_key, self.cooldown_key,
+            self.requests_per_minute, self.capacity, cost, ttl_ms,
+        )
+
+    def _next_sleep(self, wait_ms: int, deadline: float) -> float:
+        remaining = deadline - time.monotonic()
+        if wait_ms / 1000 > remaining:
+            raise RateLimitTimeout(
+                f"{self.provider}:{self.model} 요청 한도 대기 시간 초과 ({settings.rate_limit_max_wait}초)"
+            )
+        # 여러 프로세스가 같은 시각에 깨어나지 않도록 약간의 지터 추가
+        return wait_ms / 1000 + random.uniform(0, 0.05)
+
+    def acquire(self, cost: int = 1):
+        """
+        호출 전에 토큰을 획득합니다 (동기). 토큰이 없으면 채워질 때까지 대기합니다.
+        Redis를 사용할 수 없으면 제한 없이 진행합니다.
+        """
+        started_at = time.monotonic()
+        deadline = started_at + settings.rate_limit_max_wait
+        while True:
+            try:
+                wait_ms, factor = redis_client.eval(*self._acquire_args(cost))
+            except RedisError as e:
+                print(f"[ERROR] 요청 한도 확인 실패, 제한 없이 호출 ({self.bucket_key}): {e}")
+                return
+            self._factor = factor / 1000
+            if not wait_ms:
+                break
+            time.sleep(self._next_sleep(wait_ms, deadline))
+        RATE_LIMIT_WAIT.labels(self.provider, self.model).observe(time.monotonic() - started_at)
+
+    async def acquire_async(self, cost: int = 1):
+        """
+        acquire의 비동기 버전 (대기 중 이벤트 루프를 막지 않음)
+        """
+        started_at = time.monotonic()
+        deadline = started_at + settings.rate_limit_max_wait
+        while True:
+            try:
+                wait_ms, factor = await async_redis_client.eval(*self._acquire_args(cost))
+            except RedisError as e:
+                print(f"[ERROR] 요청 한도 확인 실패, 제한 없이 호출 ({self.bucket_key}): {e}")
+                return
+            self._factor = factor / 1000
+            if not wait_ms:
+                break
+            await asyncio.sleep(self._next_sleep(wait_ms, deadline))
+        RATE_LIMIT_WAIT.labels(self.provider, self.model).observe(time.monotonic() - started_at)
+
+    def _feedback_args(self, headers, throttled: bool) -> tuple | None:
+        cooldown_ms = cooldown_from_headers(headers, throttled)
+        if throttled:
+            RATE_LIMIT_THROTTLED.labels(self.provider, self.model).inc()
+            print(
+                f"[WARNING] {self.provider}:{self.model} 요청 한도 초과, "
+                f"{cooldown_ms}ms 대기 후 속도 {self._factor * 0.5:.2f}배로 감소"
+            )
+        elif not cooldown_ms and self._factor >= 1:
+            # 정상 속도이고 한도 여유가 있으면 Redis 왕복 생략
+            return None
+        return (
+            _FEEDBACK_SCRIPT, 2, self.bucket_key, self.cooldown_key,
+            int(throttled), cooldown_ms, MIN_FACTOR, RECOVERY_STEP,
+        )
+
+    def observe(self, headers, throttled: bool = False):
+        """
+        응답 헤더와 한도 초과 여부를 버킷에 반영합니다 (동기).
+        """
+        args = self._feedback_args(headers, throttled)
+        if args is None:
+            return
+        try:
+            self._factor = redis_client.eval(*args) / 1000
+        except RedisError as e:
+            print(f"[ERROR] 요청 한도 갱신 실패 ({self.bucket_key}): {e}")
+
+    async def observe_async(self, headers, throttled: bool = False):
+        """
+        observe의 비동기 버전
+        """
+        args = self._feedback_args(headers, throttled)
+        if args is None:
+            return
+        try:
+            self._factor = await async_redis_client.eval(*args) / 1000
+        except RedisError as e:
+            print(f"[ERROR] 요청 한도 갱신 실패 ({self.bucket_key}): {e}")
+
+
+def _requests_per_minute(provider: str, model: str) -> int:
+    if provider == "openai":
+        return settings.openai_image_rpm if model.startswith("dall-e") else settings.openai_rpm
+    if provider == "youtube":
+        return settings.youtube_rpm
+    raise ValueError(f"알 수 없는 제공자입니다: {provider}")
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """
+    제공자/모델별 RateLimiter를 반환합니다 (프로세스 내에서 재사용).
+    """
+    key = (provider, model)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(provider, model, _requests_per_minute(provider, model))
+                _limiters[key] = limiter
+    return limiter
@@ -1,4 +1,5 @@
 import redis
+import redis.asyncio as aioredis
 import json
 from app.config import settings
 
@@ -6,6 +7,26 @@ redis_client = redis.Redis(
     host=settings.redis_host, port=settings.redis_port, decode_responses=True
 )
 
+# 비동기 라우트용 클라이언트 (이벤트 루프를 막지 않도록 redis.asyncio 사용, 프로세스 단위 커넥션 풀 공유)
+async_redis_pool = aioredis.BlockingConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    decode_responses=True,
+    max_connections=settings.redis_async_max_connections,
+    timeout=5,
+)
+async_redis_client = aioredis.Redis(connection_pool=async_redis_pool)
+
+# pub/sub 구독 전용 클라이언트. 구독은 커넥션을 오래 점유하므로 명령용 풀과 분리하고,
+# 한도를 넘으면 대기하지 않고 바로 ConnectionError를 발생시킵니다 (SSE는 503으로 응답).
+async_pubsub_pool = aioredis.ConnectionPool(
+    host=settings.redis_host,
+    port=settings.redis_port,
+    decode_responses=True,
+    max_connections=settings.redis_pubsub_max_connections,
+)
+async_pubsub_client = aioredis.Redis(connection_pool=async_pubsub_pool)
+
 
 class RedisHandler:
     @staticmethod
@@ -37,6 +58,30 @@ class RedisHandler:
         except Exception as e:
             print(f"Redis 저장 실패: {e}")
 
+    @staticmethod
+    def save_many_to_redis_list(lists: dict[str, list], expire: int = 3600):
+        """
+        여러 JSON 리스트 키를 한 번에 병합 저장하는 함수 (save_to_redis_list의 일괄 버전).
+        기존 값은 MGET 한 번으로 읽고, 메모리에서 중복 없이 병합한 뒤 파이프라인 한 번으로 저장합니다.
+
+        Args:
+            lists (dict[str, list]): {Redis 키: 추가할 항목 목록}
+            expire (int): 만료 시간 (초)
+        """
+        if not lists:
+            return
+        keys = list(lists)
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for key, raw in zip(keys, redis_client.mget(keys)):
+                existing_items = json.loads(raw) if raw else []
+                unique_items = [item for item in lists[key] if item not in existing_items]
+                pipe.set(key, json.dumps(existing_items + unique_items), ex=expire)
+            pipe.execute()
+            print(f"Redis에 리스트 {len(keys)}개 일괄 저장 완료.")
+        except Exception as e:
+            print(f"Redis 일괄 저장 실패: {e}")
+
     @staticmethod
     def get_from_redis_list(key: str):
         """
@@ -61,8 +106,9 @@ class RedisHandler:
             data (dict): 저장할 데이터
         """
         try:
-            for field, value in data.items():
-                redis_client.hset(redis_key, field, json.dumps(value))
+            redis_client.hset(
+                redis_key, mapping={field: json.dumps(value) for field, value in data.items()}
+            )
             print(f"데이터가 Redis에 저장되었습니다: {redis_key}")
         except Exception as e:
             raise ValueError(f"Redis 저장 중 오류 발생: {str(e)}")
@@ -90,6 +136,95 @@ class RedisHandler:
             raise e
 
 
+    @staticmethod
+    def get_many_from_redis_list(keys: list[str]) -> list:
+        """
+        여러 JSON 리스트 키를 MGET 한 번으로 가져오는 함수.
+
+        Args:
+            keys (list[str]): Redis 키 목록
+        Returns:
+            list: 키 순서대로 디코딩된 값 (없는 키는 None)
+        """
+        if not keys:
+            return []
+        try:
+            return [json.loads(raw) if raw else None for raw in redis_client.mget(keys)]
+        except Exception as e:
+            print(f"Redis에서 데이터 가져오기 실패: {e}")
+            return [None] * len(keys)
+
+    @staticmethod
+    def save_many_video_details(video_details: dict[str, dict]):
+        """
+        여러 동영상 세부 정보를 파이프라인 한 번으로 youtube_video:{id} 해시에 저장하는 함수.
+
+        Args:
+            video_details (dict[str, dict]): {동영상ID: 세부 정보}
+        """
+        if not video_details:
+            return
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for video_id, data in video_details.items():
+                pipe.hset(
+                    f"youtube_video:{video_id}",
+                    mapping={field: json.dumps(value) for field, value in data.items()},
+                )
+            pipe.execute()
+            print(f"동영상 세부 정보 {len(video_details)}개가 Redis에 저장되었습니다.")
+        except Exception as e:
+            raise ValueError(f"Redis 저장 중 오류 발생: {str(e)}")
+
+    @staticmethod
+    def get_many_video_details(video_ids: list[str]) -> dict[str, dict]:
+        """
+        여러 동영상 세부 정보를 파이프라인 한 번으로 가져오는 함수.
+
+        Args:
+            video_ids (list[str]): 동영상 ID 목록
+        Returns:
+            dict[str, dict]: {동영상ID: 세부 정보} (Redis에 없는 동영상은 제외, 입력 순서 유지)
+        """
+        if not video_ids:
+            return {}
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for video_id in video_ids:
+                pipe.hgetall(f"youtube_video:{video_id}")
+            return {
+                video_id: {field: json.loads(value) for field, value in data.items()}
+                for video_id, data in zip(video_ids, pipe.execute())
+                if data
+            }
+        except Exception as e:
+            print(f"Redis 가져오기 중 오류 발생: {e}")
+            raise e
+
+    @staticmethod
+    def filter_missing_video_ids(video_ids: list[str]) -> list[str]:
+        """
+        Redis에 세부 정보(youtube_video:{id})가 없는 동영상 ID만 반환하는 함수.
+        EXISTS 명령을 파이프라인으로 묶어 한 번의 왕복으로 확인합니다.
+
+        Args:
+            video_ids (list[str]): 확인할 동영상 ID 목록
+        Returns:
+            list[str]: 캐시되지 않은 동영상 ID 목록 (입력 순서 유지)
+        """
+        if not video_ids:
+            return []
+        try:
+            pipe = redis_client.pipeline(transaction=False)
+            for video_id in video_ids:
+                pipe.exists(f"youtube_video:{video_id}")
+            exists = pipe.execute()
+            return [video_id for video_id, found in zip(video_ids, exists) if not found]
+        except Exception as e:
+            # 캐시 확인에 실패하면 전부 다시 조회
+            print(f"Redis 캐시 확인 중 오류 발생: {e}")
+            return list(video_ids)
+
     @staticmethod
     def get_youtube_raw_data(key: str):
         """
@@ -102,6 +237,40 @@ class RedisHandler:
         return json.loads(raw_data)
 
 
+    @staticmethod
+    def get_values(keys: list[str]) -> list:
+        """
+        여러 문자열 키를 MGET 한 번으로 가져오는 함수. 없는 키는 None으로 반환됩니다.
+        """
+        if not keys:
+            return []
+        try:
+            return redis_client.mget(keys)
+        except Exception as e:
+            print(f"Redis에서 데이터 가져오기 실패: {e}")
+            return [None] * len(keys)
+
+    @staticmethod
+    def set_values(mapping: dict, expire: int = 3600):
+        """
+        여러 문자열 키를 파이프라인 한 번으로 저장하는 함수.
+        """
+        pipe = redis_client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, value, ex=expire)
+        pipe.execute()
+
+    @staticmethod
+    def incr_value(key: str, amount: int = 1, expire: int | None = None) -> int:
+        """
+        정수 값을 증가시키고 증가된 값을 반환하는 함수.
+        """
+        pipe = redis_client.pipeline()
+        pipe.incrby(key, amount)
+        if expire:
+            pipe.expire(key, expire)
+        return pipe.execute()[0]
+
     # 저장
     def set_key_value(key: str, value: str, expire: int = 3600):
         redis_client.set(key, value, ex=expire)
@@ -113,3 +282,63 @@ class RedisHandler:
     # 삭제
     def delete_key(key: str):
         redis_client.delete(key)
+
+
+class AsyncRedisHandler:
+    """
+    RedisHandler의 비동기 버전. async 라우트에서는 이 클래스를 사용합니다.
+    """
+
+    @staticmethod
+    async def get_from_redis_list(key: str):
+        """
+        Redis에서 데이터 가져오기
+        """
+        try:
+            raw_data = await async_redis_client.get(key)
+            if not raw_data:
+                return None
+            return json.loads(raw_data)
+        except Exception as e:
+            print(f"Redis에서 데이터 가져오기 실패: {e}")
+            return None
+
+    @staticmethod
+    async def get_many_video_details(video_ids: list[str]) -> dict[str, dict]:
+        """
+        여러 동영상 세부 정보를 파이프라인 한 번으로 가져오는 함수.
+
+        Args:
+            video_ids (list[str]): 동영상 ID 목록
+        Returns:
+            dict[str, dict]: {동영상ID: 세부 정보} (Redis에 없는 동영상은 제외, 입력 순서 유지)
+        """
+        if not video_ids:
+            return {}
+        try:
+            pipe = async_redis_client.pipeline(transaction=False)
+            for video_id in video_ids:
+                pipe.hgetall(f"youtube_video:{video_id}")
+            return {
+                video_id: {field: json.loads(value) for field, value in data.items()}
+                for video_id, data in zip(video_ids, await pipe.execute())
+                if data
+            }
+        except Exception as e:
+            print(f"Redis 가져오기 중 오류 발생: {e}")
+            raise e
+
+    # 저장
+    @staticmethod
+    async def set_key_value(key: str, value: str, expire: int = 3600):
+        await async_redis_client.set(key, value, ex=expire)
+
+    # 불러오기
+    @staticmethod
+    async def get_value(key: str) -> str:
+        return await async_redis_client.get(key)
+
+    # 삭제
+    @staticmethod
+    async def delete_key(key: str):
+        await async_redis_client.delete(key)
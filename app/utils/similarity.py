@@ -0,0 +1,273 @@
+import re
+import zlib
+import numpy as np
+
+# 해싱 벡터 차원 (문자 n-gram을 crc32로 해싱하므로 프로세스/서버가 달라도 같은 벡터가 생성됨)
+VECTOR_DIM = 2048
+NGRAM_RANGE = (2, 3)
+# 두 키워드를 같은 관심사로 볼 최소 코사인 유사도 (예: "여행" / "해외여행")
+KEYWORD_MATCH_THRESHOLD = 0.3
+# 키워드를 공통 카테고리로 나눌 때 사용하는 softmax 온도 (낮을수록 가장 가까운 카테고리에 집중)
+CATEGORY_TEMPERATURE = 0.1
+
+# 비교 결과에 사용하는 공통 카테고리 (8개)와 대표 키워드
+MATCH_CATEGORIES = {
+    "엔터테인먼트와 예능": ["예능", "드라마", "영화", "연예인", "아이돌", "웹툰", "애니메이션", "코미디", "유튜버"],
+    "음악과 공연": ["음악", "노래", "가수", "콘서트", "공연", "케이팝", "힙합", "밴드", "악기"],
+    "게임과 e스포츠": ["게임", "e스포츠", "모바일 게임", "게임 공략", "스트리밍", "롤", "콘솔", "게임 리뷰"],
+    "음식과 요리": ["음식", "요리", "레시피", "먹방", "맛집", "카페", "디저트", "주류", "베이킹"],
+    "여행과 라이프스타일": ["여행", "일상", "브이로그", "패션", "뷰티", "인테리어", "반려동물", "캠핑"],
+    "스포츠와 건강": ["스포츠", "운동", "축구", "야구", "농구", "헬스", "건강", "다이어트", "요가"],
+    "지식과 자기계발": ["교육", "공부", "과학", "역사", "경제", "재테크", "투자", "자기계발", "뉴스"],
+    "테크와 리뷰": ["테크", "IT", "전자기기", "스마트폰", "자동차", "리뷰", "개발", "코딩", "인공지능"],
+}
+
+
+def normalize_keyword(keyword: str) -> str:
+    return re.sub(r"\s+", " ", str(keyword)).strip().lower()
+
+
+def _ngram_ids(text: str, dim: int = VECTOR_DIM) -> list[int]:
+    """
+    공백 경계를 포함한 문자 n-gram을 해싱한 인덱스 목록.
+    형태소 분석기 없이도 "해외여행"과 "여행"처럼 어근을 공유하는 한국어 키워드가 가까워집니다.
+    """
+    ids = []
+    for token in normalize_keyword(text).split(" "):
+        if not token:
+            continue
+        padded = f" {token} "
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            for i in range(len(padded) - n + 1):
+                ids.append(zlib.crc32(padded[i : i + n].encode("utf-8")) % dim)
+    return ids
+
+
+def term_frequencies(texts: list[str], dim: int = VECTOR_DIM) -> np.ndarray:
+    """
+    텍스트 목록의 n-gram 빈도 행렬 (len(texts), dim)
+    """
+    matrix = np.zeros((len(texts), dim), dtype=np.float32)
+    for row, text in enumerate(texts):
+        ids = _ngram_ids(text, dim)
+        if ids:
+            np.add.at(matrix[row], ids, 1.0)
+    return matrix
+
+
+def inverse_document_frequency(tf: np.ndarray) -> np.ndarray:
+    """
+    빈도 행렬에서 smooth idf 벡터를 계산합니다. (log((1 + N) / (1 + df)) + 1)
+    """
+    df = np.count_nonzero(tf, axis=0)
+    return (np.log((1 + tf.shape[0]) / (1 + df)) + 1).astype(np.float32)
+
+
+def l2_normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1, norms)
+
+
+def tfidf_vectors(tf: np.ndarray, idf: np.ndarray) -> np.ndarray:
+    # 부선형(sublinear) tf로 반복 n-gram의 영향을 줄인 뒤 정규화
+    return l2_normalize(np.log1p(tf) * idf)
+
+
+# 공통 카테고리 대표 키워드의 빈도 행렬 (idf 계산 기준 코퍼스이자 카테고리 중심 벡터)
+_CATEGORY_NAMES = list(MATCH_CATEGORIES)
+_CATEGORY_TF = term_frequencies(
+    [" ".join([name, *terms]) for name, terms in MATCH_CATEGORIES.items()]
+)
+_SEED_TF = term_frequencies([term for terms in MATCH_CATEGORIES.values() for term in terms])
+_SEED_IDF = inverse_document_frequency(_SEED_TF)
+
+
+def flatten_keywords(keywords, category_ratio: list | None = None) -> list[tuple[str, str, float]]:
+    """
+    보드 키워드를 (카테고리, 키워드, 가중치) 목록으로 변환합니다.
+    키워드는 보드의 {카테고리: [키워드, ...]} 형식이며, category_ratio가 카테고리 순서와 맞으면 그 비율을,
+    아니면 키워드 수와 관계없이 카테고리마다 같은 가중치를 사용합니다.
+    """
+    if isinstance(keywords, dict):
+        groups = [(str(category), list(values or [])) for category, values in keywords.items()]
+    else:
+        groups = [("", list(keywords or []))]
+
+    ratios = [1.0] * len(groups)
+    if category_ratio and len(category_ratio) == len(groups):
+        try:
+            ratios = [max(float(ratio), 0.0) for ratio in category_ratio]
+        except (TypeError, ValueError):
+            pass
+
+    weighted = [(category, values, ratio) for (category, values), ratio in zip(groups, ratios) if values]
+    total = sum(ratio for _, _, ratio in weighted)
+    if not total:
+        weighted = [(category, values, 1.0) for category, values, _ in weighted]
+        total = len(weighted)
+
+    flattened = []
+    for category, values, ratio in weighted:
+        for value in values:
+            flattened.append((category, str(value), ratio / (total * len(values))))
+    return flattened
+
+
+def _unique(values: list[str]) -> list[str]:
+    seen = set()
+    result = []
+    for value in values:
+        key = normalize_keyword(value)
+        if key and key not in seen:
+            seen.add(key)
+            result.append(value)
+    return result
+
+
+def category_distribution(vectors: np.ndarray, weights: np.ndarray, category_vectors: np.ndarray) -> np.ndarray:
+    """
+    키워드 벡터를 공통 카테고리에 softmax로 나누어 가중합한 분포 (합계 1)
+    """
+    if len(vectors) == 0:
+        return np.full(len(category_vectors), 1.0 / len(category_vectors))
+    scores = vectors @ category_vectors.T / CATEGORY_TEMPERATURE
+    scores -= scores.max(axis=1, keepdims=True)
+    probabilities = np.exp(scores)
+    probabilities /= probabilities.sum(axis=1, keepdims=True)
+    distribution = weights @ probabilities
+    return distribution / distribution.sum()
+
+
+def to_percentages(distribution: np.ndarray) -> list[float]:
+    """
+    분포를 소수점 둘째 자리 백분율로 변환합니다. 반올림 오차는 가장 큰 항목에서 보정하여 합계를 100으로 맞춥니다.
+    """
+    cents = np.floor(distribution * 10000).astype(int)
+    remainder = 10000 - cents.sum()
+    order = np.argsort(-(distribution * 10000 - cents))
+    cents[order[:remainder]] += 1
+    return [round(float(value) / 100, 2) for value in cents]
+
+
+def compare_keywords(board1_keywords, board2_keywords) -> dict:
+    """
+    두 보드의 키워드를 로컬 TF-IDF 벡터로 비교하는 함수 (GPT 호출 없음).
+    match_board_ratio와 같은 형식의 결과를 반환합니다.
+
+    Args:
+        board1_keywords (dict): 유저 1의 보드 키워드 데이터.
+        board2_keywords (dict): 유저 2의 보드 키워드 데이터.
+
+    Returns:
+        dict: user1_keywords, user2_keywords, match_keywords, new_categories,
+              user1_category_ratio, user2_category_ratio, similarity_score
+    """
+    items1 = flatten_keywords(board1_keywords)
+    items2 = flatten_keywords(board2_keywords)
+
+    # 키워드 텍스트에 보드 카테고리 이름을 더해 짧은 키워드의 문맥을 보강
+    texts1 = [keyword for _, keyword, _ in items1]
+    texts2 = [keyword for _, keyword, _ in items2]
+    context1 = [f"{category} {keyword}" for category, keyword, _ in items1]
+    context2 = [f"{category} {keyword}" for category, keyword, _ in items2]
+
+    keyword_tf = term_frequencies(texts1 + texts2)
+    context_tf = term_frequencies(context1 + context2)
+    idf = inverse_document_frequency(np.vstack([_SEED_TF, keyword_tf]))
+
+    keyword_vectors = tfidf_vectors(keyword_tf, idf)
+    context_vectors = tfidf_vectors(context_tf, idf)
+    category_vectors = tfidf_vectors(_CATEGORY_TF, idf)
+    vectors1, vectors2 = keyword_vectors[: len(items1)], keyword_vectors[len(items1) :]
+
+    # 1. 키워드 매칭 (같은 키워드이거나 n-gram 유사도가 임계값 이상)
+    similarity = vectors1 @ vectors2.T if len(items1) and len(items2) else np.zeros((len(items1), len(items2)))
+    exact = np.array(
+        [[normalize_keyword(a) == normalize_keyword(b) for b in texts2] for a in texts1], dtype=bool
+    ).reshape(len(items1), len(items2))
+    matched = exact | (similarity >= KEYWORD_MATCH_THRESHOLD)
+    matched1 = matched.any(axis=1) if len(items2) else np.zeros(len(items1), dtype=bool)
+    matched2 = matched.any(axis=0) if len(items1) else np.zeros(len(items2), dtype=bool)
+
+    match_keywords = _unique(
+        [texts1[i] for i in np.flatnonzero(matched1)] + [texts2[j] for j in np.flatnonzero(matched2)]
+    )
+    match_set = {normalize_keyword(keyword) for keyword in match_keywords}
+    user1_keywords = _unique([texts1[i] for i in np.flatnonzero(~matched1)])
+    user2_keywords = _unique([texts2[j] for j in np.flatnonzero(~matched2)])
+    user1_keywords = [k for k in user1_keywords if normalize_keyword(k) not in match_set]
+    user2_keywords = [k for k in user2_keywords if normalize_keyword(k) not in match_set]
+
+    # 2. 공통 카테고리 비율
+    weights1 = np.array([weight for _, _, weight in items1], dtype=np.float32)
+    weights2 = np.array([weight for _, _, weight in items2], dtype=np.float32)
+    distribution1 = category_distribution(context_vectors[: len(items1)], weights1, category_vectors)
+    distribution2 = category_distribution(context_vectors[len(items1) :], weights2, category_vectors)
+
+    # 3. 유사도: 카테고리 분포 코사인 유사도와 키워드 단위 최대 유사도 평균을 결합
+    category_similarity = float(
+        distribution1 @ distribution2 / (np.linalg.norm(distribution1) * np.linalg.norm(distribution2))
+    )
+    if similarity.size:
+        keyword_similarity = float(
+            (weights1 @ similarity.max(axis=1) + weights2 @ similarity.max(axis=0)) / 2
+        )
+    else:
+        keyword_similarity = 0.0
+    raw_score = 0.6 * category_similarity + 0.4 * keyword_similarity if items1 and items2 else 0.0
+    # 가벼운 관심사 겹침도 체감되도록 제곱근으로 완만하게 보정 (0.25 → 50%)
+    similarity_score = round(float(np.sqrt(np.clip(raw_score, 0.0, 1.0))) * 100, 2)
+
+    return {
+        "user1_keywords": user1_keywords,
+        "user2_keywords": user2_keywords,
+        "match_keywords": match_keywords,
+        "new_categories": _CATEGORY_NAMES,
+        "user1_category_ratio": to_percentages(distribution1),
+        "user2_category_ratio": to_percentages(distribution2),
+        "similarity_score": similarity_score,
+    }
+
+
+# 보드 벡터: 공통 카테고리 분포 (8차원) + 키워드 n-gram 해싱 벡터 (BOARD_KEYWORD_DIM차원)
+BOARD_KEYWORD_DIM = 256
+BOARD_VECTOR_DIM = len(MATCH_CATEGORIES) + BOARD_KEYWORD_DIM
+# 두 보드 벡터의 내적 = 0.6 * 카테고리 분포 코사인 + 0.4 * 키워드 코사인 (compare_keywords와 같은 비중)
+_CATEGORY_PART_WEIGHT = 0.6
+
+
+def board_vector(keywords, category_ratio: list | None = None) -> np.ndarray:
+    """
+    보드의 keywords/category_ratio로 단위 길이의 float32 벡터를 계산합니다.
+    두 보드 벡터의 내적이 곧 유사도이므로 여러 보드와의 비교를 행렬 곱 한 번으로 처리할 수 있습니다.
+    키워드가 없으면 영벡터를 반환합니다.
+    """
+    vector = np.zeros(BOARD_VECTOR_DIM, dtype=np.float32)
+    items = flatten_keywords(keywords, category_ratio)
+    if not items:
+        return vector
+
+    weights = np.array([weight for _, _, weight in items], dtype=np.float32)
+    context_vectors = tfidf_vectors(
+        term_frequencies([f"{category} {keyword}" for category, keyword, _ in items]), _SEED_IDF
+    )
+    distribution = category_distribution(
+        context_vectors, weights, tfidf_vectors(_CATEGORY_TF, _SEED_IDF)
+    )
+    keyword_vectors = l2_normalize(
+        np.log1p(term_frequencies([keyword for _, keyword, _ in items], BOARD_KEYWORD_DIM))
+    )
+
+    vector[: len(MATCH_CATEGORIES)] = np.sqrt(_CATEGORY_PART_WEIGHT) * l2_normalize(distribution)
+    vector[len(MATCH_CATEGORIES) :] = np.sqrt(1 - _CATEGORY_PART_WEIGHT) * l2_normalize(
+        weights @ keyword_vectors
+    )
+    return vector
+
+
+def vector_to_bytes(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype="<f4").tobytes()
+
+
+def vector_from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<f4")
@@ -0,0 +1,224 @@
+import asyncio
+import json
+import threading
+import uuid
+from redis.exceptions import RedisError
+from app.config import settings
+from app.utils.redis_handler import redis_client, async_redis_client, async_pubsub_client
+
+# 락 소유자만 락을 해제하도록 토큰을 비교 후 삭제
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+# 락 소유자만 락 유지 시간을 연장
+_RENEW_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], ARGV[2])
+end
+return 0
+"""
+# 결과 대기 중 리더가 살아 있는지 확인하는 간격 (초)
+_POLL_INTERVAL = 1.0
+
+
+class SingleFlightError(RuntimeError):
+    """
+    같은 요청을 처리하던 다른 프로세스(리더)가 실패했을 때 발생하는 오류
+    """
+
+
+class SingleFlight:
+    """
+    Redis 기반 single-flight: 같은 fingerprint의 요청이 동시에 들어오면 첫 호출(리더)만 실행하고,
+    나머지는 리더의 결과를 기다렸다가 공유합니다. API 프로세스와 Celery 워커 사이에서도 동작합니다.
+
+    - 락: {namespace}:lock:{fingerprint} (SET NX, 리더가 실행 중에는 lock_ttl/3마다 연장하고,
+      리더가 죽으면 lock_ttl 후 자동 해제 — 대기 중인 요청은 락이 있는 동안 계속 기다림)
+    - 결과: {namespace}:result:{fingerprint} (result_ttl 동안 보관, 늦게 도착한 중복 요청도 재사용)
+    - 완료 알림: {namespace}:done:{fingerprint} (pub/sub)
+    """
+
+    def __init__(self, namespace: str, lock_ttl: int | None = None, result_ttl: int = 60):
+        self.namespace = namespace
+        self.lock_ttl = lock_ttl or settings.single_flight_lock_ttl
+        self.result_ttl = result_ttl
+        self.renew_interval = max(self.lock_ttl / 3, 1)
+
+    def _keys(self, fingerprint: str) -> tuple[str, str, str]:
+        return (
+            f"{self.namespace}:lock:{fingerprint}",
+            f"{self.namespace}:result:{fingerprint}",
+            f"{self.namespace}:done:{fingerprint}",
+        )
+
+    @staticmethod
+    def _decode(payload: str):
+        data = json.loads(payload)
+        if "error" in data:
+            raise SingleFlightError(data["error"])
+        return data["value"]
+
+    def run(self, fingerprint: str, fn):
+        """
+        fn()을 single-flight로 실행합니다 (동기). fn의 반환값은 JSON 직렬화가 가능해야 합니다.
+        Redis 오류 시에는 fn()을 직접 실행합니다.
+        """
+        lock_key, result_key, channel = self._keys(fingerprint)
+        token = uuid.uuid4().hex
+        try:
+            cached = redis_client.get(result_key)
+            if cached:
+                return self._decode(cached)
+            acquired = redis_client.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except RedisError as e:
+            print(f"[ERROR] single-flight 사용 불가 ({self.namespace}): {e}")
+            return fn()
+
+        if acquired:
+            return self._lead(fn, token, lock_key, result_key, channel)
+
+        print(f"[DEBUG] 동일 요청 처리 대기 ({self.namespace}:{fingerprint[:12]})")
+        pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            # 구독 후 결과를 다시 확인해야 그 사이에 끝난 리더의 알림을 놓치지 않음
+            pubsub.subscribe(channel)
+            while True:
+                cached = redis_client.get(result_key)
+                if cached:
+                    return self._decode(cached)
+                if not redis_client.exists(lock_key):
+                    # 리더가 결과 없이 사라짐 (비정상 종료) → 직접 리더가 되어 실행
+                    if redis_client.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                        return self._lead(fn, token, lock_key, result_key, channel)
+                message = pubsub.get_message(timeout=_POLL_INTERVAL)
+                if message:
+                    return self._decode(message["data"])
+        except RedisError as e:
+            print(f"[ERROR] single-flight 대기 중 Redis 오류, 직접 실행 ({self.namespace}): {e}")
+            return fn()
+        finally:
+            pubsub.close()
+
+    def _renew_until(self, stopped: threading.Event, lock_key: str, token: str):
+        while not stopped.wait(self.renew_interval):
+            try:
+                if not redis_client.eval(_RENEW_SCRIPT, 1, lock_key, token, self.lock_ttl):
+                    return
+            except RedisError as e:
+                print(f"[ERROR] single-flight 락 연장 실패 ({self.namespace}): {e}")
+
+    def _lead(self, fn, token: str, lock_key: str, result_key: str, channel: str):
+        # 실행 시간이 lock_ttl을 넘어도 락을 잃지 않도록 백그라운드 스레드에서 연장
+        stopped = threading.Event()
+        threading.Thread(
+            target=self._renew_until, args=(stopped, lock_key, token), daemon=True
+        ).start()
+        try:
+            value = fn()
+        except Exception as e:
+            self._publish(json.dumps({"error": str(e)}, ensure_ascii=False), None, channel)
+            raise
+        else:
+            payload = json.dumps({"value": value}, ensure_ascii=False)
+            self._publish(payload, result_key, channel)
+            return value
+        finally:
+            stopped.set()
+            try:
+                redis_client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                print(f"[ERROR] single-flight 락 해제 실패 ({self.namespace}): {e}")
+
+    def _publish(self, payload: str, result_key: str | None, channel: str):
+        try:
+            pipe = redis_client.pipeline()
+            if result_key:
+                pipe.set(result_key, payload, ex=self.result_ttl)
+            pipe.publish(channel, payload)
+            pipe.execute()
+        except Exception as e:
+            print(f"[ERROR] single-flight 결과 저장 실패 ({self.namespace}): {e}")
+
+    async def run_async(self, fingerprint: str, fn):
+        """
+        run()의 비동기 버전. fn은 코루틴을 반환하는 함수입니다.
+        """
+        lock_key, result_key, channel = self._keys(fingerprint)
+        token = uuid.uuid4().hex
+        try:
+            cached = await async_redis_client.get(result_key)
+            if cached:
+                return self._decode(cached)
+            acquired = await async_redis_client.set(lock_key, token, nx=True, ex=self.lock_ttl)
+        except RedisError as e:
+            print(f"[ERROR] single-flight 사용 불가 ({self.namespace}): {e}")
+            return await fn()
+
+        if acquired:
+            return await self._lead_async(fn, token, lock_key, result_key, channel)
+
+        print(f"[DEBUG] 동일 요청 처리 대기 ({self.namespace}:{fingerprint[:12]})")
+        pubsub = async_pubsub_client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            while True:
+                cached = await async_redis_client.get(result_key)
+                if cached:
+                    return self._decode(cached)
+                if not await async_redis_client.exists(lock_key):
+                    if await async_redis_client.set(lock_key, token, nx=True, ex=self.lock_ttl):
+                        return await self._lead_async(fn, token, lock_key, result_key, channel)
+                message = await pubsub.get_message(timeout=_POLL_INTERVAL)
+                if message:
+                    return self._decode(message["data"])
+        except RedisError as e:
+            print(f"[ERROR] single-flight 대기 중 Redis 오류, 직접 실행 ({self.namespace}): {e}")
+            return await fn()
+        finally:
+            await pubsub.aclose()
+
+    async def _renew_async(self, lock_key: str, token: str):
+        while True:
+            await asyncio.sleep(self.renew_interval)
+            try:
+                if not await async_redis_client.eval(_RENEW_SCRIPT, 1, lock_key, token, self.lock_ttl):
+                    return
+            except RedisError as e:
+                print(f"[ERROR] single-flight 락 연장 실패 ({self.namespace}): {e}")
+
+    async def _lead_async(self, fn, token: str, lock_key: str, result_key: str, channel: str):
+        renew_task = asyncio.create_task(self._renew_async(lock_key, token))
+        try:
+            value = await fn()
+        except Exception as e:
+            await self._publish_async(json.dumps({"error": str(e)}, ensure_ascii=False), None, channel)
+            raise
+        else:
+            payload = json.dumps({"value": value}, ensure_ascii=False)
+            await self._publish_async(payload, result_key, channel)
+            return value
+        finally:
+            renew_task.cancel()
+            try:
+                await async_redis_client.eval(_RELEASE_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                print(f"[ERROR] single-flight 락 해제 실패 ({self.namespace}): {e}")
+
+    async def _publish_async(self, payload: str, result_key: str | None, channel: str):
+        try:
+            pipe = async_redis_client.pipeline()
+            if result_key:
+                pipe.set(result_key, payload, ex=self.result_ttl)
+            pipe.publish(channel, payload)
+            await pipe.execute()
+        except Exception as e:
+            print(f"[ERROR] single-flight 결과 저장 실패 ({self.namespace}): {e}")
+
+
+# GPT 호출별 single-flight
+analysis_flight = SingleFlight("gpt_flight:analysis")
+regenerate_keywords_flight = SingleFlight("gpt_flight:regenerate_keywords")
+match_ratio_flight = SingleFlight("gpt_flight:match_ratio")
@@ -1,13 +1,41 @@
-import requests
+from app.config import settings
+from app.utils.http_client import get_http_client
+from app.utils.rate_limiter import get_rate_limiter
+
+
+def youtube_api_get(endpoint: str, params: dict, headers: dict | None = None):
+    """
+    클러스터 공용 요청 한도(youtube:data-v3)를 획득한 뒤 YouTube Data API를 호출하는 함수.
+    429 또는 rateLimitExceeded(403) 응답이면 속도를 줄이고 최대 RATE_LIMIT_MAX_RETRIES번 재시도합니다.
+    일일 쿼터 초과(quotaExceeded)는 기다려도 풀리지 않으므로 그대로 반환합니다.
+
+    Args:
+        endpoint (str): API 이름 (search, videos, channels, playlistItems, subscriptions)
+        params (dict): 요청 파라미터
+        headers (dict | None): 추가 요청 헤더 (사용자 OAuth 토큰 등)
+
+    Returns:
+        httpx.Response: 마지막 응답
+    """
+    limiter = get_rate_limiter("youtube", "data-v3")
+    for attempt in range(settings.rate_limit_max_retries + 1):
+        limiter.acquire()
+        response = get_http_client().get(
+            f"https://www.googleapis.com/youtube/v3/{endpoint}", headers=headers, params=params
+        )
+        throttled = response.status_code == 429 or (
+            response.status_code == 403 and "ratelimitexceeded" in response.text.lower()
+        )
+        limiter.observe(response.headers, throttled=throttled)
+        if not throttled:
+            break
+    return response
 
 
 def youtube_api_request(endpoint: str, access_token: str, params: dict) -> dict:
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.get(
-        f"https://www.googleapis.com/youtube/v3/{endpoint}",
-        headers=headers,
-        params=params,
-    )
+    # 사용자 토큰 요청도 같은 프로젝트 한도를 사용하므로 공용 요청 한도를 거침
+    response = youtube_api_get(endpoint, params, headers=headers)
     if response.status_code == 200:
         return response.json()
     else: